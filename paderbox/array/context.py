@@ -1,30 +1,63 @@
 import numpy as np
 
-from paderbox.array.rearrange import tbf_to_tbchw
+from paderbox.array.rearrange import tbf_to_tbchw, _pad_time
 
 
-def stack_context(X, left_context=0, right_context=0, step_width=1):
+def stack_context(X, left_context=0, right_context=0, step_width=1,
+                  copy=True):
     """ Stack TxBxF format with left and right context.
 
     There is a notebook, which illustrates this feature with many details in
     the example notebooks repository.
 
+    With `copy=False`, the result is a read only strided view on a padded
+    copy of X, hence the memory consumption is independent of the context
+    size.
+
     :param X: Data with TxBxF format.
     :param left_context: Length of left context.
     :param right_context: Length of right context.
     :param step_width: Step width.
+    :param copy: Whether to return a contiguous copy instead of a read only
+        view.
     :return: Stacked features with symmetric padding and head and tail.
-    """
-    X_stacked = tbf_to_tbchw(
-        X,
-        left_context=left_context,
-        right_context=right_context,
-        step_width=step_width
-    )[:, :, 0, :].transpose((0, 1, 3, 2))
-
-    T, B, F, W = X_stacked.shape
-    X_stacked = X_stacked.reshape(T, B, F * W)
 
+    >>> X = np.arange(8).reshape(4, 1, 2)
+    >>> stack_context(X, 1, 1)[:, 0]
+    array([[0, 1, 0, 1, 2, 3],
+           [0, 1, 2, 3, 4, 5],
+           [2, 3, 4, 5, 6, 7],
+           [4, 5, 6, 7, 6, 7]])
+    >>> stack_context(X, 1, 1).flags.writeable
+    True
+    >>> stack_context(X, 1, 1, copy=False).flags.writeable
+    False
+    """
+    X = np.asarray(X)
+    T, B, F = X.shape
+    window_size = left_context + right_context + 1
+
+    # With a (B, T, F) memory layout the context and feature axis of a frame
+    # are contiguous, hence they can be merged in a strided view.
+    padded = np.empty((B, T + left_context + right_context, F), dtype=X.dtype)
+    _pad_time(
+        X, left_context, right_context, 'symmetric', {},
+        out=padded.transpose(1, 0, 2),
+    )
+    frames = (padded.shape[1] - window_size) // step_width + 1
+    X_stacked = np.lib.stride_tricks.as_strided(
+        padded,
+        shape=(frames, B, window_size * F),
+        strides=(
+            step_width * padded.strides[1],
+            padded.strides[0],
+            padded.strides[2],
+        ),
+        writeable=False,
+    )
+
+    if copy:
+        X_stacked = np.ascontiguousarray(X_stacked)
     return X_stacked
 
 
@@ -60,11 +93,12 @@ def unstack_context(X, mode, left_context=0, right_context=0, step_width=1):
 
 def add_context(data, left_context=0, right_context=0, step=1,
                 cnn_features=False, deltas_as_channel=False,
-                num_deltas=2, sequence_output=True):
+                num_deltas=2, sequence_output=True, copy=True):
     if cnn_features:
         data = tbf_to_tbchw(data, left_context, right_context, step,
                             pad_mode='constant',
-                            pad_kwargs=dict(constant_values=(0,)))
+                            pad_kwargs=dict(constant_values=(0,)),
+                            copy=copy)
         if deltas_as_channel:
             feature_size = data.shape[3] // (1 + num_deltas)
             data = np.concatenate(
@@ -72,7 +106,8 @@ def add_context(data, left_context=0, right_context=0, step=1,
                  for i in range(1 + num_deltas)], axis=2)
     else:
         data = stack_context(data, left_context=left_context,
-                             right_context=right_context, step_width=step)
+                             right_context=right_context, step_width=step,
+                             copy=copy)
         if not sequence_output:
             data = np.concatenate(
                 [data[:, i, ...].reshape((-1, data.shape[-1])) for
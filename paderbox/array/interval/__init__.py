@@ -13,6 +13,8 @@ of a long audio file (> 2h) in memory.
 """
 from .core import zeros, ones
 from .core import ArrayInterval
+from .stack import ArrayIntervalStack
+from .index import ArrayIntervalIndex
 
 from .rttm import from_rttm
 from .rttm import from_rttm_str
@@ -20,3 +22,5 @@ from .rttm import to_rttm
 from .rttm import to_rttm_str
 from .kaldi import from_kaldi_segments
 from .kaldi import from_kaldi_segments_str
+from .npz import to_npz
+from .npz import from_npz
@@ -4,15 +4,98 @@ In combination with jsonpickle this allows for a low resource possibility to
 save activity information for large time streams.
 """
 
+import collections.abc
+import fractions
+import operator
 from typing import Optional, Union, Iterable
 
 import numpy as np
-from paderbox.array.interval.util import (
-    cy_non_intersection,
-    cy_intersection,
-    cy_parse_item,
-    cy_str_to_intervals,
-)
+from paderbox.array.interval.numpy_util import np_str_to_intervals
+try:
+    from paderbox.array.interval.util import cy_parse_item as _parse_item
+except ImportError:
+    # The Cython extension is not built.
+    from paderbox.array.interval.numpy_util import np_parse_item as _parse_item
+
+
+def _freeze(intervals: np.ndarray) -> np.ndarray:
+    """Marks a newly created intervals array as read only."""
+    intervals.flags.writeable = False
+    return intervals
+
+
+def _as_intervals_array(intervals) -> np.ndarray:
+    """
+    Converts intervals to a read only (N, 2) int64 array.
+
+    >>> _as_intervals_array([(1, 2), (4, 6)])
+    array([[1, 2],
+           [4, 6]])
+    >>> _as_intervals_array(())
+    array([], shape=(0, 2), dtype=int64)
+    """
+    if not (
+            isinstance(intervals, np.ndarray)
+            and intervals.dtype == np.int64
+            and not intervals.flags.writeable
+    ):
+        intervals = _freeze(np.array(intervals, dtype=np.int64))
+    return intervals.reshape(-1, 2)
+
+
+def _empty_intervals() -> np.ndarray:
+    return _freeze(np.zeros((0, 2), dtype=np.int64))
+
+
+def _intervals_to_tuple(intervals: np.ndarray) -> tuple:
+    return tuple(map(tuple, intervals.tolist()))
+
+
+def _mask_to_intervals(mask: np.ndarray, inverse_mode=False) -> np.ndarray:
+    """
+    Finds the rising and falling edges of a boolean mask and returns the
+    normalized intervals.
+
+    >>> _mask_to_intervals(np.array([1, 1, 0, 1, 0, 0, 1, 1, 0], dtype=bool))
+    array([[0, 2],
+           [3, 4],
+           [6, 8]])
+    >>> _mask_to_intervals(np.array([1, 1, 0, 1], dtype=bool), inverse_mode=True)
+    array([[2, 3]])
+    """
+    if inverse_mode:
+        mask = np.logical_not(mask)
+    edges = np.zeros(len(mask) + 1, dtype=np.int8)
+    edges[1:] = mask
+    edges[:-1] -= mask
+    starts = np.flatnonzero(edges < 0)
+    ends = np.flatnonzero(edges > 0)
+    return _freeze(np.stack([starts, ends], axis=-1).astype(np.int64))
+
+
+def _intervals_to_mask(
+        intervals: np.ndarray, size: int, inverse_mode=False
+) -> np.ndarray:
+    """
+    Fills a dense boolean mask from normalized intervals with a cumulative
+    sum over the edges.
+
+    >>> _intervals_to_mask(np.array([[1, 3], [4, 5]]), 6)
+    array([False,  True,  True, False,  True, False])
+    >>> _intervals_to_mask(np.array([[1, 3], [4, 5]]), 6, inverse_mode=True)
+    array([ True, False, False,  True, False,  True])
+    """
+    # The normalized intervals do not overlap or touch, hence each position
+    # is at most once a start or an end and the cumulative sum is either 0 or
+    # 1. This allows to reinterpret the int8 array as bool without a copy.
+    edges = np.zeros(size + 1, dtype=np.int8)
+    edges[intervals[:, 0]] = 1
+    edges[intervals[:, 1]] = -1
+    np.cumsum(edges, out=edges)
+    mask = edges[:-1].view(np.bool_)
+    if inverse_mode:
+        np.logical_not(mask, out=mask)
+    return mask
 
 
 def ArrayInterval_from_str(string, shape):
@@ -198,42 +281,64 @@ class ArrayInterval:
         if isinstance(array, ArrayInterval):
             self.shape = array.shape
             self.inverse_mode = array.inverse_mode
-            self.intervals = array.intervals
+            self._intervals = array._intervals_array
+            self._intervals_normalized = array._intervals_normalized
         else:
             array = np.asarray(array)
             assert array.ndim == 1, (array.ndim, array)
             assert array.dtype == np.bool, (np.bool, array)
 
-            if inverse_mode:
-                array = np.logical_not(array)
-            diff = np.diff(array.astype(np.int32))
-
-            rising = list(np.atleast_1d(np.squeeze(np.where(diff > 0), axis=0)) + 1)
-            falling = list(np.atleast_1d(np.squeeze(np.where(diff < 0), axis=0)) + 1)
-
-            if array[0] == 1:
-                rising = [0] + rising
-
-            if array[-1] == 1:
-                falling = falling + [len(array)]
-
-            # ai = ArrayInterval(shape=array.shape)
             self.inverse_mode = inverse_mode
             self.shape = array.shape
+            self._intervals = _mask_to_intervals(array, inverse_mode)
+            self._intervals_normalized = True
 
-            if inverse_mode:
-                for start, stop in zip(rising, falling):
-                    self[start:stop] = 0
-            else:
-                for start, stop in zip(rising, falling):
-                    self[start:stop] = 1
+    @classmethod
+    def from_mask(cls, array, inverse_mode: bool = False) -> 'ArrayInterval':
+        """
+        Builds an `ArrayInterval` from a 1-dimensional boolean array (e.g. a
+        frame-level VAD mask). Alias for `ArrayInterval(array)`, the interval
+        table is build in one vectorized step from the edges of the array.
+
+        >>> ArrayInterval.from_mask(np.array([0, 1, 1, 0, 0, 1], dtype=bool))
+        ArrayInterval("1:3, 5:6", shape=(6,))
+        >>> ArrayInterval.from_mask(np.array([0, 1, 1, 0, 0, 1], dtype=bool), inverse_mode=True)
+        ArrayInterval("0:1, 3:5", shape=(6,), inverse_mode=True)
+        >>> ArrayInterval.from_mask(np.array([], dtype=bool))
+        ArrayInterval("", shape=(0,))
+        """
+        return cls(array, inverse_mode=inverse_mode)
+
+    def to_mask(self) -> np.ndarray:
+        """
+        Converts the `ArrayInterval` to a dense 1-dimensional boolean array.
+        Equivalent to `array_interval[:]`.
+
+        >>> ai = ArrayInterval.from_str('1:3, 5:6', shape=8)
+        >>> ai.to_mask()
+        array([False,  True,  True, False, False,  True, False, False])
+        >>> (~ai).to_mask()
+        array([ True, False, False,  True,  True, False,  True,  True])
+        >>> zeros().to_mask()
+        Traceback (most recent call last):
+        ...
+        RuntimeError: You cannot cast an ArrayInterval to numpy,
+        when the shape is unknown.
+        """
+        if self.shape is None:
+            raise RuntimeError(
+                f'You cannot cast an {self.__class__.__name__} to numpy,\n'
+                f'when the shape is unknown.')
+        return _intervals_to_mask(
+            self._normalized_intervals_array, self.shape[0], self.inverse_mode)
 
     def __copy__(self):
         if self.inverse_mode:
             ai = ones(shape=self.shape)
         else:
             ai = zeros(shape=self.shape)
-        ai.intervals = self.intervals
+        ai._intervals = self._intervals_array
+        ai._intervals_normalized = self._intervals_normalized
         return ai
 
     def __array__(self, dtype=np.bool):
@@ -254,12 +359,7 @@ class ArrayInterval:
             when the shape is unknown.
         """
         assert dtype == np.bool, dtype
-        if self.shape is None:
-            raise RuntimeError(
-                f'You cannot cast an {self.__class__.__name__} to numpy,\n'
-                f'when the shape is unknown.')
-        else:
-            return self[:]
+        return self.to_mask()
 
     def __reduce__(self):
         """
@@ -281,82 +381,149 @@ class ArrayInterval:
         return self.from_str, (self._intervals_as_str, self.shape[-1])
 
     _intervals_normalized = True
-    # _normalized_intervals = ()
-    _intervals = ()
+    # Internal representation: An (N, 2) int64 array of start and end values.
+    # New intervals are collected in `_pending_intervals` and concatenated
+    # lazily, so that adding n intervals one after another is O(n) and not
+    # O(n**2).
+    _intervals = _empty_intervals()
+    _pending_intervals = ()
 
     def __len__(self):
         return self.shape[0]
 
     @property
-    def normalized_intervals(self) -> tuple:
+    def _intervals_array(self) -> np.ndarray:
         """
-        Normalized intervals. Normalized here means that overlapping intervals
-        are merged.
+        The (unnormalized) intervals as read only (N, 2) int64 array.
+        """
+        if self._pending_intervals:
+            self._intervals = _freeze(np.concatenate([
+                self._intervals,
+                np.array(self._pending_intervals, dtype=np.int64).reshape(-1, 2)
+            ]))
+            self._pending_intervals = ()
+        return self._intervals
+
+    @property
+    def _normalized_intervals_array(self) -> np.ndarray:
+        """
+        The normalized intervals as read only (N, 2) int64 array.
 
         Note:
             Changes the internal representation to the normalized intervals.
         """
         if not self._intervals_normalized:
-            self._intervals = self._normalize(self._intervals)
+            self._intervals = self._normalize(self._intervals_array)
             self._intervals_normalized = True
         return self._intervals
 
+    _bounds_cache = None
+
+    @property
+    def _normalized_bounds(self):
+        """
+        The start and end values of the normalized intervals as contiguous
+        arrays for binary searches.
+        """
+        intervals = self._normalized_intervals_array
+        cache = self._bounds_cache
+        if cache is None or cache[0] is not intervals:
+            cache = self._bounds_cache = (
+                intervals,
+                np.ascontiguousarray(intervals[:, 0]),
+                np.ascontiguousarray(intervals[:, 1]),
+            )
+        return cache[1], cache[2]
+
+    def _append_intervals(self, intervals):
+        """
+        Appends intervals without touching the existing intervals.
+
+        Args:
+            intervals: Sequence of (start, end) tuples or (N, 2) array
+        """
+        if isinstance(intervals, np.ndarray):
+            if len(intervals) > 0:
+                self._intervals = _freeze(np.concatenate([
+                    self._intervals_array, intervals.reshape(-1, 2)]))
+                self._intervals_normalized = False
+        elif len(intervals) > 0:
+            if not self._pending_intervals:
+                self._pending_intervals = []
+            self._pending_intervals.extend(intervals)
+            self._intervals_normalized = False
+
+    @property
+    def normalized_intervals(self) -> tuple:
+        """
+        Normalized intervals. Normalized here means that overlapping intervals
+        are merged.
+
+        Note:
+            Changes the internal representation to the normalized intervals.
+        """
+        return _intervals_to_tuple(self._normalized_intervals_array)
+
     @property
     def intervals(self) -> tuple:
         """
         A representation of the intervals as tuples of start and end values.
         """
-        return self._intervals
+        return _intervals_to_tuple(self._intervals_array)
 
     @intervals.setter
     def intervals(self, item):
         self._intervals_normalized = False
-        self._intervals = tuple(item)
+        self._pending_intervals = ()
+        self._intervals = _as_intervals_array(item)
 
     @staticmethod
-    def _normalize(intervals):
+    def _normalize(intervals) -> np.ndarray:
         """
+        Sorts the intervals, drops empty intervals and merges overlapping or
+        touching intervals.
+
         >>> ArrayInterval._normalize([])
-        ()
+        array([], shape=(0, 2), dtype=int64)
         >>> ArrayInterval._normalize([(0, 1)])
-        ((0, 1),)
+        array([[0, 1]])
         >>> ArrayInterval._normalize([(0, 1), (2, 3)])
-        ((0, 1), (2, 3))
+        array([[0, 1],
+               [2, 3]])
         >>> ArrayInterval._normalize([(0, 1), (20, 30)])
-        ((0, 1), (20, 30))
+        array([[ 0,  1],
+               [20, 30]])
         >>> ArrayInterval._normalize([(0, 1), (1, 3)])
-        ((0, 3),)
+        array([[0, 3]])
         >>> ArrayInterval._normalize([(0, 1), (1, 3), (3, 10)])
-        ((0, 10),)
-        """
-        intervals = [(s, e) for s, e in sorted(intervals) if s < e]
-        for i in range(len(intervals)):
-            try:
-                s, e = intervals[i]
-            except IndexError:
-                break
-            try:
-                next_s, next_e = intervals[i + 1]
-                while next_s <= e:
-                    e = max(e, next_e)
-                    del intervals[i + 1]
-                    next_s, next_e = intervals[i + 1]
-            except IndexError:
-                pass
-            finally:
-                intervals[i] = (s, e)
-        return tuple(intervals)
+        array([[ 0, 10]])
+        >>> ArrayInterval._normalize([(5, 7), (0, 10), (3, 3), (12, 11)])
+        array([[ 0, 10]])
+        """
+        intervals = _as_intervals_array(intervals)
+        intervals = intervals[intervals[:, 0] < intervals[:, 1]]
+        if len(intervals) == 0:
+            return _empty_intervals()
+
+        order = np.argsort(intervals[:, 0], kind='stable')
+        starts = intervals[order, 0]
+        ends = np.maximum.accumulate(intervals[order, 1])
+
+        # A new interval begins, when the start is behind all previous ends.
+        new = np.empty(len(starts), dtype=bool)
+        new[0] = True
+        np.greater(starts[1:], ends[:-1], out=new[1:])
+        first = np.flatnonzero(new)
+        last = np.append(first[1:] - 1, len(starts) - 1)
+
+        return _freeze(np.stack([starts[first], ends[last]], axis=-1))
 
     @property
     def _intervals_as_str(self):
-        i_str = []
-        for i in self.normalized_intervals:
-            start, end = i
-            #             i_str += [f'[{start}, {end})']
-            i_str += [f'{start}:{end}']
-
-        i_str = ', '.join(i_str)
-        return i_str
+        return ', '.join([
+            f'{start}:{end}'
+            for start, end in self._normalized_intervals_array.tolist()
+        ])
 
     def __repr__(self):
         if self.inverse_mode:
@@ -371,20 +538,37 @@ class ArrayInterval:
         Args:
             string_intervals: Format "<start>:<end>,<start>:<end>..."
         """
-        self.intervals = self.intervals + cy_str_to_intervals(string_intervals)
+        self._append_intervals(np_str_to_intervals(string_intervals))
 
-    def add_intervals(self, intervals: Iterable[slice]):
+    def add_intervals(self, intervals: Union[Iterable[slice], np.ndarray]):
         """
-        Adds intervals from a list of slices.
+        Adds intervals from a list of slices or from an (N, 2) array of start
+        and end values.
 
         Equivalent to, but significantly faster than:
             for item in intervals:
                 self[item] = 1
 
+        >>> ai = zeros(50)
+        >>> ai.add_intervals([slice(1, 4), slice(10, 20)])
+        >>> ai.add_intervals(np.array([[3, 6], [30, 40]]))
+        >>> ai
+        ArrayInterval("1:6, 10:20, 30:40", shape=(50,))
         """
+        if isinstance(intervals, np.ndarray):
+            intervals = _as_intervals_array(intervals)
+            if len(intervals) > 0:
+                assert intervals.min() >= 0, (intervals.min(), self.shape)
+                if self.shape is not None:
+                    assert intervals.max() <= self.shape[-1], (
+                        intervals.max(), self.shape)
+                self.intervals = np.concatenate([
+                    self._intervals_array, intervals])
+            return
+
         # Short circuit
-        self.intervals = self.intervals + tuple(
-            [cy_parse_item(i, self.shape) for i in intervals]
+        self._append_intervals(
+            [_parse_item(i, self.shape) for i in intervals]
         )
 
     def __setitem__(self, item, value):
@@ -429,32 +613,48 @@ class ArrayInterval:
 
         """
 
-        start, stop = cy_parse_item(item, self.shape)
+        start, stop = _parse_item(item, self.shape)
 
         if np.isscalar(value):
-            if self.inverse_mode:
-                if value == 0:
-                    self.intervals = self.intervals + ((start, stop),)
-                elif value == 1:
-                    self.intervals = cy_non_intersection((start, stop), self.intervals)
-                else:
-                    raise ValueError(value)
+            if value not in (0, 1):
+                raise ValueError(value)
+            if bool(value) ^ self.inverse_mode:
+                self._append_intervals([(start, stop)])
             else:
-                if value == 1:
-                    self.intervals = self.intervals + ((start, stop),)
-                elif value == 0:
-                    self.intervals = cy_non_intersection((start, stop), self.intervals)
-                else:
-                    raise ValueError(value)
+                self._remove_interval(start, stop)
         elif isinstance(value, (tuple, list, np.ndarray)):
             assert len(value) == stop - start, (start, stop, stop - start, len(value), value)
             ai = ArrayInterval(value, inverse_mode=self.inverse_mode)
-            intervals = self.intervals
-            intervals = cy_non_intersection((start, stop), intervals)
-            self.intervals = intervals + tuple([(s + start, e + start) for s, e in ai.intervals])
+            self._remove_interval(start, stop)
+            self._append_intervals(ai._intervals_array + start)
         else:
             raise NotImplementedError(value)
 
+    def _remove_interval(self, start, stop):
+        """
+        Removes the interval [start, stop) from the normalized intervals.
+
+        >>> ai = ArrayInterval.from_str('1:4, 5:20, 21:25', shape=50)
+        >>> ai._remove_interval(3, 22)
+        >>> ai
+        ArrayInterval("1:3, 22:25", shape=(50,))
+        >>> ai._remove_interval(10, 10)
+        >>> ai
+        ArrayInterval("1:3, 22:25", shape=(50,))
+        """
+        if start >= stop:
+            return
+        intervals = self._normalized_intervals_array
+        # Intervals that begin before start are cut at start and intervals
+        # that end behind stop are cut at stop. An interval that covers
+        # [start, stop) is split into two parts.
+        left = intervals[intervals[:, 0] < start]
+        right = intervals[intervals[:, 1] > stop]
+        self._intervals = _freeze(np.concatenate([
+            np.stack([left[:, 0], np.minimum(left[:, 1], start)], axis=-1),
+            np.stack([np.maximum(right[:, 0], stop), right[:, 1]], axis=-1),
+        ]))
+
     def __getitem__(self, item):
         """
 
@@ -478,27 +678,193 @@ class ArrayInterval:
      
         """
         if isinstance(item, (int, np.integer)):
-            # Could be optimized
-            for s, e in self.normalized_intervals:
-                if e > item:
-                    return (item >= s) ^ self.inverse_mode
-            return self.inverse_mode
+            starts, ends = self._normalized_bounds
+            # Index of the first interval that ends behind item
+            i = np.searchsorted(ends, item, side='right')
+            return bool(i < len(starts) and starts[i] <= item) ^ self.inverse_mode
+
+        start, stop = _parse_item(item, self.shape)
+        return _intervals_to_mask(
+            self._intersection(start, stop) - start, stop - start,
+            self.inverse_mode,
+        )
 
-        start, stop = cy_parse_item(item, self.shape)
-        intervals = cy_intersection((start, stop), self.normalized_intervals)
+    def _intersection(self, start, stop) -> np.ndarray:
+        """
+        The normalized intervals that intersect with [start, stop), clipped
+        to [start, stop). Uses a binary search, i.e. O(log N + k).
+
+        >>> ai = ArrayInterval.from_str('1:4, 5:20, 21:25, 30:40', shape=50)
+        >>> ai._intersection(3, 22)
+        array([[ 3,  4],
+               [ 5, 20],
+               [21, 22]])
+        >>> ai._intersection(25, 30)
+        array([], shape=(0, 2), dtype=int64)
+        """
+        starts, ends = self._normalized_bounds
+        lo = np.searchsorted(ends, start, side='right')
+        hi = np.searchsorted(starts, stop, side='left')
+        intervals = self._normalized_intervals_array[lo:max(lo, hi)]
+        return np.clip(intervals, start, stop)
 
+    def values_at(self, indices) -> np.ndarray:
+        """
+        Vectorized point queries, i.e. equivalent to
+        `np.array([array_interval[i] for i in indices])`, but each query is a
+        binary search on the normalized intervals.
+
+        Args:
+            indices: Integer array-like of any shape
+
+        Returns:
+            Boolean array with the same shape as indices.
+
+        >>> ai = ArrayInterval.from_str('10:20, 25:30', shape=50)
+        >>> ai.values_at([0, 10, 19, 20, 29, 30, 49])
+        array([False,  True,  True, False,  True, False, False])
+        >>> (~ai).values_at(np.array([[0, 10], [19, 20]]))
+        array([[ True, False],
+               [False,  True]])
+        >>> zeros(10).values_at([1, 2])
+        array([False, False])
+        >>> (~ai).values_at(12)
+        False
+        """
+        indices = np.asarray(indices)
+        starts, ends = self._normalized_bounds
+        i = np.searchsorted(ends, indices, side='right')
+        if len(starts) == 0:
+            values = np.zeros(indices.shape, dtype=bool)
+        else:
+            values = starts[np.minimum(i, len(starts) - 1)] <= indices
+            values &= i < len(starts)
         if self.inverse_mode:
-            arr = np.ones(stop - start, dtype=np.bool)
+            # Not in place, values is a np.bool_ for a scalar index.
+            values = ~values
+        return values
+
+    def _active_intervals(self) -> np.ndarray:
+        """
+        The normalized intervals of the active positions, i.e. independent of
+        the inverse_mode.
+
+        >>> (~ArrayInterval.from_str('2:4', shape=10))._active_intervals()
+        array([[ 0,  2],
+               [ 4, 10]])
+        """
+        if not self.inverse_mode:
+            return self._normalized_intervals_array
+        assert self.shape is not None, (
+            'The shape is required for an inverse_mode ArrayInterval.', self)
+        edges, counts = _count_active(self)
+        return _sections_to_intervals(edges, counts > 0, self.shape)
+
+    def resample(self, factor, rule: str = 'any') -> 'ArrayInterval':
+        """
+        Changes the time base (e.g. from 16 kHz to 8 kHz) by mapping the
+        interval boundaries, i.e. without densification.
+        The new position `i` covers the old positions
+        `[i / factor, (i + 1) / factor)`.
 
-            for i_start, i_end in intervals:
-                arr[i_start - start:i_end - start] = False
+        Args:
+            factor: New sample rate divided by the old sample rate, e.g.
+                `fractions.Fraction(8000, 16000)`. Floats are converted to a
+                fraction.
+            rule: When is a new position active?
+                'any': Any covered old position is active.
+                'majority': More than half of the covered old positions are
+                    active.
+                'all': All covered old positions are active.
+
+        >>> ai = ArrayInterval.from_str('1:4, 6:8', shape=11)
+        >>> ai.resample(fractions.Fraction(1, 2))
+        ArrayInterval("0:2, 3:4", shape=(6,))
+        >>> ai.resample(0.5, rule='majority')
+        ArrayInterval("1:2, 3:4", shape=(6,))
+        >>> ai.resample(0.5, rule='all')
+        ArrayInterval("1:2, 3:4", shape=(6,))
+        >>> ai.resample(2)
+        ArrayInterval("2:8, 12:16", shape=(22,))
+        >>> ai.resample(fractions.Fraction(2, 3))
+        ArrayInterval("0:3, 4:6", shape=(8,))
+        """
+        factor = fractions.Fraction(factor).limit_denominator()
+        assert factor > 0, factor
+        p, q = factor.numerator, factor.denominator
+        if self.shape is None:
+            num_cells = None
         else:
-            arr = np.zeros(stop - start, dtype=np.bool)
+            num_cells = -(-self.shape[-1] * p // q)
+        intervals = _map_to_cells(
+            self._active_intervals() * p,
+            step=q, length=q, offset=0, num_cells=num_cells, rule=rule,
+        )
+        return self._from_active_intervals(intervals, num_cells)
 
-            for i_start, i_end in intervals:
-                arr[i_start - start:i_end - start] = True
+    def to_frames(self, stft, rule: str = 'any') -> 'ArrayInterval':
+        """
+        Maps the sample resolution to the frame resolution of an STFT
+        by mapping the interval boundaries, i.e. without densification.
+        Uses the same `pad` and `fading` conventions as `stft`, i.e. the frame
+        `t` covers the samples
+        `[t * shift - pad_width, t * shift - pad_width + window_length)`.
 
-        return arr
+        Args:
+            stft: `paderbox.transform.STFT` instance.
+            rule: When is a frame active?
+                'any': Any sample in the frame is active.
+                'majority': More than half of the samples in the frame are
+                    active. The padding counts as inactive.
+                'all': All samples in the frame are active.
+
+        >>> from paderbox.transform import STFT
+        >>> stft = STFT(shift=4, size=8, fading=None)
+        >>> ai = ArrayInterval.from_str('6:12', shape=24)
+        >>> ai.to_frames(stft)
+        ArrayInterval("0:3", shape=(5,))
+        >>> ai.to_frames(stft, rule='majority')
+        ArrayInterval("1:2", shape=(5,))
+        >>> ai.to_frames(STFT(shift=4, size=8, fading='full'))
+        ArrayInterval("1:4", shape=(7,))
+        >>> from paderbox.array import segment_axis
+        >>> np.all(
+        ...     ai.to_frames(stft)[:]
+        ...     == segment_axis(ai[:], 8, 4, end='pad').any(axis=-1))
+        True
+        """
+        fading = stft.fading
+        assert fading in [None, True, False, 'full', 'half'], fading
+        if fading in [None, False]:
+            pad_width = 0
+        elif fading == 'half':
+            pad_width = (stft.window_length - stft.shift) // 2
+        else:
+            pad_width = stft.window_length - stft.shift
+
+        if self.shape is None:
+            num_cells = None
+        else:
+            num_cells = stft.samples_to_frames(self.shape[-1])
+        intervals = _map_to_cells(
+            self._active_intervals(),
+            step=stft.shift, length=stft.window_length, offset=pad_width,
+            num_cells=num_cells, rule=rule,
+        )
+        return self._from_active_intervals(intervals, num_cells)
+
+    def _from_active_intervals(self, intervals, shape) -> 'ArrayInterval':
+        """
+        Inverse of `_active_intervals` for a new shape, i.e. keeps the
+        inverse_mode.
+        """
+        ai = zeros(shape=shape)
+        ai.intervals = intervals
+        if self.inverse_mode:
+            edges, counts = _count_active(ai)
+            ai = ones(shape=shape)
+            ai.intervals = _sections_to_intervals(edges, counts == 0, ai.shape)
+        return ai
 
     def sum(self, axis=None, out=None):
         """
@@ -511,8 +877,64 @@ class ArrayInterval:
         """
         assert out is None, (out, axis, self)
         assert axis is None, (axis, out, self)
-        a, b = np.sum(self.normalized_intervals, axis=0)
-        return b - a
+        intervals = self._normalized_intervals_array
+        return np.sum(intervals[:, 1] - intervals[:, 0])
+
+    @staticmethod
+    def union(*array_intervals: 'ArrayInterval') -> 'ArrayInterval':
+        """
+        Elementwise or of an arbitrary number of array intervals with one
+        sweep over the edges.
+
+        >>> a = ArrayInterval.from_str('1:4, 6:8', shape=10)
+        >>> b = ArrayInterval.from_str('2:7', shape=10)
+        >>> c = ArrayInterval.from_str('9:10', shape=10)
+        >>> ArrayInterval.union(a, b, c)
+        ArrayInterval("1:8, 9:10", shape=(10,))
+        >>> ArrayInterval.union(a, ~b)
+        ArrayInterval("0:4, 6:10", shape=(10,))
+        >>> ArrayInterval.union(zeros(), ones())
+        ArrayInterval("", shape=None, inverse_mode=True)
+        """
+        assert len(array_intervals) > 0, array_intervals
+        edges, counts = _count_active(*array_intervals)
+        return _from_sections(edges, counts > 0, array_intervals[0].shape)
+
+    @staticmethod
+    def intersection(*array_intervals: 'ArrayInterval') -> 'ArrayInterval':
+        """
+        Elementwise and of an arbitrary number of array intervals with one
+        sweep over the edges.
+
+        >>> a = ArrayInterval.from_str('1:4, 6:8', shape=10)
+        >>> b = ArrayInterval.from_str('2:7', shape=10)
+        >>> c = ArrayInterval.from_str('0:9', shape=10)
+        >>> ArrayInterval.intersection(a, b, c)
+        ArrayInterval("2:4, 6:7", shape=(10,))
+        >>> ArrayInterval.intersection(a, ~b)
+        ArrayInterval("1:2, 7:8", shape=(10,))
+        """
+        assert len(array_intervals) > 0, array_intervals
+        edges, counts = _count_active(*array_intervals)
+        return _from_sections(
+            edges, counts == len(array_intervals), array_intervals[0].shape)
+
+    @staticmethod
+    def count_active(*array_intervals: 'ArrayInterval'):
+        """
+        Counts for each position, how many of the array intervals are active.
+
+        Returns:
+            edges: Sorted unique positions where the count changes (and 0).
+            counts: `counts[i]` is the number of active array intervals in
+                `[edges[i], edges[i+1])`. `counts[-1]` holds until the end.
+
+        >>> a = ArrayInterval.from_str('1:4, 6:8', shape=10)
+        >>> b = ArrayInterval.from_str('2:7', shape=10)
+        >>> ArrayInterval.count_active(a, b)
+        (array([0, 1, 2, 4, 6, 7, 8]), array([0, 1, 2, 1, 2, 1, 0]))
+        """
+        return _count_active(*array_intervals)
 
     def __or__(self, other):
         """
@@ -530,7 +952,8 @@ class ArrayInterval:
         elif self.inverse_mode is False and other.inverse_mode is False:
             assert other.shape == self.shape, (self.shape, other.shape)
             ai = zeros(shape=self.shape)
-            ai.intervals = self.intervals + other.intervals
+            ai.intervals = np.concatenate([
+                self._intervals_array, other._intervals_array])
             return ai
         # elif self.inverse_mode is True and other.inverse_mode is True:
         #     assert other.shape == self.shape, (self.shape, other.shape)
@@ -540,7 +963,7 @@ class ArrayInterval:
         elif self.inverse_mode is True and other.inverse_mode is True:
             return ~((~self) & (~other))
         else:
-            raise NotImplementedError(self.inverse_mode, other.inverse_mode)
+            return _combine(operator.__or__, self, other)
 
     def __invert__(self):
         """
@@ -561,7 +984,8 @@ class ArrayInterval:
             ai = zeros(shape=self.shape)
         else:
             ai = ones(shape=self.shape)
-        ai.intervals = self.intervals
+        ai._intervals = self._intervals_array
+        ai._intervals_normalized = self._intervals_normalized
         return ai
 
     def __and__(self, other):
@@ -583,20 +1007,8 @@ class ArrayInterval:
         elif self.inverse_mode is True and other.inverse_mode is True:
             # short circuit
             return ~((~self) | (~other))
-        elif self.inverse_mode is False and other.inverse_mode is False:
-            assert other.shape == self.shape, (self.shape, other.shape)
-            ai = zeros(shape=self.shape)
-
-            normalized_intervals = self.normalized_intervals
-            intervals = []
-            for (start, stop) in other.normalized_intervals:
-                intervals.extend(cy_intersection(
-                    (start, stop), normalized_intervals))
-
-            ai.intervals = intervals
-            return ai
         else:
-            raise NotImplementedError(self.inverse_mode, other.inverse_mode)
+            return _combine(operator.__and__, self, other)
 
     def __xor__(self, other):
         """
@@ -612,93 +1024,9 @@ class ArrayInterval:
         if not isinstance(other, ArrayInterval):
             return NotImplemented
         else:
-            import operator
             return _combine(operator.__xor__, self, other)
 
 
-def _yield_sections(a_intervals, b_intervals):
-    """
-    >>> a = ArrayInterval._normalize([(0, 2), (6, 8), (20, 30), (33, 35)])
-    >>> b = ArrayInterval._normalize([(1, 3), (10, 15), (22, 28), (35, 37)])
-    >>> a
-    ((0, 2), (6, 8), (20, 30), (33, 35))
-    >>> b
-    ((1, 3), (10, 15), (22, 28), (35, 37))
-    >>> for s in _yield_sections(a, b):
-    ...     print(s)
-    (0, 1, True, False)
-    (1, 2, True, True)
-    (2, 3, False, True)
-    (3, 6, False, False)
-    (6, 8, True, False)
-    (8, 10, False, False)
-    (10, 15, False, True)
-    (15, 20, False, False)
-    (20, 22, True, False)
-    (22, 28, True, True)
-    (28, 30, True, False)
-    (30, 33, False, False)
-    (33, 35, True, False)
-    (35, 37, False, True)
-
-    >>> c = ArrayInterval._normalize([
-    ...     (start, stop)
-    ...     for start, stop, a_, b_ in _yield_sections(a, b)
-    ...     if a_ ^ b_
-    ... ])
-    >>> c
-    ((0, 1), (2, 3), (6, 8), (10, 15), (20, 22), (28, 30), (33, 37))
-    """
-
-    a_intervals_iter = iter(a_intervals)
-    b_intervals_iter = iter(b_intervals)
-
-    a_start, a_end = next(a_intervals_iter)
-    b_start, b_end = next(b_intervals_iter)
-
-    current_position = 0
-
-    # while True:
-    for _ in range(10 * (len(a_intervals) + len(b_intervals))):
-        if a_start > current_position and b_start > current_position:
-            new_pos = min(a_start, b_start)
-            yield (current_position, new_pos, False, False)
-            current_position = new_pos
-
-        elif a_start <= current_position and b_start > current_position:
-            new_pos = min(a_end, b_start)
-            yield (current_position, new_pos, True, False)
-            current_position = new_pos
-
-        elif a_start > current_position and b_start <= current_position:
-            new_pos = min(b_end, a_start)
-            yield (current_position, new_pos, False, True)
-            current_position = new_pos
-
-        elif a_start == current_position or b_start == current_position:
-            new_pos = min(a_end, b_end)
-            yield (current_position, new_pos, True, True)
-            current_position = new_pos
-
-        else:
-            raise RuntimeError(current_position, a_start, a_end, b_start, b_end)
-
-        if current_position == a_end:
-            try:
-                a_start, a_end = next(a_intervals_iter)
-            except StopIteration:
-                a_start = float('inf')
-
-        if current_position == b_end:
-            try:
-                b_start, b_end = next(b_intervals_iter)
-            except StopIteration:
-                b_start = float('inf')
-
-        if current_position == max(a_end, b_end):
-            break
-
-
 def _combine(func, *array_intervals, out=None):
     """
 
@@ -738,39 +1066,206 @@ def _combine(func, *array_intervals, out=None):
 
     """
 
-    edges = {0, }
-    for ai in array_intervals:
-        ai: ArrayInterval
-        for start_end in ai.normalized_intervals:
-            edges.update(start_end)
-
-    edges = sorted(edges)
-
-    values = [ai[edges[-1]] for ai in array_intervals]
-    last = func(*values)
-
+    shapes = [ai.shape for ai in array_intervals]
     if out is None:
-        shapes = [ai.shape for ai in array_intervals]
         assert len(set(shapes)) == 1, shapes
         shape = shapes[0]
-
-        if shape is None:
-            if last:
-                out = ones(shape=shape)
-            else:
-                out = zeros(shape=shape)
-        else:
-            out = zeros(shape=shape)
-            out[edges[-1]:] = last
     else:
-        out: ArrayInterval
-        if out.shape is None:
-            assert last == out.inverse_mode, (last, func, values, out,)
+        shape = out.shape
+
+    # Sweep over the sorted edges: Between two consecutive edges the value
+    # of each operand is constant, hence it is enough to evaluate func once
+    # per section, vectorized over all sections.
+    edges = np.unique(np.concatenate([
+        [0],
+        *[ai._normalized_intervals_array.ravel() for ai in array_intervals]
+    ]))
+    values = _vectorized_functions.get(func, func)(
+        *[ai.values_at(edges) for ai in array_intervals])
+    return _from_sections(
+        edges, np.broadcast_to(values, edges.shape), shape, out=out)
+
+
+def _from_sections(edges, values, shape, out=None):
+    """
+    Creates (or fills `out`) an `ArrayInterval` from piecewise constant
+    values (see `_sections_to_intervals`). When the shape is unknown, the
+    last value selects the inverse_mode.
+    """
+    last = values[-1]
+    if out is None:
+        if shape is None and last:
+            out = ones(shape=shape)
         else:
-            out[edges[-1]:] = last
+            out = zeros(shape=shape)
+    elif out.shape is None:
+        assert last == out.inverse_mode, (last, out)
 
-    for s, e in zip(edges, edges[1:]):
-        values = [ai[s] for ai in array_intervals]
-        # print(s, e, values, func(*values))
-        out[s:e] = func(*[ai[s] for ai in array_intervals])
+    out.intervals = _sections_to_intervals(
+        edges, values ^ out.inverse_mode, shape)
     return out
+
+
+_vectorized_functions = {
+    operator.not_: np.logical_not,
+}
+
+
+def _sections_to_intervals(edges, values, shape) -> np.ndarray:
+    """
+    Converts piecewise constant values to normalized intervals.
+
+    Args:
+        edges: Sorted unique positions, where the sections start.
+        values: Boolean value of each section. The last section starts at
+            `edges[-1]` and ends at `shape`.
+        shape: `None` or the shape of the `ArrayInterval`. When the last value
+            is `True`, the shape has to be known.
+
+    >>> _sections_to_intervals([0, 2, 5, 7], [False, True, True, False], None)
+    array([[2, 7]])
+    >>> _sections_to_intervals([0, 2, 5, 7], [True, False, False, True], (9,))
+    array([[0, 2],
+           [7, 9]])
+    """
+    edges = np.asarray(edges, dtype=np.int64)
+    values = np.asarray(values, dtype=bool)
+    if values[-1]:
+        assert shape is not None, (edges, values, shape)
+        ends = np.append(edges[1:], shape[-1])
+    else:
+        ends = edges[1:]
+        values = values[:-1]
+    return ArrayInterval._normalize(
+        np.stack([edges[:len(values)][values], ends[values]], axis=-1))
+
+
+def _count_active(*array_intervals):
+    """
+    Counts for each position, how many of the array_intervals are `True`.
+    Sweeps once over the sorted edges of all array_intervals.
+
+    Returns:
+        edges: Sorted unique positions where the count changes (and 0).
+        counts: `counts[i]` is the number of active array_intervals in
+            `[edges[i], edges[i+1])`. `counts[-1]` holds until the end.
+
+    >>> a = ArrayInterval.from_str('1:4, 6:8', shape=10)
+    >>> b = ArrayInterval.from_str('2:7', shape=10)
+    >>> _count_active(a, b, ~b)
+    (array([0, 1, 2, 4, 6, 7, 8]), array([1, 2, 2, 1, 2, 2, 1]))
+    """
+    shapes = [ai.shape for ai in array_intervals]
+    assert len(set(shapes)) == 1, shapes
+
+    # An interval adds +1 at the start and -1 at the end. In inverse mode the
+    # intervals mark inactive positions, hence the signs are swapped and the
+    # array interval contributes an offset of one.
+    offset = sum([ai.inverse_mode for ai in array_intervals])
+    positions = [np.zeros(1, dtype=np.int64)]
+    deltas = [np.zeros(1, dtype=np.int64)]
+    for ai in array_intervals:
+        intervals = ai._normalized_intervals_array
+        sign = -1 if ai.inverse_mode else 1
+        positions.append(intervals.ravel())
+        deltas.append(np.tile([sign, -sign], len(intervals)))
+
+    positions = np.concatenate(positions)
+    deltas = np.concatenate(deltas)
+    order = np.argsort(positions, kind='stable')
+    positions = positions[order]
+    counts = np.cumsum(deltas[order]) + offset
+
+    # Keep the count after the last event at each position
+    last = np.append(positions[1:] != positions[:-1], True)
+    return positions[last], counts[last]
+
+
+def _flatten(data, prefix=()):
+    """
+    Yields the key tuples and leafs of a nested dict of `ArrayInterval`s.
+
+    >>> list(_flatten({'a': {'b': zeros(), 'c': ones()}}))
+    [(('a', 'b'), ArrayInterval("", shape=None)), (('a', 'c'), ArrayInterval("", shape=None, inverse_mode=True))]
+    """
+    if isinstance(data, ArrayInterval):
+        yield prefix, data
+    elif isinstance(data, collections.abc.Mapping):
+        for k, v in data.items():
+            yield from _flatten(v, prefix + (k,))
+    else:
+        raise TypeError(
+            f'Expect a nested dict of ArrayIntervals, got {type(data)} '
+            f'at {prefix}.')
+
+
+def _map_to_cells(intervals, step, length, offset, num_cells, rule):
+    """
+    Maps normalized intervals to cells, where the cell `t` covers
+    `[t * step - offset, t * step - offset + length)`.
+    Runs in O(N * length / step) for N intervals, independent of the number
+    of cells.
+
+    Args:
+        intervals: Normalized (N, 2) intervals of the active positions.
+        step: Distance between the starts of two cells.
+        length: Number of positions that each cell covers.
+        offset: The first cell starts at `-offset`.
+        num_cells: The number of cells or None, when unknown.
+        rule: 'any', 'majority' or 'all'. See `ArrayInterval.resample`.
+
+    Returns:
+        (M, 2) intervals of the active cells.
+
+    >>> _map_to_cells(np.array([[6, 12]]), 4, 8, 0, 5, 'any')
+    array([[0, 3]])
+    >>> _map_to_cells(np.array([[6, 12]]), 4, 8, 0, 5, 'majority')
+    array([[1, 2]])
+    >>> _map_to_cells(np.array([[6, 12]]), 4, 8, 0, 5, 'all')
+    array([], shape=(0, 2), dtype=int64)
+    """
+    assert rule in ['any', 'majority', 'all'], rule
+    starts, stops = intervals[:, 0], intervals[:, 1]
+
+    if rule == 'any':
+        # Cells that overlap with an interval
+        first = (starts + offset - length) // step + 1
+        last = -(-(stops + offset) // step)
+    else:
+        # Cells that are inside of an interval
+        first = -(-(starts + offset) // step)
+        last = (stops + offset - length) // step + 1
+    cells = [np.stack([first, last], axis=-1)]
+
+    if rule == 'majority':
+        # Only the cells that contain an edge may be partially active.
+        # Candidates are the cells that contain an edge strictly inside.
+        edges = intervals.ravel()
+        lo = (edges + offset - length) // step + 1
+        hi = -(-(edges + offset) // step)
+        candidates = lo[:, None] + np.arange(-(-length // step) + 1)
+        candidates = np.unique(candidates[candidates < hi[:, None]])
+        candidates = candidates[candidates >= 0]
+        if num_cells is not None:
+            candidates = candidates[candidates < num_cells]
+
+        # Number of active positions before x
+        cumsum = np.concatenate([[0], np.cumsum(stops - starts)])
+        padded_starts = np.append(starts, np.iinfo(np.int64).max)
+
+        def coverage(x):
+            i = np.searchsorted(stops, x, side='right')
+            return cumsum[i] + np.maximum(x - padded_starts[i], 0)
+
+        cell_starts = candidates * step - offset
+        active = 2 * (
+            coverage(cell_starts + length) - coverage(cell_starts)
+        ) > length
+        candidates = candidates[active]
+        cells.append(np.stack([candidates, candidates + 1], axis=-1))
+
+    cells = np.concatenate(cells)
+    np.maximum(cells, 0, out=cells)
+    if num_cells is not None:
+        np.minimum(cells, num_cells, out=cells)
+    return ArrayInterval._normalize(cells)
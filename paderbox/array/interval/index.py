@@ -0,0 +1,154 @@
+"""
+`ArrayIntervalIndex` answers the question "which tracks are active in the
+window [start, stop)?" for many `ArrayInterval`s (e.g. all speakers of all
+files from `from_rttm`) without looping over the tracks.
+
+The active intervals of all tracks are grouped by their length in powers of
+two and sorted by their start. An interval with a length in
+`[2 ** k, 2 ** (k + 1))` can only overlap with `[start, stop)`, when it starts
+in `(start - 2 ** (k + 1), stop)`. Hence, each query needs one binary search
+per length class and only checks intervals that may overlap. Since the
+intervals of one track are disjoint, each track contributes at most one
+interval per class that starts in front of the window and does not overlap.
+"""
+from typing import Mapping
+
+import numpy as np
+
+from paderbox.array.interval.core import ArrayInterval, _flatten
+
+__all__ = [
+    'ArrayIntervalIndex',
+]
+
+
+class ArrayIntervalIndex:
+    def __init__(self, data: Mapping):
+        """
+        Args:
+            data: Nested dict with `ArrayInterval`s as leafs (e.g. the
+                output of `from_rttm`). The keys of the index are the tuples
+                of the nested keys.
+
+        >>> index = ArrayIntervalIndex({
+        ...     'S02': {
+        ...         'P05': ArrayInterval.from_str('10:20, 25:30', shape=None),
+        ...         'P06': ArrayInterval.from_str('15:40', shape=None),
+        ...     },
+        ...     'S03': {
+        ...         'P07': ~ArrayInterval.from_str('0:100', shape=200),
+        ...     },
+        ... })
+        >>> index
+        ArrayIntervalIndex(tracks=3, intervals=4)
+        >>> index.keys
+        [('S02', 'P05'), ('S02', 'P06'), ('S03', 'P07')]
+        >>> index.active_at(12)
+        [('S02', 'P05')]
+        >>> index.overlapping(20, 25)
+        [('S02', 'P06')]
+        >>> index.overlapping(30, 150)
+        [('S02', 'P06'), ('S03', 'P07')]
+        """
+        self.keys = []
+        starts = []
+        stops = []
+        tracks = []
+        for i, (key, ai) in enumerate(_flatten(data)):
+            intervals = ai._active_intervals()
+            self.keys.append(key)
+            starts.append(intervals[:, 0])
+            stops.append(intervals[:, 1])
+            tracks.append(np.full(len(intervals), i, dtype=np.int64))
+
+        starts = np.concatenate([np.zeros(0, np.int64), *starts])
+        stops = np.concatenate([np.zeros(0, np.int64), *stops])
+        tracks = np.concatenate([np.zeros(0, np.int64), *tracks])
+
+        # The length class k contains the lengths in [2 ** k, 2 ** (k + 1)).
+        classes = np.frexp(stops - starts)[1] - 1
+        order = np.lexsort((starts, classes))
+        self._starts = starts[order]
+        self._stops = stops[order]
+        self._tracks = tracks[order]
+        classes = classes[order]
+
+        self._classes = []
+        for k in np.unique(classes):
+            lo, hi = np.searchsorted(classes, [k, k + 1])
+            self._classes.append((2 ** (int(k) + 1), lo, hi))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(tracks={len(self)}, '
+                f'intervals={len(self._starts)})')
+
+    def overlapping_batch(self, starts, stops):
+        """
+        Vectorized range queries.
+
+        Args:
+            starts: Integer array-like with the starts of the windows.
+            stops: Integer array-like with the (exclusive) ends of the
+                windows.
+
+        Returns:
+            query_index: Index of the window.
+            track_index: Index of a track that is active somewhere in the
+                window, i.e. `self.keys[track_index]` is the key.
+            Both are sorted by the window and then by the track.
+
+        >>> index = ArrayIntervalIndex({
+        ...     'A': ArrayInterval.from_str('10:20, 25:30', shape=None),
+        ...     'B': ArrayInterval.from_str('15:40', shape=None),
+        ... })
+        >>> index.overlapping_batch([0, 12, 20, 40], [10, 18, 26, 50])
+        (array([1, 1, 2, 2]), array([0, 1, 0, 1]))
+        """
+        starts, stops = np.broadcast_arrays(
+            np.asarray(starts, dtype=np.int64),
+            np.asarray(stops, dtype=np.int64),
+        )
+        starts = starts.ravel()
+        stops = stops.ravel()
+
+        query_index = [np.zeros(0, np.int64)]
+        interval_index = [np.zeros(0, np.int64)]
+        for max_length, lo, hi in self._classes:
+            class_starts = self._starts[lo:hi]
+            first = lo + np.searchsorted(
+                class_starts, starts - max_length, side='right')
+            last = lo + np.searchsorted(class_starts, stops, side='left')
+            counts = np.where(stops > starts, np.maximum(last - first, 0), 0)
+
+            # Concatenate the ranges [first, last) of all queries.
+            query = np.repeat(np.arange(len(starts)), counts)
+            offsets = np.cumsum(counts) - counts
+            candidates = (
+                np.arange(counts.sum())
+                - np.repeat(offsets - first, counts)
+            )
+            keep = self._stops[candidates] > starts[query]
+            query_index.append(query[keep])
+            interval_index.append(candidates[keep])
+
+        query_index = np.concatenate(query_index)
+        track_index = self._tracks[np.concatenate(interval_index)]
+
+        pairs = np.unique(query_index * len(self) + track_index)
+        return pairs // max(len(self), 1), pairs % max(len(self), 1)
+
+    def overlapping(self, start, stop) -> list:
+        """
+        The keys of the tracks that are active somewhere in [start, stop).
+        """
+        _, track_index = self.overlapping_batch([start], [stop])
+        return [self.keys[i] for i in track_index]
+
+    def active_at(self, position) -> list:
+        """
+        The keys of the tracks that are active at the position.
+        """
+        return self.overlapping(position, position + 1)
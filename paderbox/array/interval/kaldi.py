@@ -1,11 +1,11 @@
 from pathlib import Path
-import collections
 import decimal
 
-import numpy as np
-
-from paderbox.array.interval.core import zeros
-from paderbox.array.interval.rttm import _merge_dicts
+from paderbox.array.interval.rttm import (
+    _merge_dicts,
+    _group_intervals,
+    _seconds_to_samples,
+)
 
 
 def from_kaldi_segments(segments_file, shape=None, sample_rate=16000, round_fn=None):
@@ -38,37 +38,30 @@ def from_kaldi_segments_str(segments_str, shape=None, sample_rate=16000, round_f
     Got ['S02_U06.ENH-0010122-0010337', 'S02_U06.ENH', 'BUG', '101.23', '103.37']
 
     """
-    from paderbox.utils.nested import deflatten
-
     lines = segments_str.splitlines()
 
     # Example:
     # Utterance-ID File-ID Start End
     # S02_U06.ENH-0004121-0004187 S02_U06.ENH 41.21 41.87
 
-    data = collections.defaultdict(lambda: zeros(shape))
-
-    for line in lines:
-        parts = line.split()
-        #
-        try:
-            _, file_id, begin_time, end_time = parts
-        except ValueError:
+    parts = [line.split() for line in lines]
+    for p in parts:
+        if len(p) != 4:
             raise ValueError(
                 'Expect "<uttID> <fileID> <start> <end>".\n'
-                f'Got {parts}') from None
-        begin_time = decimal.Decimal(begin_time)
-        end_time = decimal.Decimal(end_time)
-        if round_fn:
-            begin_time = round_fn(begin_time)
-            end_time = round_fn(end_time)
+                f'Got {p}')
 
-        end_time = end_time * sample_rate
-        begin_time = begin_time * sample_rate
+    file_ids = [p[1] for p in parts]
+    begin_times = [p[2] for p in parts]
+    end_times = [p[3] for p in parts]
 
-        assert begin_time == int(begin_time), begin_time
-        assert end_time == int(end_time), end_time
+    if round_fn:
+        begin_times = [round_fn(decimal.Decimal(t)) for t in begin_times]
+        end_times = [round_fn(decimal.Decimal(t)) for t in end_times]
 
-        data[file_id][int(begin_time):int(end_time)] = 1
+    begin = _seconds_to_samples(
+        [str(t) for t in begin_times], sample_rate)
+    end = _seconds_to_samples(
+        [str(t) for t in end_times], sample_rate)
 
-    return dict(data)
+    return _group_intervals(file_ids, begin, end, shape)
@@ -0,0 +1,320 @@
+"""
+Compact binary container for (nested dicts of) `ArrayInterval`s.
+
+The pickle and jsonpickle representation of an `ArrayInterval` is a string
+(see `ArrayInterval.__reduce__`). For thousands of activity tracks, these
+strings are huge and slow to parse. This module stores each track as delta
+encoded edges in the smallest unsigned integer type in one `.npz` file.
+A single track can be loaded without reading or decoding the others (see
+`from_npz(..., lazy=True)`).
+
+`paderbox.io.dump` and `paderbox.io.load` use this format for the suffix
+`.ai.npz`.
+"""
+import collections.abc
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+
+from paderbox.array.interval.core import (
+    ArrayInterval, zeros, ones, _freeze, _flatten
+)
+
+__all__ = [
+    'to_npz',
+    'from_npz',
+    'ArrayIntervalArchive',
+]
+
+SUFFIX = '.ai.npz'
+
+_DTYPES = [np.uint8, np.uint16, np.uint32, np.uint64]
+
+
+def _encode(ai: ArrayInterval) -> np.ndarray:
+    """
+    Delta encoding of the normalized edges with the smallest unsigned
+    integer type.
+
+    >>> _encode(ArrayInterval.from_str('10:20, 25:30', shape=50))
+    array([10, 10,  5,  5], dtype=uint8)
+    >>> _encode(ArrayInterval.from_str('0:70000', shape=None))
+    array([    0, 70000], dtype=uint32)
+    """
+    edges = ai._normalized_intervals_array.ravel()
+    deltas = np.diff(edges, prepend=0)
+    for dtype in _DTYPES[:-1]:
+        if len(deltas) == 0 or deltas.max() <= np.iinfo(dtype).max:
+            return deltas.astype(dtype)
+    return deltas.astype(_DTYPES[-1])
+
+
+def _decode(deltas, shape, inverse_mode) -> ArrayInterval:
+    """
+    >>> ai = ArrayInterval.from_str('10:20, 25:30', shape=50)
+    >>> _decode(_encode(ai), ai.shape, ai.inverse_mode)
+    ArrayInterval("10:20, 25:30", shape=(50,))
+    """
+    return _from_edges(
+        np.cumsum(deltas, dtype=np.int64), shape, inverse_mode)
+
+
+def _from_edges(edges, shape, inverse_mode) -> ArrayInterval:
+    if inverse_mode:
+        ai = ones(shape)
+    else:
+        ai = zeros(shape)
+    ai._intervals = _freeze(edges.reshape(-1, 2))
+    ai._intervals_normalized = True
+    return ai
+
+
+def to_npz(data, file, compress=False):
+    """
+    Writes a nested dict of `ArrayInterval`s (or a single `ArrayInterval`)
+    to a `.npz` file.
+
+    The encoded tracks are concatenated per dtype, hence the file has only
+    a few members, independent of the number of tracks. The npy header of
+    each member is parsed only once, instead of once per track.
+
+    Args:
+        data: Nested dict with str keys and `ArrayInterval`s as leafs
+            (e.g. the output of `from_rttm`) or an `ArrayInterval`.
+        file: Path or file object
+        compress: Whether to use `np.savez_compressed` instead of `np.savez`.
+            Lazy access to a track has to decompress the preceding tracks
+            of the same dtype.
+
+    >>> import tempfile
+    >>> data = {'S02': {
+    ...     'P05': ArrayInterval.from_str('10:20, 25:30', shape=None),
+    ...     'P06': ~ArrayInterval.from_str('0:5', shape=50),
+    ... }}
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     to_npz(data, Path(tmpdir) / 'activity.ai.npz')
+    ...     print(from_npz(Path(tmpdir) / 'activity.ai.npz'))
+    ...     with from_npz(Path(tmpdir) / 'activity.ai.npz', lazy=True) as archive:
+    ...         print(archive)
+    ...         print(archive['S02']['P06'])
+    {'S02': {'P05': ArrayInterval("10:20, 25:30", shape=None), 'P06': ArrayInterval("0:5", shape=(50,), inverse_mode=True)}}
+    ArrayIntervalArchive(keys=['S02'])
+    ArrayInterval("0:5", shape=(50,), inverse_mode=True)
+    """
+    keys = []
+    shapes = []
+    inverse_modes = []
+    groups = []
+    bounds = []
+    chunks = {dtype: [] for dtype in _DTYPES}
+    sizes = {dtype: 0 for dtype in _DTYPES}
+    for key, ai in _flatten(data):
+        assert all(isinstance(k, str) for k in key), (
+            f'Only str keys are supported, got {key!r}.')
+        deltas = _encode(ai)
+        dtype = deltas.dtype.type
+        keys.append(key)
+        shapes.append(-1 if ai.shape is None else ai.shape[-1])
+        inverse_modes.append(ai.inverse_mode)
+        groups.append(_DTYPES.index(dtype))
+        bounds.append((sizes[dtype], sizes[dtype] + len(deltas)))
+        chunks[dtype].append(deltas)
+        sizes[dtype] += len(deltas)
+
+    if isinstance(file, (str, Path)):
+        file = str(file)
+
+    (np.savez_compressed if compress else np.savez)(
+        file,
+        __keys__=np.array(json.dumps(keys)),
+        __shapes__=np.array(shapes, dtype=np.int64),
+        __inverse_modes__=np.array(inverse_modes, dtype=bool),
+        __groups__=np.array(groups, dtype=np.uint8),
+        __bounds__=np.array(bounds, dtype=np.int64).reshape(-1, 2),
+        **{
+            _member_name(dtype): np.concatenate(chunk)
+            for dtype, chunk in chunks.items()
+            if chunk
+        },
+    )
+
+
+def _member_name(dtype):
+    return f'deltas_{np.dtype(dtype).name}'
+
+
+_MEMBER_NAMES = [_member_name(dtype) for dtype in _DTYPES]
+
+
+class _TrackReader:
+    """
+    Reads the encoded tracks from the concatenated delta arrays. Without
+    `preload`, only the requested slice of the delta array is read.
+    """
+
+    def __init__(self, file):
+        if isinstance(file, (str, Path)):
+            file = str(file)
+        self._npz = np.load(file, allow_pickle=False)
+        # Lists, because indexing numpy arrays per track is slow.
+        self._groups = self._npz['__groups__'].tolist()
+        self._bounds = self._npz['__bounds__'].tolist()
+        self._arrays = {}
+        self._headers = {}
+
+        keys = json.loads(str(self._npz['__keys__']))
+        shapes = self._npz['__shapes__']
+        inverse_modes = self._npz['__inverse_modes__']
+        self.tree = {}
+        for i, key in enumerate(keys):
+            leaf = (
+                i,
+                None if shapes[i] < 0 else int(shapes[i]),
+                bool(inverse_modes[i]),
+            )
+            if len(key) == 0:
+                # A single ArrayInterval instead of a dict.
+                self.tree = leaf
+                break
+            node = self.tree
+            for k in key[:-1]:
+                node = node.setdefault(k, {})
+            node[key[-1]] = leaf
+
+    def preload(self):
+        """
+        Reads the complete delta arrays, e.g. to decode all tracks. The
+        cumulative sum is computed once for all tracks of a dtype, a track
+        subtracts the sum of the preceding tracks.
+        """
+        for name in _MEMBER_NAMES:
+            if name in self._npz.files and name not in self._arrays:
+                cumsum = self._npz[name].astype(np.int64)
+                np.cumsum(cumsum, out=cumsum)
+                self._arrays[name] = cumsum
+
+    def _read_slice(self, name, start, stop):
+        with self._npz.zip.open(name + '.npy') as f:
+            if name not in self._headers:
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    _, _, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    _, _, dtype = np.lib.format.read_array_header_2_0(f)
+                self._headers[name] = (f.tell(), dtype)
+            offset, dtype = self._headers[name]
+            offset += start * dtype.itemsize
+            try:
+                f.seek(offset)
+            except (AttributeError, io.UnsupportedOperation):
+                # Zip members are seekable since Python 3.7.
+                f.seek(0)
+                f.read(offset)
+            return np.frombuffer(
+                f.read((stop - start) * dtype.itemsize), dtype=dtype)
+
+    def decode(self, leaf) -> ArrayInterval:
+        i, shape, inverse_mode = leaf
+        name = _MEMBER_NAMES[self._groups[i]]
+        start, stop = self._bounds[i]
+        if name in self._arrays:
+            cumsum = self._arrays[name]
+            edges = cumsum[start:stop]
+            if start > 0:
+                edges = edges - cumsum[start - 1]
+            return _from_edges(edges, shape, inverse_mode)
+        else:
+            deltas = self._read_slice(name, start, stop)
+            return _decode(deltas, shape, inverse_mode)
+
+    def close(self):
+        self._npz.close()
+
+
+class ArrayIntervalArchive(collections.abc.Mapping):
+    """
+    Read only, lazy view on a nested dict of `ArrayInterval`s written with
+    `to_npz`. Only the metadata is read on construction, each track is read
+    and decoded on access, where only the bytes of the track are read.
+    """
+
+    def __init__(self, file, _reader=None, _tree=None):
+        if _reader is None:
+            _reader = _TrackReader(file)
+            _tree = _reader.tree
+            if not isinstance(_tree, dict):
+                _reader.close()
+                raise TypeError(
+                    f'{file} contains a single ArrayInterval and not a dict. '
+                    f'Use from_npz to load it.'
+                )
+        self._reader = _reader
+        self._tree = _tree
+
+    def __getitem__(self, key):
+        value = self._tree[key]
+        if isinstance(value, dict):
+            return self.__class__(None, _reader=self._reader, _tree=value)
+        return self._reader.decode(value)
+
+    def __iter__(self):
+        return iter(self._tree)
+
+    def __len__(self):
+        return len(self._tree)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(keys={list(self._tree)})'
+
+    def to_dict(self):
+        """Loads all tracks and returns a nested dict."""
+        return {
+            k: v.to_dict() if isinstance(v, ArrayIntervalArchive) else v
+            for k, v in self.items()
+        }
+
+    def close(self):
+        self._reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def from_npz(file, lazy=False):
+    """
+    Reads a nested dict of `ArrayInterval`s written with `to_npz`.
+
+    Args:
+        file: Path or file object
+        lazy: If True, return an `ArrayIntervalArchive`, that reads the
+            tracks on demand. Close it (or use it as context manager), when
+            it is no longer needed. Ignored, when the file contains a
+            single `ArrayInterval`.
+
+    Returns:
+        Nested dict of `ArrayInterval`s, `ArrayIntervalArchive` or
+        `ArrayInterval`.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     to_npz(~ArrayInterval.from_str('0:5', shape=50), Path(tmpdir) / 'a.ai.npz')
+    ...     print(from_npz(Path(tmpdir) / 'a.ai.npz', lazy=True))
+    ArrayInterval("0:5", shape=(50,), inverse_mode=True)
+    """
+    reader = _TrackReader(file)
+    if not isinstance(reader.tree, dict):
+        try:
+            return reader.decode(reader.tree)
+        finally:
+            reader.close()
+    archive = ArrayIntervalArchive(None, _reader=reader, _tree=reader.tree)
+    if lazy:
+        return archive
+    with archive:
+        reader.preload()
+        return archive.to_dict()
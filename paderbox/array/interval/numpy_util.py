@@ -0,0 +1,163 @@
+"""
+NumPy implementations of the kernels in `util.pyx`.
+
+They are used when the Cython extension is not built (e.g. in a fresh
+environment without a compiler), so importing `paderbox.array.interval`
+never triggers a compilation. The interval kernels operate on all intervals
+at once, hence they are faster than the Cython loops for many intervals.
+Unlike the Cython kernels, they return read only (N, 2) int64 arrays instead
+of tuples.
+
+See `scripts/benchmark_interval.py` for a comparison.
+"""
+import warnings
+
+import numpy as np
+
+__all__ = [
+    'np_non_intersection',
+    'np_intersection',
+    'np_parse_item',
+    'np_str_to_intervals',
+]
+
+
+# Deletes everything except the separators from a valid intervals string.
+_DELETE_NUMBERS = str.maketrans('', '', '0123456789+-')
+
+
+def _as_intervals(intervals) -> np.ndarray:
+    return np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+
+
+def _frozen(intervals) -> np.ndarray:
+    intervals = np.ascontiguousarray(intervals, dtype=np.int64)
+    intervals.flags.writeable = False
+    return intervals
+
+
+def np_non_intersection(interval, intervals) -> np.ndarray:
+    """
+    Removes the interval `[start, end)` from the intervals.
+
+    >>> np_non_intersection((5, 10), [(0, 3), (4, 6), (7, 8), (9, 20), (0, 30)])
+    array([[ 0,  3],
+           [ 4,  5],
+           [10, 20],
+           [ 0,  5],
+           [10, 30]])
+    >>> np_non_intersection((5, 10), [(5, 12), (3, 10)])
+    array([[10, 12],
+           [ 3,  5]])
+    """
+    start, end = interval
+    intervals = _as_intervals(intervals)
+
+    # Each interval can be split in a left part [i_start, min(i_end, start))
+    # and a right part [max(i_start, end), i_end).
+    new = np.empty((len(intervals), 2, 2), dtype=np.int64)
+    new[:, 0, 0] = intervals[:, 0]
+    np.minimum(intervals[:, 1], start, out=new[:, 0, 1])
+    np.maximum(intervals[:, 0], end, out=new[:, 1, 0])
+    new[:, 1, 1] = intervals[:, 1]
+    new = new.reshape(-1, 2)
+    return _frozen(new[new[:, 0] < new[:, 1]])
+
+
+def np_intersection(interval, intervals) -> np.ndarray:
+    """
+    Clips the intervals to the interval `[start, end)` and drops the empty
+    intervals.
+
+    >>> np_intersection((5, 10), [(0, 3), (4, 6), (7, 8), (9, 20)])
+    array([[ 5,  6],
+           [ 7,  8],
+           [ 9, 10]])
+    """
+    start, end = interval
+    new = np.clip(_as_intervals(intervals), start, end)
+    return _frozen(new[new[:, 0] < new[:, 1]])
+
+
+def np_parse_item(item, shape):
+    """
+    Converts a slice to the start and stop value. Same as `cy_parse_item`.
+
+    >>> np_parse_item(slice(2, None), (10,))
+    (2, 10)
+    >>> np_parse_item(slice(None, 5), None)
+    (0, 5)
+    """
+    if not isinstance(item, slice):
+        raise AssertionError(
+            f'Expect item ({item}) to has the type slice and not {type(item)}.'
+        )
+    assert item.step is None, (item, 'Step is not supported.')
+
+    start = 0 if item.start is None else int(item.start)
+    if item.stop is None:
+        if shape is None:
+            raise RuntimeError(
+                'You tried to slice an ArrayInterval with unknown shape '
+                'without a stop value.\n'
+                'This is not supported, either the shape has to be known\n'
+                'or you have to specify a stop value for the slice '
+                '(i.e. array_interval[:stop])\n'
+                'You called the array interval with:\n'
+                f'    array_interval[{item}]'
+            )
+        stop = shape[-1]
+    else:
+        stop = int(item.stop)
+
+    assert start >= 0, (start, item)
+    assert stop >= 0, (stop, item)
+    if shape is not None:
+        assert start <= shape[-1], (start, item)
+        assert stop <= shape[-1], (stop, item)
+
+    return start, stop
+
+
+def np_str_to_intervals(string) -> np.ndarray:
+    """
+    Parses the string representation "<start>:<end>, <start>:<end>, ..."
+    with a single call to the NumPy text parser.
+
+    >>> np_str_to_intervals('1:4, 5:20, 21:25,')
+    array([[ 1,  4],
+           [ 5, 20],
+           [21, 25]])
+    >>> np_str_to_intervals('')
+    array([], shape=(0, 2), dtype=int64)
+    >>> np_str_to_intervals('1:4, 5')
+    Traceback (most recent call last):
+    ...
+    ValueError: Invalid intervals string: '1:4, 5'
+    >>> np_str_to_intervals('1:2:3, 4')
+    Traceback (most recent call last):
+    ...
+    ValueError: Invalid intervals string: '1:2:3, 4'
+    """
+    stripped = string.replace(' ', '').strip(',')
+    if stripped == '':
+        return _frozen(np.zeros((0, 2), dtype=np.int64))
+
+    with warnings.catch_warnings():
+        # np.fromstring stops with a DeprecationWarning at invalid input.
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            values = np.fromstring(
+                stripped.replace(':', ','), dtype=np.int64, sep=',')
+        except (DeprecationWarning, ValueError) as e:
+            raise ValueError(f'Invalid intervals string: {string!r}') from e
+
+    # The separators have to alternate between ':' and ','.
+    num_intervals = stripped.count(',') + 1
+    separators = ':,' * (num_intervals - 1) + ':'
+    if (
+            len(values) != 2 * num_intervals
+            or stripped.translate(_DELETE_NUMBERS) != separators
+    ):
+        raise ValueError(f'Invalid intervals string: {string!r}')
+    return _frozen(values.reshape(-1, 2))
@@ -95,34 +95,148 @@ def from_rttm(rttm_file, shape=None, sample_rate=16000):
         data, **kwargs)
 
 
-def from_rttm_str(rttm_str, shape=None, sample_rate=16000):
-
-    from paderbox.utils.nested import deflatten
-    import decimal
-
-    lines = rttm_str.splitlines()
-
-    # SPEAKER S02_U06.ENH 1   40.60    3.22 <NA> <NA> P05 <NA>
-
-    data = collections.defaultdict(lambda: zeros(shape))
+def _seconds_to_samples(times, sample_rate):
+    """
+    Converts decimal strings with the time in seconds to integer samples.
+    Uses exact integer arithmetic, i.e. the same result as
+    `int(decimal.Decimal(time) * sample_rate)`, and fails when the time is
+    not an integer number of samples.
+
+    >>> _seconds_to_samples(['40.60', '3.22', '0', '1.5', '.5'], 16000)
+    array([649600,  51520,      0,  24000,   8000])
+    >>> _seconds_to_samples(['1e-3', '2'], 16000)
+    array([   16, 32000])
+    >>> _seconds_to_samples(['0.00001'], 16000)
+    Traceback (most recent call last):
+    ...
+    ValueError: 0.00001 s is not an integer number of samples at 16000 Hz.
+    """
+    samples = []
+    for time in times:
+        try:
+            # '40.60' * 16000 = 4060 * 16000 / 10 ** 2
+            integer, _, fraction = time.partition('.')
+            sample, remainder = divmod(
+                int(integer + fraction) * sample_rate, 10 ** len(fraction))
+        except (ValueError, TypeError):
+            # Unusual formats (e.g. exponents) or a non integer sample_rate
+            sample = decimal.Decimal(time) * sample_rate
+            remainder = sample - int(sample)
+            sample = int(sample)
+        if remainder:
+            raise ValueError(
+                f'{time} s is not an integer number of samples '
+                f'at {sample_rate} Hz.')
+        samples.append(sample)
+    return np.array(samples, dtype=np.int64)
+
+
+def _samples_to_seconds_str(samples, sample_rate):
+    """
+    Converts integer samples to strings with the time in seconds.
+    Uses the same format as `str(decimal.Decimal(sample) / sample_rate)`,
+    but integer arithmetic, when the sample_rate allows an exact decimal
+    representation.
+
+    >>> _samples_to_seconds_str([0, 16000, 1600, 1, 24000], 16000)
+    ['0', '1', '0.1', '0.0000625', '1.5']
+    >>> _samples_to_seconds_str([1, 3], 3)
+    ['0.3333333333333333333333333333', '1']
+    """
+    samples = np.asarray(samples, dtype=np.int64)
+
+    # The result has a finite decimal representation, when the sample_rate
+    # has no other prime factors than 2 and 5.
+    digits = 0
+    rest = sample_rate
+    if rest == int(rest) and rest > 0:
+        rest = int(rest)
+        for factor in [2, 5]:
+            exponent = 0
+            while rest % factor == 0:
+                rest //= factor
+                exponent += 1
+            digits = max(digits, exponent)
+    scale = 10 ** digits
+
+    if rest == 1 and digits <= 9:
+        integer, fraction = np.divmod(samples * (scale // sample_rate), scale)
+        # Decimal switches to the scientific notation for small numbers.
+        if not np.any((integer == 0) & (fraction > 0)
+                      & (fraction * 10 ** 6 < scale)):
+            return [
+                f'{i}.{f:0{digits}d}'.rstrip('0') if f else f'{i}'
+                for i, f in zip(integer.tolist(), fraction.tolist())
+            ]
+
+    return [
+        str(decimal.Decimal(sample) / sample_rate)
+        for sample in samples.tolist()
+    ]
+
+
+def _group_intervals(keys, begin, end, shape):
+    """
+    Groups the intervals by key (with a stable sort) and creates one
+    ArrayInterval per key in one shot. The keys keep the order of their first
+    occurrence.
 
-    for line in lines:
-        parts = line.split()
-        assert parts[0] == 'SPEAKER', parts
-        file_id = parts[1]
-        channel_id = parts[2]
-        begin_time = decimal.Decimal(parts[3])
-        duration_time = decimal.Decimal(parts[4])
-        name = parts[7]
+    >>> _group_intervals(['a', 'b', 'a'], [0, 2, 5], [1, 3, 6], None)
+    {'a': ArrayInterval("0:1, 5:6", shape=None), 'b': ArrayInterval("2:3", shape=None)}
+    """
+    index = {}
+    codes = np.array(
+        [index.setdefault(k, len(index)) for k in keys], dtype=np.int64)
+    order = np.argsort(codes, kind='stable')
+    splits = np.flatnonzero(np.diff(codes[order])) + 1
+    intervals = np.stack([
+        np.asarray(begin, dtype=np.int64),
+        np.asarray(end, dtype=np.int64),
+    ], axis=-1)[order]
+
+    data = {}
+    for key, group in zip(index, np.split(intervals, splits)):
+        data[key] = zeros(shape)
+        data[key].add_intervals(group)
+    return data
 
-        end_time = (begin_time + duration_time) * sample_rate
-        begin_time = begin_time * sample_rate
 
-        assert begin_time == int(begin_time), begin_time
-        assert end_time == int(end_time), end_time
+def from_rttm_str(rttm_str, shape=None, sample_rate=16000):
+    """
+    >>> from_rttm_str(
+    ...     'SPEAKER S02 1 0 1 <NA> <NA> 1 <NA>\\n'
+    ...     'SPEAKER S02 1 2 1 <NA> <NA> 1 <NA>\\n'
+    ...     'SPEAKER S03 1 0.5 0.25 <NA> <NA> 1 <NA> <NA>\\n'
+    ... )
+    {'S02': {'1': ArrayInterval("0:16000, 32000:48000", shape=None)}, 'S03': {'1': ArrayInterval("8000:12000", shape=None)}}
+    """
+    from paderbox.utils.nested import deflatten
 
-        data[(file_id, name)][int(begin_time):int(end_time)] = 1
+    # SPEAKER S02_U06.ENH 1   40.60    3.22 <NA> <NA> P05 <NA>
 
+    lines = rttm_str.splitlines()
+    tokens = rttm_str.split()
+
+    if len(tokens) == 9 * len(lines) and all(
+            t == 'SPEAKER' for t in tokens[0::9]):
+        # Fast path: All lines have 9 fields, tokenize the whole file at once.
+        file_ids = tokens[1::9]
+        begin_times = tokens[3::9]
+        duration_times = tokens[4::9]
+        names = tokens[7::9]
+    else:
+        parts = [line.split() for line in lines]
+        for p in parts:
+            assert p[0] == 'SPEAKER', p
+        file_ids = [p[1] for p in parts]
+        begin_times = [p[3] for p in parts]
+        duration_times = [p[4] for p in parts]
+        names = [p[7] for p in parts]
+
+    begin = _seconds_to_samples(begin_times, sample_rate)
+    end = begin + _seconds_to_samples(duration_times, sample_rate)
+
+    data = _group_intervals(zip(file_ids, names), begin, end, shape)
     return deflatten(data, sep=None)
 
 
@@ -157,25 +271,34 @@ def to_rttm_str(data, sample_rate=16000):
     SPEAKER S02 1 0 2 <NA> <NA> 1 <NA>
 
     """
-    lines = []
+    keys = []
+    intervals = []
     for file_id in data.keys():
         if isinstance(data[file_id], dict):
-            keys = data[file_id].keys()
+            names = data[file_id].keys()
         else:
-            keys = range(len(data[file_id]))
+            names = range(len(data[file_id]))
 
-        for name in keys:
+        for name in names:
             content = data[file_id][name]
             if isinstance(content, np.ndarray):
                 content = ArrayInterval(content)
-            for begin, end in content.intervals:
-                duration = decimal.Decimal(int(end - begin)) / sample_rate
-                begin = decimal.Decimal(int(begin)) / sample_rate
-                lines.append(
-                    f'SPEAKER {file_id} 1 {begin} {duration} <NA> <NA> {name} <NA>'
-                )
-
-    return '\n'.join(lines)
+            content = content._intervals_array
+            keys.extend([(file_id, name)] * len(content))
+            intervals.append(content)
+
+    if len(keys) == 0:
+        return ''
+
+    intervals = np.concatenate(intervals)
+    begin = _samples_to_seconds_str(intervals[:, 0], sample_rate)
+    duration = _samples_to_seconds_str(
+        intervals[:, 1] - intervals[:, 0], sample_rate)
+
+    return '\n'.join([
+        f'SPEAKER {file_id} 1 {b} {d} <NA> <NA> {name} <NA>'
+        for (file_id, name), b, d in zip(keys, begin, duration)
+    ])
 
 
 def to_rttm(data, rttm_file, sample_rate=16000):
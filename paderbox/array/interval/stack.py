@@ -0,0 +1,240 @@
+"""
+`ArrayIntervalStack` holds the activity of multiple sources (e.g. the
+speakers of one recording from `from_rttm`) in one sorted edge structure.
+This allows to answer overlap statistics (number of active speakers, overlap
+regions, exclusive activity of each speaker, ...) with one sweep over the
+edges instead of many pairwise `&` and `|` operations or a densification to
+huge boolean arrays.
+"""
+from typing import Union, Sequence, Mapping
+
+import numpy as np
+
+from paderbox.array.interval.core import (
+    ArrayInterval, _from_sections, _intervals_to_mask
+)
+
+
+class ArrayIntervalStack:
+    def __init__(
+            self,
+            array_intervals: Union[
+                Sequence[ArrayInterval], Mapping[str, ArrayInterval]],
+    ):
+        """
+        Args:
+            array_intervals: List or dict of `ArrayInterval`s with the same
+                shape. When a dict is given, the results of the per source
+                methods are dicts with the same keys.
+
+        >>> stack = ArrayIntervalStack({
+        ...     'A': ArrayInterval.from_str('0:10, 20:30', shape=40),
+        ...     'B': ArrayInterval.from_str('5:25', shape=40),
+        ... })
+        >>> stack
+        ArrayIntervalStack(names=['A', 'B'], shape=(2, 40))
+        >>> stack.edges
+        array([ 0,  5, 10, 20, 25, 30])
+        >>> stack.activity.astype(int)
+        array([[1, 0],
+               [1, 1],
+               [0, 1],
+               [1, 1],
+               [1, 0],
+               [0, 0]])
+        >>> stack['B']
+        ArrayInterval("5:25", shape=(40,))
+        """
+        if isinstance(array_intervals, Mapping):
+            self.names = list(array_intervals.keys())
+            array_intervals = list(array_intervals.values())
+        else:
+            self.names = None
+            array_intervals = list(array_intervals)
+
+        shapes = [ai.shape for ai in array_intervals]
+        assert len(set(shapes)) <= 1, shapes
+        self._shape = shapes[0] if shapes else None
+
+        num_sources = len(array_intervals)
+
+        # Collect the +1/-1 events of all sources and sort them once.
+        # In inverse mode the intervals mark inactive positions, hence the
+        # signs are swapped and the source starts active.
+        positions = [np.zeros(1, dtype=np.int64)]
+        sources = [np.zeros(1, dtype=np.int64)]
+        deltas = [np.zeros(1, dtype=np.int8)]
+        for i, ai in enumerate(array_intervals):
+            intervals = ai._normalized_intervals_array
+            sign = -1 if ai.inverse_mode else 1
+            positions.append(intervals.ravel())
+            sources.append(np.full(intervals.size, i, dtype=np.int64))
+            deltas.append(
+                np.tile(np.array([sign, -sign], np.int8), len(intervals)))
+        positions = np.concatenate(positions)
+        sources = np.concatenate(sources)
+        deltas = np.concatenate(deltas)
+
+        self.edges, index = np.unique(positions, return_inverse=True)
+        activity = np.zeros((len(self.edges), num_sources), dtype=np.int8)
+        activity[0] = [ai.inverse_mode for ai in array_intervals]
+        np.add.at(activity, (index, sources), deltas)
+        np.cumsum(activity, axis=0, out=activity)
+        # `activity[i, s]` is the activity of source `s` in
+        # `[edges[i], edges[i+1])`, the last row holds until the end.
+        self.activity = activity.view(np.bool_)
+
+    @property
+    def shape(self):
+        if self._shape is None:
+            return None
+        return (self.activity.shape[-1], *self._shape)
+
+    def __len__(self):
+        return self.activity.shape[-1]
+
+    def __repr__(self):
+        if self.names is None:
+            return f'{self.__class__.__name__}(shape={self.shape})'
+        else:
+            return (f'{self.__class__.__name__}(names={self.names}, '
+                    f'shape={self.shape})')
+
+    def _index(self, source):
+        if self.names is None:
+            return source
+        return self.names.index(source)
+
+    def _per_source(self, values):
+        """Converts the activity to one ArrayInterval per source."""
+        array_intervals = [
+            _from_sections(self.edges, values[:, i], self._shape)
+            for i in range(values.shape[-1])
+        ]
+        if self.names is None:
+            return array_intervals
+        return dict(zip(self.names, array_intervals))
+
+    def __getitem__(self, source) -> ArrayInterval:
+        return _from_sections(
+            self.edges, self.activity[:, self._index(source)], self._shape)
+
+    def active_count(self):
+        """
+        Number of active sources.
+
+        Returns:
+            edges: Sorted unique positions where the count may change.
+            counts: `counts[i]` is the number of active sources in
+                `[edges[i], edges[i+1])`. `counts[-1]` holds until the end.
+
+        >>> stack = ArrayIntervalStack([
+        ...     ArrayInterval.from_str('0:10, 20:30', shape=40),
+        ...     ArrayInterval.from_str('5:25', shape=40),
+        ... ])
+        >>> stack.active_count()
+        (array([ 0,  5, 10, 20, 25, 30]), array([1, 2, 1, 2, 1, 0]))
+        """
+        return self.edges, np.sum(self.activity, axis=-1)
+
+    def exactly(self, k: int) -> ArrayInterval:
+        """
+        Regions where exactly k sources are active.
+
+        >>> stack = ArrayIntervalStack([
+        ...     ArrayInterval.from_str('0:10, 20:30', shape=40),
+        ...     ArrayInterval.from_str('5:25', shape=40),
+        ... ])
+        >>> stack.exactly(0)
+        ArrayInterval("30:40", shape=(40,))
+        >>> stack.exactly(1)
+        ArrayInterval("0:5, 10:20, 25:30", shape=(40,))
+        """
+        _, counts = self.active_count()
+        return _from_sections(self.edges, counts == k, self._shape)
+
+    def overlap(self, min_sources: int = 2) -> ArrayInterval:
+        """
+        Regions where at least `min_sources` sources are active.
+
+        >>> stack = ArrayIntervalStack([
+        ...     ArrayInterval.from_str('0:10, 20:30', shape=40),
+        ...     ArrayInterval.from_str('5:25', shape=40),
+        ... ])
+        >>> stack.overlap()
+        ArrayInterval("5:10, 20:25", shape=(40,))
+        >>> stack.overlap(1)
+        ArrayInterval("0:30", shape=(40,))
+        """
+        _, counts = self.active_count()
+        return _from_sections(self.edges, counts >= min_sources, self._shape)
+
+    def exclusive(self):
+        """
+        Per source the regions where only this source is active.
+
+        >>> stack = ArrayIntervalStack({
+        ...     'A': ArrayInterval.from_str('0:10, 20:30', shape=40),
+        ...     'B': ArrayInterval.from_str('5:25', shape=40),
+        ... })
+        >>> stack.exclusive()
+        {'A': ArrayInterval("0:5, 25:30", shape=(40,)), 'B': ArrayInterval("10:20", shape=(40,))}
+        """
+        _, counts = self.active_count()
+        return self._per_source(self.activity & (counts == 1)[:, None])
+
+    def to_mask(self, stft=None, rule: str = 'any', num_frames: int = None
+                ) -> np.ndarray:
+        """
+        Dense (S, T) activity mask.
+
+        Without `stft`, T is the number of positions (e.g. samples). With
+        `stft`, T is the number of STFT frames and the frames are mapped
+        like in `ArrayInterval.to_frames`, i.e. with the `window_length`,
+        `shift` and `fading` of the STFT, hence the mask lines up with the
+        frames of `stft(signal)`.
+
+        Args:
+            stft: Optional `paderbox.transform.STFT` instance.
+            rule: 'any', 'majority' or 'all'. See `ArrayInterval.to_frames`.
+            num_frames: Number of frames. Defaults to the shape (i.e. the
+                number of STFT frames of the shape) and is required, when
+                the shape is unknown.
+
+        >>> from paderbox.transform import STFT
+        >>> stack = ArrayIntervalStack([
+        ...     ArrayInterval.from_str('0:10, 20:30', shape=40),
+        ...     ArrayInterval.from_str('5:25', shape=40),
+        ... ])
+        >>> stack.to_mask(STFT(shift=10, size=20, fading=None)).astype(int)
+        array([[1, 1, 1],
+               [1, 1, 1]])
+        >>> stack.to_mask(STFT(shift=10, size=20, fading=None),
+        ...               rule='majority').astype(int)
+        array([[0, 0, 0],
+               [1, 1, 0]])
+        >>> stack.to_mask().shape
+        (2, 40)
+        """
+        sources = [
+            _from_sections(self.edges, self.activity[:, i], self._shape)
+            for i in range(len(self))
+        ]
+        if stft is not None:
+            sources = [ai.to_frames(stft, rule=rule) for ai in sources]
+            shape = None if self._shape is None else \
+                stft.samples_to_frames(self._shape[-1])
+        else:
+            shape = None if self._shape is None else self._shape[-1]
+
+        if num_frames is None:
+            assert shape is not None, (
+                'num_frames is required, when the shape is unknown.')
+            num_frames = shape
+
+        mask = np.zeros((len(sources), num_frames), dtype=bool)
+        for i, ai in enumerate(sources):
+            intervals = np.clip(ai._active_intervals(), 0, num_frames)
+            intervals = intervals[intervals[:, 0] < intervals[:, 1]]
+            mask[i] = _intervals_to_mask(intervals, num_frames)
+        return mask
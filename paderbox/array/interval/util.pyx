@@ -18,13 +18,14 @@ def cy_non_intersection(interval, intervals):
 
     for i_start, i_end in intervals:
 
-        if start < i_start < end:
-            i_start = end
-        elif start < i_end < end:
-            i_end = start
-        elif i_start < start and end < i_end:
-            new_interval.append((i_start, start))
-            i_start = end
+        if i_start < start:
+            if end < i_end:
+                new_interval.append((i_start, start))
+                i_start = end
+            else:
+                i_end = min(i_end, start)
+        else:
+            i_start = max(i_start, end)
 
         if i_start < i_end:
             new_interval.append((i_start, i_end))
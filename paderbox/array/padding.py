@@ -4,6 +4,8 @@ from dataclasses import dataclass
 __all__ = [
     'pad_to',
     'pad_axis',
+    'pad_batch',
+    'bucket_boundaries',
     'roll_zeropad',
     'Cutter',
 ]
@@ -86,6 +88,229 @@ def pad_axis(array, pad_width, *, axis, mode='constant', **pad_kwargs):
     return np.pad(array, pad_width=npad, mode=mode, **pad_kwargs)
 
 
+def pad_batch(
+        arrays,
+        *,
+        axis=-1,
+        to_multiple_of=None,
+        length=None,
+        pad_value=0,
+        dtype=None,
+        mask=None,
+        out=None,
+):
+    """ Stacks arrays with different lengths along `axis` to one padded batch.
+
+    In contrast to `np.stack([pad_axis(a, ...) for a in arrays])` the output
+    is allocated once and each example is copied once. Only the padded region
+    is filled with `pad_value`.
+
+    Args:
+        arrays: Sequence of arrays, that have the same shape except for `axis`.
+        axis: The axis (of the examples) with the variable length.
+        to_multiple_of: Round the padded length up to a multiple of this
+            value (e.g. the total stride of a network).
+        length: Padded length. Defaults to the maximum length.
+        pad_value: Value of the padded region.
+        dtype: Defaults to `np.result_type` of the arrays.
+        mask: None, 'bool' or 'interval'. When not None, additionally
+            return the valid region as boolean array with the shape
+            (batch, length) or as list of `ArrayInterval`s.
+        out: Optional preallocated output (e.g. a reused buffer).
+
+    Returns:
+        batch: Array with the new batch axis in front.
+        sequence_lengths: Array with the lengths of the examples.
+        mask: Only returned, when `mask` is not None.
+
+    >>> batch, sequence_lengths = pad_batch([np.ones(3), 2 * np.ones(1)])
+    >>> batch
+    array([[1., 1., 1.],
+           [2., 0., 0.]])
+    >>> sequence_lengths
+    array([3, 1])
+    >>> batch, _, mask = pad_batch(
+    ...     [np.ones((2, 3)), np.ones((2, 1))], axis=1, to_multiple_of=4,
+    ...     mask='bool')
+    >>> batch.shape
+    (2, 2, 4)
+    >>> mask
+    array([[ True,  True,  True, False],
+           [ True, False, False, False]])
+    >>> pad_batch([np.ones(3), np.ones(1)], mask='interval')[2]
+    [ArrayInterval("0:3", shape=(3,)), ArrayInterval("0:1", shape=(3,))]
+    """
+    arrays = [np.asarray(array) for array in arrays]
+    assert len(arrays) > 0, 'Expect at least one array.'
+    assert mask in [None, 'bool', 'interval'], mask
+
+    ndim = arrays[0].ndim
+    assert ndim > 0, arrays[0].shape
+    axis = axis % ndim
+    shapes = {a.shape[:axis] + a.shape[axis + 1:] for a in arrays}
+    assert len(shapes) == 1 and all(a.ndim == ndim for a in arrays), (
+        f'Expect the same shape except for axis {axis}, got '
+        f'{[a.shape for a in arrays]}'
+    )
+
+    sequence_lengths = np.array([a.shape[axis] for a in arrays])
+    if length is None:
+        length = int(sequence_lengths.max())
+    assert length >= sequence_lengths.max(), (length, sequence_lengths)
+    if to_multiple_of is not None:
+        length = -(-length // to_multiple_of) * to_multiple_of
+
+    shape = list(arrays[0].shape)
+    shape[axis] = length
+    shape = (len(arrays), *shape)
+    if out is None:
+        if dtype is None:
+            dtype = np.result_type(*arrays)
+        out = np.empty(shape, dtype=dtype)
+    else:
+        assert out.shape == shape, (out.shape, shape)
+
+    # Index with the batch axis in front
+    index = [slice(None)] * (ndim + 1)
+    for b, (array, sequence_length) in enumerate(zip(arrays, sequence_lengths)):
+        index[0] = b
+        index[axis + 1] = slice(None, sequence_length)
+        out[tuple(index)] = array
+        index[axis + 1] = slice(sequence_length, None)
+        out[tuple(index)] = pad_value
+
+    if mask is None:
+        return out, sequence_lengths
+    elif mask == 'bool':
+        mask = np.arange(length) < sequence_lengths[:, None]
+    else:
+        from paderbox.array.interval import zeros
+        mask = [zeros(length) for _ in sequence_lengths]
+        for ai, sequence_length in zip(mask, sequence_lengths):
+            ai[:sequence_length] = True
+    return out, sequence_lengths, mask
+
+
+def _bucket_layer(cost, n, s, values, k):
+    """
+    One layer of the dynamic program in `bucket_boundaries`:
+
+        new_cost[j] = min_{k <= i < j} cost[i] + pad(i, j)
+
+    where `pad(i, j)` is the cost to pad `values[i:j]` to `values[j - 1]`.
+    `pad` fulfills the quadrangle inequality, hence the optimal `i` is
+    monotone in `j` and divide and conquer needs O(V log V) instead of
+    O(V^2) evaluations. The recursion is evaluated level by level, where
+    all segments of a level are vectorized, i.e. O(log V) NumPy calls.
+    """
+    num_values = len(values)
+    cost_s = cost + s
+    new_cost = np.full(num_values + 1, np.inf)
+    start = np.zeros(num_values + 1, dtype=np.int64)
+
+    # Segments: Compute new_cost[j_lo:j_hi + 1], the optimal i is in
+    # [i_lo, i_hi].
+    j_lo = np.array([k + 1])
+    j_hi = np.array([num_values])
+    i_lo = np.array([k])
+    i_hi = np.array([num_values - 1])
+    while len(j_lo) > 0:
+        j = (j_lo + j_hi) // 2
+        hi = np.minimum(i_hi, j - 1)
+        sizes = hi - i_lo + 1
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        # Candidates i of all segments, flattened. The segment index is a
+        # cumsum of markers, which is faster than np.repeat for many small
+        # segments.
+        segment = np.zeros(sizes.sum(), dtype=np.int64)
+        segment[offsets[1:]] = 1
+        np.cumsum(segment, out=segment)
+        i = np.arange(len(segment)) + (i_lo - offsets)[segment]
+        # cost[i] + (n[j] - n[i]) * values[j - 1] - (s[j] - s[i]), where
+        # the terms that depend only on j are computed per segment.
+        candidates = cost_s[i] - n[i] * values[j - 1][segment]
+        candidates += (n[j] * values[j - 1] - s[j])[segment]
+        best_cost = np.minimum.reduceat(candidates, offsets)
+        # First (i.e. smallest) i with the minimal cost in each segment.
+        best = np.minimum.reduceat(
+            np.where(candidates == best_cost[segment], i, num_values),
+            offsets,
+        )
+        new_cost[j] = best_cost
+        start[j] = best
+
+        left = j_lo < j
+        right = j < j_hi
+        j_lo, j_hi, i_lo, i_hi = (
+            np.concatenate([j_lo[left], j[right] + 1]),
+            np.concatenate([j[left] - 1, j_hi[right]]),
+            np.concatenate([i_lo[left], best[right]]),
+            np.concatenate([best[left], i_hi[right]]),
+        )
+    return new_cost, start
+
+
+def bucket_boundaries(lengths, num_buckets, *, to_multiple_of=None):
+    """ Padded lengths for bucketing, that minimize the number of padded
+    elements.
+
+    Each example is padded to the smallest boundary that is not smaller than
+    its length (see `np.searchsorted`). The boundaries are the optimal
+    partition of the sorted lengths into `num_buckets` buckets
+    (dynamic programming over the V unique lengths with divide and conquer,
+    i.e. O(num_buckets * V log V)).
+
+    Args:
+        lengths: Lengths of the examples (e.g. of the whole dataset).
+        num_buckets: Maximum number of buckets.
+        to_multiple_of: Restrict the boundaries to multiples of this value.
+            This also reduces the number of unique lengths.
+
+    Returns:
+        Sorted array with the upper boundaries of the buckets. The last
+        boundary is the padded maximum length.
+
+    >>> lengths = [1, 2, 2, 3, 10, 11, 12, 100]
+    >>> boundaries = bucket_boundaries(lengths, 3)
+    >>> boundaries
+    array([  3,  12, 100])
+    >>> boundaries[np.searchsorted(boundaries, lengths)]
+    array([  3,   3,   3,   3,  12,  12,  12, 100])
+    >>> bucket_boundaries(lengths, 3, to_multiple_of=4)
+    array([  4,  12, 100])
+    >>> bucket_boundaries(lengths, 1)
+    array([100])
+    """
+    lengths = np.asarray(lengths).ravel()
+    assert lengths.size > 0, lengths
+    assert num_buckets >= 1, num_buckets
+    if to_multiple_of is not None:
+        lengths = -(-lengths // to_multiple_of) * to_multiple_of
+    values, counts = np.unique(lengths, return_counts=True)
+
+    # Prefix sums: The cost to pad the unique lengths values[i:j] to
+    # values[j - 1] is `(n[j] - n[i]) * values[j - 1] - (s[j] - s[i])`.
+    n = np.concatenate([[0], np.cumsum(counts)])
+    s = np.concatenate([[0], np.cumsum(counts * values)])
+
+    num_values = len(values)
+    num_buckets = min(num_buckets, num_values)
+    # cost[j]: Minimal cost to bucket values[:j] with the current number of
+    # buckets. start[k, j]: Start of the last bucket in this solution.
+    cost = np.full(num_values + 1, np.inf)
+    cost[1:] = n[1:] * values - s[1:]
+    start = np.zeros((num_buckets, num_values + 1), dtype=np.int64)
+    for k in range(1, num_buckets):
+        cost, start[k] = _bucket_layer(cost, n, s, values, k)
+
+    boundaries = []
+    j = num_values
+    for k in reversed(range(num_buckets)):
+        boundaries.append(values[j - 1])
+        j = start[k, j]
+    return np.array(boundaries[::-1])
+
+
 # http://stackoverflow.com/a/3153267
 def roll_zeropad(a, shift, axis=None):
     """
@@ -1,6 +1,7 @@
-import re
+import functools
+import string
+
 import numpy as np
-from numpy.core.einsumfunc import _parse_einsum_input
 
 from paderbox.array.segment import segment_axis
 
@@ -33,7 +34,7 @@ def merge_complex_features(X):
 
 
 def tbf_to_tbchw(x, left_context, right_context, step_width,
-                 pad_mode='symmetric', pad_kwargs=None):
+                 pad_mode='symmetric', pad_kwargs=None, copy=True):
     """ Transfroms data from TxBxF format to TxBxCxHxW format
 
     This is only relevant for training a neural network in frames mode.
@@ -53,17 +54,68 @@ def tbf_to_tbchw(x, left_context, right_context, step_width,
     :param step_width: Step width for window
     :param pad_mode: Mode for padding. See :numpy.pad for details
     :param pad_kwargs: Kwargs for pad call
+    :param copy: Whether to return a contiguous copy instead of a read only
+        strided view on a padded copy of x.
     :return: Transformed data
     """
     if pad_kwargs is None:
         pad_kwargs = dict()
-    x = np.pad(x,
-               ((left_context, right_context), (0, 0), (0, 0)),
-               mode=pad_mode, **pad_kwargs)
+    x = np.asarray(x)
+    padded = np.empty(
+        (x.shape[0] + left_context + right_context, *x.shape[1:]),
+        dtype=x.dtype,
+    )
+    _pad_time(x, left_context, right_context, pad_mode, pad_kwargs, out=padded)
     window_size = left_context + right_context + 1
-    return segment_axis(
-        x, window_size, step_width, axis=0, end='cut'
+    x = segment_axis(
+        padded, window_size, step_width, axis=0, end='cut'
     ).transpose(0, 2, 3, 1)[:, :, None, :, :]
+    if copy:
+        return np.ascontiguousarray(x)
+    # The frames overlap, i.e. a write would change multiple frames.
+    x.flags.writeable = False
+    return x
+
+
+def _pad_time(x, left_context, right_context, pad_mode, pad_kwargs, out):
+    """
+    Writes `np.pad(x, ((left_context, right_context), (0, 0), ...))` to out.
+
+    The padding depends for most modes only on the first and last frames,
+    hence only these frames are padded with `np.pad`. The remaining frames
+    are copied once.
+
+    >>> x = np.arange(6).reshape(6, 1)
+    >>> out = np.empty((9, 1), dtype=x.dtype)
+    >>> _pad_time(x, 2, 1, 'symmetric', {}, out)[:, 0]
+    array([1, 0, 0, 1, 2, 3, 4, 5, 5])
+    >>> _pad_time(x, 2, 1, 'reflect', {}, out)[:, 0]
+    array([2, 1, 0, 1, 2, 3, 4, 5, 4])
+    """
+    pad_width = [(0, 0)] * x.ndim
+    size = max(left_context, right_context) + 1
+    if (
+            pad_mode not in ['constant', 'edge', 'symmetric', 'reflect']
+            or x.shape[0] <= size
+    ):
+        # The padding may depend on all frames.
+        pad_width[0] = (left_context, right_context)
+        out[...] = np.pad(x, pad_width, mode=pad_mode, **pad_kwargs)
+        return out
+
+    frames = x.shape[0]
+    out[left_context:left_context + frames] = x
+    if left_context > 0:
+        pad_width[0] = (left_context, 0)
+        out[:left_context] = np.pad(
+            x[:size], pad_width, mode=pad_mode, **pad_kwargs
+        )[:left_context]
+    if right_context > 0:
+        pad_width[0] = (0, right_context)
+        out[left_context + frames:] = np.pad(
+            x[-size:], pad_width, mode=pad_mode, **pad_kwargs
+        )[size:]
+    return out
 
 
 def _normalize(op):
@@ -76,142 +128,196 @@ def _normalize(op):
     return op
 
 
-def _shrinking_reshape(array, source, target):
-    source, target = source.split(), target.replace(' * ', '*').split()
+def _split_groups(side):
+    """
+    >>> _split_groups(_normalize('t*b f 1 ...'))
+    [['t', 'b'], ['f'], ['1'], ['...']]
+    """
+    return [group.split('*') for group in side.replace(' * ', '*').split()]
 
-    if '...' in source:
-        assert '...' in target, (source, target)
-        independent_dims = array.ndim - len(source) + 1
-        import string
-        ascii_letters = [
-            s
-            for s in string.ascii_letters
-            if s not in source and s not in target
-        ]
-        index = source.index('...')
-        source[index:index + 1] = ascii_letters[:independent_dims]
-        index = target.index('...')
-        target[index:index + 1] = ascii_letters[:independent_dims]
-
-    input_shape = {key: array.shape[index] for index, key in enumerate(source)}
-
-    output_shape = []
-    for t in target:
-        product = 1
-        if not t == '1':
-            t = t.split('*')
-            for t_ in t:
-                product *= input_shape[t_]
-        output_shape.append(product)
-
-    return array.reshape(output_shape)
-
-
-def _expanding_reshape(array, source, target, **shape_hints):
-
-    try:  # Check number of inputs for unflatten operations
-        assert len(re.sub(r'.\*', '', source.replace(' ', ''))) == array.ndim, \
-            (array.shape, source, target)
-    except AssertionError:  # Check number of inputs for ellipses operations
-        assert len(re.sub(r'(\.\.\.)|(.\*)', '', source.replace(' ', ''))) <= \
-               array.ndim,(array.shape, source, target)
-        
-
-    def _get_source_grouping(source):
-        """
-        Gets axis as alphanumeric.
-        """
-
-        source = ' '.join(source)
-        source = source.replace(' * ', '*')
-        groups = source.split()
-        groups = [group.split('*') for group in groups]
-        return groups
-
-    if '*' not in source:
-        return array
 
-    source, target = source.split(), target.replace(' * ', '*').split()
+class _MorphPlan:
+    """
+    A parsed `morph` operation. See `morph.compile`.
+
+    The parsing of the operation is done once. The axis bookkeeping depends
+    on the number of dimensions of the input (because of the ellipsis) and is
+    cached for each number of dimensions.
+    """
 
-    if '...' in source:
-        assert '...' in target, (source, target)
-        independent_dims = array.ndim - len(source) + 1
-        import string
-        ascii_letters = [
-            s
-            for s in string.ascii_letters
-            if s not in source and s not in target
+    def __init__(self, operation, **shape_hints):
+        self.operation = operation
+        self.shape_hints = shape_hints
+        source, target = _normalize(operation).split('->')
+        self._source = _split_groups(source)
+        self._target = _split_groups(target)
+        self._steps = {}
+
+    def __repr__(self):
+        hints = ''.join([f', {k}={v}' for k, v in self.shape_hints.items()])
+        return f'morph.compile({self.operation!r}{hints})'
+
+    def _expand_ellipsis(self, ndim):
+        source, target = self._source, self._target
+        if ['...'] not in source:
+            return source, target
+        assert ['...'] in target, (self.operation, source, target)
+        used = {letter for group in source + target for letter in group}
+        letters = [[s] for s in string.ascii_letters if s not in used]
+        independent_dims = ndim - len(source) + 1
+        index = source.index(['...'])
+        source = (
+            source[:index] + letters[:independent_dims] + source[index + 1:])
+        index = target.index(['...'])
+        target = (
+            target[:index] + letters[:independent_dims] + target[index + 1:])
+        return source, target
+
+    def _get_steps(self, ndim):
+        if ndim in self._steps:
+            return self._steps[ndim]
+
+        source, target = self._expand_ellipsis(ndim)
+        assert len(source) == ndim, (
+            f'The operation {self.operation!r} does not match an array with '
+            f'{ndim} dimensions.')
+
+        # Expanding reshape: None keeps the input dimension, a list splits it.
+        expand = None
+        if any(len(group) > 1 for group in source):
+            expand = []
+            for group in source:
+                if len(group) == 1:
+                    expand.append(None)
+                    continue
+                dims = []
+                for letter in group:
+                    if letter in self.shape_hints:
+                        dims.append(self.shape_hints[letter])
+                    elif -1 not in dims:
+                        dims.append(-1)
+                    else:
+                        raise ValueError('Not enough shape hints provided.')
+                expand.append(dims)
+
+        letters = [letter for group in source for letter in group]
+        squeeze = tuple([i for i, letter in enumerate(letters) if letter == '1'])
+        in_letters = [letter for letter in letters if letter != '1']
+        out_letters = [
+            letter for group in target for letter in group if letter != '1']
+
+        unknown = set(out_letters) - set(in_letters)
+        if unknown:
+            raise ValueError(
+                f'The output letters {sorted(unknown)} do not appear in the '
+                f'input of {self.operation!r}.')
+
+        reduce_axis = tuple([
+            i for i, letter in enumerate(in_letters)
+            if letter not in out_letters
+        ])
+        in_letters = [
+            letter for letter in in_letters if letter in out_letters]
+
+        if len(set(in_letters)) == len(in_letters):
+            permutation = tuple([in_letters.index(l) for l in out_letters])
+            einsum = None
+        else:
+            # Repeated letters (e.g. a diagonal) need einsum.
+            permutation = None
+            einsum = f'{"".join(in_letters)}->{"".join(out_letters)}'
+
+        # Final reshape: Each target group is the product of its axes.
+        groups = [
+            [] if group == ['1'] else [out_letters.index(l) for l in group]
+            for group in target
         ]
-        index = source.index('...')
-        source[index:index + 1] = ascii_letters[:independent_dims]
-        index = target.index('...')
-        target[index:index + 1] = ascii_letters[:independent_dims]
+        shrink = None
+        if [len(group) for group in groups] != [1] * len(groups):
+            shrink = groups
+
+        steps = self._steps[ndim] = (
+            expand, squeeze, reduce_axis, permutation, einsum, shrink)
+        return steps
+
+    def __call__(self, array, reduce=None):
+        expand, squeeze, reduce_axis, permutation, einsum, shrink = \
+            self._get_steps(np.ndim(array))
+
+        if expand is not None:
+            shape = []
+            for dim, dims in zip(np.shape(array), expand):
+                if dims is None:
+                    shape.append(dim)
+                else:
+                    shape.extend(dims)
+            array = array.reshape(shape)
 
-    target_shape = []
+        if squeeze:
+            array = np.squeeze(array, axis=squeeze)
 
-    for axis, group in enumerate(_get_source_grouping(source)):
-        if len(group) == 1:
-            target_shape.append(array.shape[axis:axis + 1])
+        if reduce_axis:
+            assert reduce is not None, (
+                'Missing reduce function', reduce, self.operation)
+            array = reduce(array, axis=reduce_axis)
+
+        if permutation is not None:
+            if permutation != tuple(range(len(permutation))):
+                array = array.transpose(permutation)
         else:
-            shape_wildcard_remaining = True
-            for member in group:
-                if member in shape_hints:
-                    target_shape.append([shape_hints[member]])
-                else:
-                    if shape_wildcard_remaining:
-                        shape_wildcard_remaining = False
-                        target_shape.append([-1])
-                    else:
-                        raise ValueError('Not enough shape hints provided.')
+            array = np.einsum(einsum, array)
+
+        if shrink is not None:
+            shape = np.shape(array)
+            array = array.reshape([
+                int(np.prod([shape[i] for i in group], dtype=np.int64))
+                for group in shrink
+            ])
+        return array
 
-    target_shape = np.concatenate(target_shape, 0)
-    array = array.reshape(target_shape)
-    return array
 
+@functools.lru_cache(maxsize=256)
+def _compile_cached(operation, shape_hints):
+    return _MorphPlan(operation, **dict(shape_hints))
 
-def morph(operation, array, reduce=None, **shape_hints):
-    """ This is an experimental version of a generalized reshape.
-    See test cases for examples.
+
+def _compile(operation, **shape_hints):
     """
-    operation = _normalize(operation)
-    source, target = operation.split('->')
+    Parses the operation once and returns a callable plan, that applies the
+    operation to an array:
 
-    # Expanding reshape
-    array = _expanding_reshape(array, source, target, **shape_hints)
+        plan = morph.compile('T,B,F->F,T*B')
+        plan(array)  # Same as morph('T,B,F->F,T*B', array)
 
-    # Initial squeeze
-    squeeze_operation = operation.split('->')[0].split()
-    for axis, op in reversed(list(enumerate(squeeze_operation))):
-        if op == '1':
-            array = np.squeeze(array, axis=axis)
+    Transpositions and reshapes are applied as `transpose` and `reshape`,
+    i.e. they return views where numpy can.
 
-    # Transpose
-    transposition_operation = operation.replace('1', ' ').replace('*', ' ')
-    try:
-        in_shape, out_shape, (array, ) = _parse_einsum_input([transposition_operation.replace(' ', ''), array])
+    >>> plan = morph.compile('t*b*f->f, t*b', f=2, t=3)
+    >>> plan
+    morph.compile('t*b*f->f, t*b', f=2, t=3)
+    >>> plan(np.arange(12))
+    array([[ 0,  2,  4,  6,  8, 10],
+           [ 1,  3,  5,  7,  9, 11]])
+    """
+    return _compile_cached(operation, tuple(sorted(shape_hints.items())))
 
-        if len(set(in_shape) - set(out_shape)) > 0:
-            assert reduce is not None, ('Missing reduce function', reduce, transposition_operation)
 
-            reduce_axis = tuple([i for i, s in enumerate(in_shape) if s not in out_shape])
-            array = reduce(array, axis=reduce_axis)
-            in_shape = ''.join([s for s in in_shape if s in out_shape])
+def morph(operation, array, reduce=None, **shape_hints):
+    """ This is an experimental version of a generalized reshape.
+    See test cases for examples.
 
-        array = np.einsum(f'{in_shape}->{out_shape}', array)
-    except ValueError as e:
-        msg = (
-            f'op: {transposition_operation} ({in_shape}->{out_shape}), '
-            f'shape: {np.shape(array)}'
-        )
+    The parsed operation is cached, see `morph.compile` to get a reusable
+    plan.
 
-        if len(e.args) == 1:
-            e.args = (e.args[0] + '\n\n' + msg,)
-        else:
-            print(msg)
-        raise
+    >>> x = np.zeros((2, 3, 4))
+    >>> morph('t b f -> f t b', x).shape
+    (4, 2, 3)
+    >>> np.shares_memory(morph('t b f -> f 1 t*b', x), x)
+    True
+    >>> morph('aa->a', np.arange(4).reshape(2, 2))
+    array([0, 3])
+    """
+    return _compile(operation, **shape_hints)(array, reduce=reduce)
 
-    # Final reshape
-    source = transposition_operation.split('->')[-1]
-    target = operation.split('->')[-1]
 
-    return _shrinking_reshape(array, source, target)
+morph.compile = _compile
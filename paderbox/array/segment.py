@@ -280,3 +280,124 @@ def segment_axis(x, length: int, shift: int, axis: int=-1,
         return xp.flip(x, axis=axis)
     else:
         return x
+
+
+def _padded_slice(x, start, stop, axis, pad_value):
+    """
+    Copy of `x[start:stop]` along `axis`, where the positions outside of
+    `[0, x.shape[axis])` are filled with `pad_value`.
+    """
+    shape = list(x.shape)
+    shape[axis] = stop - start
+    out = np.full(shape, pad_value, dtype=x.dtype)
+
+    src_start, src_stop = max(start, 0), min(stop, x.shape[axis])
+    if src_start < src_stop:
+        src = [slice(None)] * x.ndim
+        src[axis] = slice(src_start, src_stop)
+        dst = [slice(None)] * x.ndim
+        dst[axis] = slice(src_start - start, src_stop - start)
+        out[tuple(dst)] = x[tuple(src)]
+    return out
+
+
+def segment_axis_parts(x, length: int, shift: int, axis: int = -1,
+                       *, pad_width=(0, 0), end='pad', pad_value=0):
+    """
+    Frames of the padded signal
+        segment_axis(np.pad(x, pad_width), length, shift, axis, end=end)
+    without a copy of x.
+
+    The frames are returned in three parts. The head contains the frames
+    that overlap with the padding at the beginning, the body the frames that
+    lie completely in x and the tail the remaining frames. The body is a
+    strided view on x, the head and the tail are copies with at most
+    `ceil(length / shift)` frames (plus the frames in a long padding at the
+    end).
+
+    Args:
+        x: The array to segment
+        length: The length of each frame
+        shift: The number of array elements by which to step forward.
+            Has to be positive.
+        axis: The axis to operate on
+        pad_width: Number of values that are padded at the beginning and at
+            the end of x along axis, before the frames are formed.
+        end: 'pad', 'cut' or None, see `segment_axis`.
+        pad_value: The value that is used for the padding.
+
+    Returns:
+        head, body, tail: Their concatenation along axis is identical to the
+            frames of the padded signal.
+
+    >>> x = np.arange(11)
+    >>> head, body, tail = segment_axis_parts(x, 4, 3)
+    >>> body
+    array([[0, 1, 2, 3],
+           [3, 4, 5, 6],
+           [6, 7, 8, 9]])
+    >>> np.shares_memory(body, x)
+    True
+    >>> head.shape, tail
+    ((0, 4), array([[ 9, 10,  0,  0]]))
+    >>> x = np.arange(10)
+    >>> head, body, tail = segment_axis_parts(x, 4, 2, pad_width=(2, 2))
+    >>> np.concatenate([head, body, tail])
+    array([[0, 0, 0, 1],
+           [0, 1, 2, 3],
+           [2, 3, 4, 5],
+           [4, 5, 6, 7],
+           [6, 7, 8, 9],
+           [8, 9, 0, 0]])
+    >>> head.shape, body.shape, tail.shape
+    ((1, 4), (4, 4), (1, 4))
+    """
+    assert shift > 0, shift
+    axis = axis % x.ndim
+    front, back = pad_width
+    if front < 0 or back < 0:
+        raise ValueError(
+            f'The pad_width has to be non-negative, got {pad_width}.')
+    size = x.shape[axis]
+    padded_size = front + size + back
+
+    # Number of frames of the padded signal
+    if end == 'pad':
+        if padded_size < length:
+            frames = 1
+        else:
+            frames = -(-(padded_size - length) // shift) + 1
+    elif end == 'cut':
+        frames = max(0, (padded_size - length) // shift + 1)
+    elif end is None:
+        assert (padded_size + shift - length) % shift == 0, (
+            padded_size, shift, length)
+        frames = (padded_size + shift - length) // shift
+    else:
+        raise ValueError(end)
+
+    # The frame t covers [t * shift - front, t * shift - front + length) of x.
+    head_stop = min(frames, -(-front // shift))
+    body_stop = min(frames, max(head_stop, (size + front - length) // shift + 1))
+
+    def _frames(start, stop):
+        return segment_axis(
+            _padded_slice(
+                x,
+                start * shift - front,
+                max(start, stop - 1) * shift - front + length,
+                axis, pad_value,
+            ),
+            length, shift, axis=axis, end=None,
+        )[(slice(None),) * axis + (slice(0, stop - start),)]
+
+    head = _frames(0, head_stop)
+    body_start = head_stop * shift - front
+    body = segment_axis(
+        x[(slice(None),) * axis + (slice(
+            body_start, body_start + (body_stop - head_stop - 1) * shift + length
+        ),)],
+        length, shift, axis=axis, end=None,
+    ) if body_stop > head_stop else _frames(head_stop, head_stop)
+    tail = _frames(body_stop, frames)
+    return head, body, tail
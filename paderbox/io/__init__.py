@@ -37,8 +37,14 @@ from paderbox.io.yaml_module import (
     dumps_yaml_unsafe,
 )
 from paderbox.io.csv_module import load_csv, loads_csv
-from paderbox.io.audioread import load_audio, recursive_load_audio
+from paderbox.io.audioread import (
+    load_audio,
+    load_audio_segments,
+    recursive_load_audio,
+)
 from paderbox.io.audiowrite import dump_audio, dumps_audio
+from paderbox.io.prefetch import AudioPrefetcher
+from paderbox.io.archive import AudioArchive
 from paderbox.io.file_handling import (
     mkdir_p,
     symlink,
@@ -49,7 +55,10 @@ from .wrapper_dump import dump
 
 __all__ = [
     "load_audio",
+    "load_audio_segments",
     "recursive_load_audio",
+    "AudioPrefetcher",
+    "AudioArchive",
     "dump_audio",
     "dumps_audio",
     "load_json",
@@ -0,0 +1,237 @@
+"""
+Random access to audio files in uncompressed tar and zip archives (e.g.
+shards of a corpus), without extracting them.
+
+The offsets of the members are indexed once per archive, afterwards a member
+is read like a local file: The returned file object seeks in the archive and
+is bounded to the member, hence `soundfile` reads only the requested samples.
+
+`load_audio` accepts members as `archive://<archive>#<member>`, e.g.
+`load_audio('archive:///data/shard-000.tar#speaker/utt.wav')`.
+"""
+import functools
+import io
+import os
+import struct
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import NamedTuple
+
+from paderbox.io.path_utils import normalize_path
+
+__all__ = [
+    'ArchiveMember',
+    'AudioArchive',
+    'get_audio_archive',
+    'is_archive_url',
+    'open_archive_member',
+]
+
+ARCHIVE_PREFIX = 'archive://'
+
+_ZIP_LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+_ZIP_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+
+class ArchiveMember(NamedTuple):
+    name: str
+    offset: int  # Offset of the data in the archive
+    size: int
+
+
+def _tar_index(path):
+    try:
+        # 'r:' refuses compressed archives, they cannot be read with seek.
+        with tarfile.open(path, 'r:') as tar:
+            return [
+                ArchiveMember(info.name, info.offset_data, info.size)
+                for info in tar
+                if info.isreg()
+            ]
+    except tarfile.ReadError as e:
+        raise ValueError(
+            f'{path} is not an uncompressed tar file. Compressed archives '
+            f'(e.g. .tar.gz) have to be decompressed (e.g. with gunzip) to '
+            f'allow random access.'
+        ) from e
+
+
+def _zip_index(path):
+    members = []
+    with zipfile.ZipFile(path) as z, open(path, 'rb') as f:
+        for info in z.infolist():
+            if info.is_dir():
+                continue
+            if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 1:
+                raise ValueError(
+                    f'{info.filename} in {path} is compressed or encrypted. '
+                    f'Only stored members (e.g. `zip -0`) can be read with '
+                    f'seek.'
+                )
+            # The length of the extra field in the local header may differ
+            # from the central directory, hence read the local header.
+            f.seek(info.header_offset)
+            signature, *_, name_length, extra_length = \
+                _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+            if signature != _ZIP_LOCAL_HEADER_SIGNATURE:
+                raise ValueError(
+                    f'Invalid local header of {info.filename} in {path}.')
+            members.append(ArchiveMember(
+                info.filename,
+                info.header_offset + _ZIP_LOCAL_HEADER.size
+                + name_length + extra_length,
+                info.file_size,
+            ))
+    return members
+
+
+class _MemberFile(io.RawIOBase):
+    """Read only file object for the bytes `[offset, offset + size)`."""
+
+    def __init__(self, path, member: ArchiveMember):
+        super().__init__()
+        self.name = f'{ARCHIVE_PREFIX}{path}#{member.name}'
+        self._file = open(path, 'rb', buffering=0)
+        self._offset = member.offset
+        self._size = member.size
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f'Invalid whence: {whence}')
+        if position < 0:
+            raise ValueError(f'Negative seek position {position}')
+        self._position = position
+        return position
+
+    def readinto(self, buffer):
+        size = max(0, min(len(buffer), self._size - self._position))
+        if size == 0:
+            return 0
+        self._file.seek(self._offset + self._position)
+        size = self._file.readinto(memoryview(buffer)[:size])
+        self._position += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+class AudioArchive:
+    """
+    Index of the members of an uncompressed tar or a zip file with stored
+    (i.e. not compressed) members. The archive is scanned once in the
+    constructor, afterwards `open` and `load` seek directly to the member.
+
+    >>> import tempfile, tarfile
+    >>> import numpy as np
+    >>> from paderbox.io import dump_audio, load_audio
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     dump_audio(np.ones(100), Path(tmpdir) / 'a.wav')
+    ...     with tarfile.open(Path(tmpdir) / 'shard.tar', 'w') as tar:
+    ...         tar.add(Path(tmpdir) / 'a.wav', 'dir/a.wav')
+    ...     archive = AudioArchive(Path(tmpdir) / 'shard.tar')
+    ...     print(list(archive))
+    ...     print(archive.load('dir/a.wav', stop=10).shape)
+    ...     print(load_audio(f'archive://{tmpdir}/shard.tar#dir/a.wav').shape)
+    ['dir/a.wav']
+    (10,)
+    (100,)
+    """
+
+    def __init__(self, path):
+        self.path = normalize_path(path, as_str=True, allow_fd=False)
+        if tarfile.is_tarfile(self.path):
+            members = _tar_index(self.path)
+        elif zipfile.is_zipfile(self.path):
+            members = _zip_index(self.path)
+        else:
+            raise ValueError(
+                f'{self.path} is neither a tar nor a zip file.')
+        # Later members overwrite earlier ones with the same name, like
+        # `tar -x` does.
+        self.index = {member.name: member for member in members}
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.path!r}, members={len(self)})'
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def open(self, name) -> io.RawIOBase:
+        """
+        Opens the member `name` as a seekable binary file object, that can
+        be passed to `load_audio` or `soundfile`. The caller has to close it.
+        """
+        try:
+            member = self.index[name]
+        except KeyError:
+            raise FileNotFoundError(
+                f'{name!r} is not a member of {self.path}.') from None
+        return _MemberFile(self.path, member)
+
+    def load(self, name, **kwargs):
+        """Loads the member `name` with `load_audio(..., **kwargs)`."""
+        from paderbox.io.audioread import load_audio
+        with self.open(name) as f:
+            return load_audio(f, **kwargs)
+
+
+def is_archive_url(path) -> bool:
+    return isinstance(path, str) and path.startswith(ARCHIVE_PREFIX)
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_archive(path, mtime_ns, size):
+    return AudioArchive(path)
+
+
+def get_audio_archive(path) -> AudioArchive:
+    """
+    `AudioArchive` with a per process cache, hence the index of each shard
+    is built only once. A modified archive is indexed again.
+    """
+    path = normalize_path(path, as_str=True, allow_fd=False)
+    stat = os.stat(path)
+    return _cached_archive(path, stat.st_mtime_ns, stat.st_size)
+
+
+def open_archive_member(url) -> io.RawIOBase:
+    """
+    Opens `archive://<archive>#<member>`. The path of the archive ends at
+    the first `#`.
+
+    >>> open_archive_member('/data/shard.tar#a.wav')
+    Traceback (most recent call last):
+    ...
+    ValueError: Expected archive://<archive>#<member>, got '/data/shard.tar#a.wav'.
+    """
+    path, sep, name = url[len(ARCHIVE_PREFIX):].partition('#')
+    if not is_archive_url(url) or not sep or not name:
+        raise ValueError(
+            f'Expected {ARCHIVE_PREFIX}<archive>#<member>, got {url!r}.')
+    return get_audio_archive(Path(path)).open(name)
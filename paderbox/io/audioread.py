@@ -1,24 +1,144 @@
 """
 This module deals with all sorts of audio input and output.
 """
+import concurrent.futures
+import contextlib
 import inspect
 import os
+import sqlite3
+import threading
 import tempfile
 import wave
 import types
 from io import BytesIO
 from pathlib import Path
 import functools
+from typing import NamedTuple
 
 import numpy as np
 import soundfile
 
 import paderbox.utils.process_caller as pc
+from paderbox.io.archive import is_archive_url, open_archive_member
 from paderbox.io.path_utils import normalize_path
 
 UTILS_DIR = os.path.join(os.path.dirname(__file__), 'utils')
 
 
+def _subtype_to_dtype(subtype):
+    from paderbox.utils.mapping import Dispatcher
+    mapping = Dispatcher({
+        'PCM_16': np.int16,
+        'FLOAT': np.float32,
+        'DOUBLE': np.float64,
+    })
+    return mapping[subtype]
+
+
+def _seconds_to_samples(start, stop, frames, sample_rate):
+    """Converts the `start`, `stop` and `frames` arguments of `load_audio`."""
+    start = int(np.round(start * sample_rate))
+    if frames >= 0:
+        frames = int(np.round(frames * sample_rate))
+    if stop is not None:
+        stop = int(np.round(stop * sample_rate))
+    return start, stop, frames
+
+
+def _decode_int16_buffers(
+        buffers,
+        *,
+        channels,
+        start=0,
+        stop=None,
+        dtype=np.float64,
+        fill_value=None,
+        size_hint=0,
+):
+    """
+    Decodes the interleaved 16 bit PCM buffers of a streaming decoder
+    (e.g. `audioread`) into one preallocated array with the shape
+    (samples, channels) or (samples,) for mono.
+
+    The decoding stops at `stop` and the samples before `start` are dropped
+    on the fly, so a crop of a long compressed file does not keep the whole
+    file in memory. The buffers do not have to be aligned to the frames.
+
+    >>> data = np.arange(20, dtype='<i2').reshape(10, 2)
+    >>> buffers = [data.tobytes()[i:i + 6] for i in range(0, 40, 6)]
+    >>> _decode_int16_buffers(buffers, channels=2, start=3, stop=6, dtype=np.int16)
+    array([[ 6,  7],
+           [ 8,  9],
+           [10, 11]], dtype=int16)
+    >>> _decode_int16_buffers(buffers, channels=2, start=8, stop=12, dtype=np.int16, fill_value=-1)
+    array([[16, 17],
+           [18, 19],
+           [-1, -1],
+           [-1, -1]], dtype=int16)
+    >>> _decode_int16_buffers(buffers, channels=2, start=9)[:, 0] * 2 ** 15
+    array([18.])
+    """
+    if start < 0 or (stop is not None and stop < 0):
+        raise NotImplementedError(
+            'Negative start or stop values are not supported for streamed '
+            f'decoding (start={start}, stop={stop}).'
+        )
+    if dtype is None:
+        dtype = np.int16
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.floating):
+        def convert(frames):
+            return np.multiply(frames, 1 / 2 ** 15, dtype=dtype)
+    else:
+        shift = np.iinfo(dtype).bits - 16
+        assert shift >= 0, (dtype, 'Only int16, int32 and float dtypes')
+
+        def convert(frames):
+            return np.left_shift(frames.astype(dtype), shift)
+
+    if stop is None:
+        size = max(size_hint - start, 0)
+    else:
+        size = max(stop - start, 0)
+    out = np.empty((size, channels), dtype=dtype)
+
+    frame_bytes = 2 * channels
+    position = 0  # Number of decoded frames
+    written = 0
+    remainder = b''
+    for buffer in buffers:
+        if stop is not None and position >= stop:
+            break
+        if remainder:
+            buffer = remainder + buffer
+        num_frames = len(buffer) // frame_bytes
+        remainder = buffer[num_frames * frame_bytes:]
+        frames = np.frombuffer(
+            buffer, '<i2', count=num_frames * channels,
+        ).reshape(num_frames, channels)
+
+        begin = max(start - position, 0)
+        end = num_frames if stop is None else min(stop - position, num_frames)
+        position += num_frames
+        if begin >= end:
+            continue
+        frames = frames[begin:end]
+        if written + len(frames) > len(out):
+            # The size hint (e.g. the duration) was too small.
+            size = max(2 * len(out), written + len(frames))
+            out = np.resize(out, (size, channels))
+        out[written:written + len(frames)] = convert(frames)
+        written += len(frames)
+
+    if fill_value is not None and stop is not None:
+        out[written:] = fill_value
+    else:
+        out = out[:written]
+    if channels == 1:
+        out = out[:, 0]
+    return out
+
+
 def load_audio(
         path,
         *,
@@ -30,6 +150,7 @@ def load_audio(
         expected_sample_rate=None,
         unit='samples',
         return_sample_rate=False,
+        mmap=False,
 ):
     """
     WIP will deprecate audioread in the future
@@ -39,6 +160,12 @@ def load_audio(
      - With the argument "unit" the unit of frames, start and stop can be
        changed (stop currently unsupported).
      - With given expected_sample_rate an assert is included (recommended)
+     - With mmap=True, uncompressed WAV files are memory mapped and a lazy
+       `paderbox.io.wav.WavMemmap` is returned, that reads and converts only
+       the indexed samples (e.g. for random crops of long files).
+     - Members of uncompressed tar and zip archives can be read without
+       extraction with `archive://<archive>#<member>` or a file object from
+       `paderbox.io.archive.AudioArchive.open`.
 
     soundfile.read doc text and some examples:
 
@@ -136,6 +263,9 @@ def load_audio(
     >>> signal.shape
     (49600,)
 
+    libsndfile cannot read shorten compressed NIST SPHERE files (e.g. WSJ),
+    use `paderbox.io.sphere.load_sphere` for them:
+
     >>> path = get_file_path('123_1pcbe_shn.sph')
     >>> load_audio(path)  # doctest: +ELLIPSIS
     Traceback (most recent call last):
@@ -146,6 +276,21 @@ def load_audio(
     <BLANKLINE>
     """
 
+    if is_archive_url(path):
+        assert not mmap, ('mmap is not supported for archive members', path)
+        with open_archive_member(path) as f:
+            return load_audio(
+                f,
+                frames=frames,
+                start=start,
+                stop=stop,
+                dtype=dtype,
+                fill_value=fill_value,
+                expected_sample_rate=expected_sample_rate,
+                unit=unit,
+                return_sample_rate=return_sample_rate,
+            )
+
     # soundfile does not support pathlib.Path.
     # ToDo: Is this sill True?
     path = normalize_path(path, as_str=True)
@@ -156,55 +301,83 @@ def load_audio(
         if stop is not None:
             if stop < 0:
                 raise NotImplementedError(unit, stop)
-        with soundfile.SoundFile(path) as f:
-            # total_samples = len(f)
-            samplerate = f.samplerate
-        start = int(np.round(start * samplerate))
-        if frames > 0:
-            frames = int(np.round(frames * samplerate))
-        if stop is not None and stop > 0:
-            stop = int(np.round(stop * samplerate))
     else:
         raise ValueError(unit)
 
+    if mmap:
+        from paderbox.io.wav import WavMemmap
+        assert fill_value is None, (
+            'fill_value is not supported with mmap=True', fill_value)
+        signal = WavMemmap(path, dtype=dtype)
+        sample_rate = signal.sample_rate
+        if unit == 'seconds':
+            start, stop, frames = _seconds_to_samples(
+                start, stop, frames, sample_rate)
+        if frames >= 0:
+            if stop is not None:
+                raise TypeError("Only one of {frames, stop} may be used")
+            start, _, _ = slice(start, None).indices(signal.shape[-1])
+            stop = start + frames
+        signal = signal.crop(start, stop)
+        if expected_sample_rate is not None:
+            if expected_sample_rate != sample_rate:
+                raise ValueError(
+                    f'Requested sampling rate is {expected_sample_rate} but '
+                    f'the audiofile has {sample_rate}'
+                )
+        if return_sample_rate:
+            return signal, sample_rate
+        else:
+            return signal
+
     try:
         if isinstance(path, (str, Path)) and (Path(path).suffix == '.m4a'):
             import audioread
-            assert (start == 0 and stop is None), \
-                'audioread does not support partial loading of audio files'
             with audioread.audio_open(
                     path
             ) as f:
-                samplerate = f.samplerate
-                duration = f.duration
-                data = []
-                scale = 1. / float(1 << (15))
-                for buf in f:
-                    data.append(
-                        np.frombuffer(buf, "<i2").astype(np.float64) * scale)
-                signal = np.concatenate(data)
+                sample_rate = f.samplerate
+                if unit == 'seconds':
+                    start, stop, frames = _seconds_to_samples(
+                        start, stop, frames, sample_rate)
+                if frames >= 0:
+                    if stop is not None:
+                        raise TypeError(
+                            "Only one of {frames, stop} may be used")
+                    stop = start + frames
+                signal = _decode_int16_buffers(
+                    f,
+                    channels=f.channels,
+                    start=start,
+                    stop=stop,
+                    dtype=dtype,
+                    fill_value=fill_value,
+                    size_hint=int(np.ceil(f.duration * sample_rate)),
+                )
         else:
             with soundfile.SoundFile(
                     path,
                     'r',
             ) as f:
                 if dtype is None:
-                    from paderbox.utils.mapping import Dispatcher
-                    mapping = Dispatcher({
-                        'PCM_16': np.int16,
-                        'FLOAT': np.float32,
-                        'DOUBLE': np.float64,
-                    })
-                    dtype = mapping[f.subtype]
+                    dtype = _subtype_to_dtype(f.subtype)
+                if unit == 'seconds':
+                    # Convert with the open file, instead of opening it twice.
+                    start, stop, frames = _seconds_to_samples(
+                        start, stop, frames, f.samplerate)
 
                 frames = f._prepare_read(start=start, stop=stop, frames=frames)
                 data = f.read(frames=frames, dtype=dtype, fill_value=fill_value)
             signal, sample_rate = data, f.samplerate
     except RuntimeError as e:
         if isinstance(path, (Path, str)):
-            from paderbox.utils.process_caller import run_process
-            cp = run_process(['file', f'{path}'])
-            stdout = cp.stdout
+            from paderbox.io.sphere import is_nist_sphere_file
+            if is_nist_sphere_file(path):
+                # Same message as `file`, without a subprocess.
+                stdout = f'{path}: NIST SPHERE file\n'
+            else:
+                from paderbox.utils.process_caller import run_process
+                stdout = run_process(['file', f'{path}']).stdout
             if Path(path).suffix == '.wav':
                 # Improve exception msg for NIST SPHERE files.
                 raise RuntimeError(
@@ -237,6 +410,111 @@ def load_audio(
         return signal
 
 
+def load_audio_segments(
+        path,
+        segments,
+        *,
+        dtype=np.float64,
+        expected_sample_rate=None,
+        unit='samples',
+        max_gap=0,
+        return_sample_rate=False,
+):
+    """
+    Loads multiple segments from one audio file, e.g. all segments of a
+    recording from an RTTM or a Kaldi segments file.
+
+    In contrast to calling `load_audio` for each segment, the file is opened
+    and the header is parsed only once. The segments are read in the order of
+    their start, so the file is read sequentially, and segments that overlap
+    or are at most `max_gap` samples apart are read with one call.
+
+    Args:
+        path: The file to read from.
+        segments: Iterable of `(start, stop)` tuples. `start` and `stop`
+            have the same meaning as in `load_audio`, i.e. negative values
+            count from the end and `stop=None` reads until the end.
+        dtype: See `load_audio`.
+        expected_sample_rate: See `load_audio`.
+        unit: 'samples' or 'seconds'. The unit of `start` and `stop`.
+        max_gap: Read two neighbouring segments with one read, when the gap
+            between them is at most `max_gap` samples. Larger values reduce
+            the number of reads at the cost of reading unused samples.
+        return_sample_rate: See `load_audio`.
+
+    Returns:
+        List with the signals of the segments in the order of `segments`.
+
+    >>> from paderbox.testing.testfile_fetcher import get_file_path
+    >>> path = get_file_path('speech.wav')
+    >>> signals = load_audio_segments(path, [(16000, 32000), (0, 100), (-10, None)])
+    >>> [s.shape for s in signals]
+    [(16000,), (100,), (10,)]
+    >>> np.array_equal(signals[0], load_audio(path, start=16000, stop=32000))
+    True
+    >>> signals, sample_rate = load_audio_segments(
+    ...     path, [(0, 0.5), (1, 2)], unit='seconds', return_sample_rate=True)
+    >>> [s.shape for s in signals], sample_rate
+    ([(8000,), (16000,)], 16000)
+    """
+    path = normalize_path(path, as_str=True)
+    segments = list(segments)
+
+    with soundfile.SoundFile(path, 'r') as f:
+        sample_rate = f.samplerate
+        if expected_sample_rate is not None:
+            if expected_sample_rate != sample_rate:
+                raise ValueError(
+                    f'Requested sampling rate is {expected_sample_rate} but '
+                    f'the audiofile has {sample_rate}'
+                )
+        if dtype is None:
+            dtype = _subtype_to_dtype(f.subtype)
+
+        # Resolve negative and None values like `f._prepare_read`.
+        ranges = []
+        for start, stop in segments:
+            if unit == 'samples':
+                pass
+            elif unit == 'seconds':
+                start = int(np.round(start * sample_rate))
+                if stop is not None:
+                    stop = int(np.round(stop * sample_rate))
+            else:
+                raise ValueError(unit)
+            start, stop, _ = slice(start, stop).indices(f.frames)
+            ranges.append((start, max(start, stop)))
+
+        # Group the sorted ranges, where the next range starts at most
+        # `max_gap` samples after the end of the group.
+        order = sorted(range(len(ranges)), key=ranges.__getitem__)
+        groups = []
+        for i in order:
+            start, stop = ranges[i]
+            if groups and start <= groups[-1][1] + max_gap:
+                groups[-1][1] = max(groups[-1][1], stop)
+                groups[-1][2].append(i)
+            else:
+                groups.append([start, stop, [i]])
+
+        signals = [None] * len(ranges)
+        for group_start, group_stop, indices in groups:
+            f.seek(group_start)
+            data = f.read(frames=group_stop - group_start, dtype=dtype)
+            for i in indices:
+                start, stop = ranges[i]
+                signal = data[start - group_start:stop - group_start]
+                if len(indices) > 1:
+                    # Do not share memory between the segments.
+                    signal = signal.copy()
+                signals[i] = signal.T
+
+    if return_sample_rate:
+        return signals, sample_rate
+    else:
+        return signals
+
+
 def recursive_load_audio(
         path,
         *,
@@ -248,6 +526,7 @@ def recursive_load_audio(
         expected_sample_rate=None,
         unit='samples',
         return_sample_rate=False,
+        max_workers=None,
 ):
     """
     Recursively loads all leafs (i.e. tuple/list entry or dict value) in the
@@ -257,6 +536,12 @@ def recursive_load_audio(
 
     For an explanation of the arguments, see `load_audio`.
 
+    With `max_workers`, all leafs are loaded concurrently in a thread pool,
+    that is shared between all calls with the same `max_workers`. This
+    hides the latency of network file systems, e.g. when the channels of a
+    multichannel recording are stored in separate files. The structure and
+    the order of the output are the same as without `max_workers`.
+
     >>> from paderbox.testing.testfile_fetcher import get_file_path
     >>> from paderbox.notebook import pprint
     >>> path1 = get_file_path('speech.wav')
@@ -272,13 +557,49 @@ def recursive_load_audio(
      'b': array(shape=(49600,), dtype=float64)}
     >>> pprint(recursive_load_audio([path1, (path2, path2)]))
     [array(shape=(49600,), dtype=float64), array(shape=(2, 38520), dtype=float64)]
+    >>> pprint(recursive_load_audio([path1, (path2, path2)], max_workers=4))
+    [array(shape=(49600,), dtype=float64), array(shape=(2, 38520), dtype=float64)]
 
     """
     kwargs = locals().copy()
     path = kwargs.pop('path')
+    max_workers = kwargs.pop('max_workers')
+
+    if max_workers is None:
+        return _recursive_load(path, functools.partial(load_audio, **kwargs))
+
+    # Submit all leafs before waiting for the first one, so that nested
+    # structures are loaded with one level of parallelism.
+    executor = _get_executor(max_workers, os.getpid())
+    futures = _map_leafs(
+        path, functools.partial(executor.submit, load_audio, **kwargs))
+    try:
+        return _recursive_load(futures, concurrent.futures.Future.result)
+    except BaseException:
+        _map_leafs(futures, concurrent.futures.Future.cancel)
+        raise
+
+
+@functools.lru_cache(maxsize=None)
+def _get_executor(max_workers, pid):
+    # The pid is part of the cache key, because the threads of an executor
+    # do not survive a fork (e.g. in the workers of a data loader).
+    return concurrent.futures.ThreadPoolExecutor(
+        max_workers, thread_name_prefix='recursive_load_audio')
 
+
+def _map_leafs(path, func):
     if isinstance(path, (tuple, list, types.GeneratorType)):
-        data = [recursive_load_audio(a, **kwargs) for a in path]
+        return [_map_leafs(a, func) for a in path]
+    elif isinstance(path, dict):
+        return {k: _map_leafs(v, func) for k, v in path.items()}
+    else:
+        return func(path)
+
+
+def _recursive_load(path, load):
+    if isinstance(path, (tuple, list, types.GeneratorType)):
+        data = [_recursive_load(a, load) for a in path]
 
         np_data = np.array(data)
         if np_data.dtype != np.object:
@@ -286,9 +607,9 @@ def recursive_load_audio(
         else:
             return data
     elif isinstance(path, dict):
-        return {k: recursive_load_audio(v, **kwargs) for k, v in path.items()}
+        return {k: _recursive_load(v, load) for k, v in path.items()}
     else:
-        return load_audio(path, **kwargs)
+        return load(path)
 
 
 def audioread(path, offset=0.0, duration=None, expected_sample_rate=None):
@@ -381,6 +702,196 @@ def audioread(path, offset=0.0, duration=None, expected_sample_rate=None):
         raise OSError(f'{stdout}') from e
 
 
+class AudioMetadata(NamedTuple):
+    sample_rate: int
+    frames: int
+    channels: int
+    subtype: str
+
+
+def _read_audio_metadata(path) -> AudioMetadata:
+    with soundfile.SoundFile(str(path)) as f:
+        return AudioMetadata(f.samplerate, f.frames, f.channels, f.subtype)
+
+
+class AudioMetadataIndex:
+    """
+    Persistent SQLite index of the audio metadata (sample rate, frames,
+    channels and subtype), so that `audio_length`, `audio_channels` and
+    `audio_shape` do not have to open each file, e.g. when the examples of
+    a large corpus are bucketed by their length at every start.
+
+    The entries are keyed by the absolute path and invalidated, when the
+    modification time or the size of the file changed. Use
+    `use_audio_metadata_index` to let the `audio_*` functions consult the
+    index.
+
+    >>> import tempfile
+    >>> from paderbox.io import dump_audio
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     tmpdir = Path(tmpdir)
+    ...     dump_audio(np.ones(100), tmpdir / 'a.wav')
+    ...     dump_audio(np.ones((2, 50)), tmpdir / 'b.wav')
+    ...     index = AudioMetadataIndex(tmpdir / 'audio.sqlite')
+    ...     index.build([tmpdir / 'a.wav', tmpdir / 'b.wav'])
+    ...     print(len(index), index[tmpdir / 'b.wav'])
+    ...     with use_audio_metadata_index(index):
+    ...         print(audio_shape(tmpdir / 'b.wav'))
+    ...         dump_audio(np.ones((2, 70)), tmpdir / 'b.wav')
+    ...         print(audio_shape(tmpdir / 'b.wav'))
+    ...     index.close()
+    2 AudioMetadata(sample_rate=16000, frames=50, channels=2, subtype='PCM_16')
+    (2, 50)
+    (2, 70)
+    """
+
+    def __init__(self, path, *, validate=True):
+        """
+        Args:
+            path: The SQLite file. It is created, when it does not exist.
+            validate: If True, `stat` each file on access to detect
+                changes. Set it to False for read only corpora on slow
+                network storage, where a `stat` is expensive.
+        """
+        self.path = normalize_path(path, as_str=True, allow_fd=False)
+        self.validate = validate
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # Do not share the connection with forked processes (e.g. the
+        # workers of a data loader).
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(
+                self.path, timeout=60, check_same_thread=False)
+            self._pid = os.getpid()
+            with self._connection:
+                self._connection.execute(
+                    'CREATE TABLE IF NOT EXISTS audio_metadata ('
+                    'path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, '
+                    'sample_rate INTEGER, frames INTEGER, channels INTEGER, '
+                    'subtype TEXT)'
+                )
+        return self._connection
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute(
+                'SELECT COUNT(*) FROM audio_metadata').fetchone()[0]
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.path!r})'
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(os.fspath(path))
+
+    def _insert(self, rows):
+        with self._lock, self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO audio_metadata '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+
+    @classmethod
+    def _read(cls, path):
+        stat = os.stat(path)
+        return (
+            cls._key(path), stat.st_mtime_ns, stat.st_size,
+            *_read_audio_metadata(path),
+        )
+
+    def __getitem__(self, path) -> AudioMetadata:
+        """Returns the metadata and reads the file on a miss."""
+        key = self._key(path)
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT mtime_ns, size, sample_rate, frames, channels, '
+                'subtype FROM audio_metadata WHERE path = ?',
+                (key,),
+            ).fetchone()
+        if row is not None:
+            if not self.validate:
+                return AudioMetadata(*row[2:])
+            stat = os.stat(key)
+            if (stat.st_mtime_ns, stat.st_size) == row[:2]:
+                return AudioMetadata(*row[2:])
+
+        row = self._read(key)
+        self._insert([row])
+        return AudioMetadata(*row[3:])
+
+    def build(self, paths, *, max_workers=None, update=False):
+        """
+        Adds the metadata of many files to the index. The files are read in
+        parallel threads, because opening a file is dominated by IO
+        latency (in particular on network storage).
+
+        Args:
+            paths: Iterable of audio files.
+            max_workers: Number of threads.
+                See `concurrent.futures.ThreadPoolExecutor`.
+            update: If False, skip the paths that are already in the index
+                without checking whether they changed.
+        """
+        paths = [self._key(p) for p in paths]
+        if not update:
+            with self._lock:
+                known = {
+                    row[0] for row in self.connection.execute(
+                        'SELECT path FROM audio_metadata')
+                }
+            paths = [p for p in paths if p not in known]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            rows = list(executor.map(self._read, paths))
+        self._insert(rows)
+
+
+_audio_metadata_index = None
+
+
+@contextlib.contextmanager
+def _restore_audio_metadata_index(previous):
+    global _audio_metadata_index
+    try:
+        yield _audio_metadata_index
+    finally:
+        _audio_metadata_index = previous
+
+
+def use_audio_metadata_index(index):
+    """
+    Let `audio_length`, `audio_channels` and `audio_shape` consult the
+    index. Can be used as function or as context manager, that restores
+    the previous index.
+
+    Args:
+        index: `AudioMetadataIndex`, path to an SQLite file or None to
+            disable the index.
+    """
+    global _audio_metadata_index
+    previous = _audio_metadata_index
+    if index is not None and not isinstance(index, AudioMetadataIndex):
+        index = AudioMetadataIndex(index)
+    _audio_metadata_index = index
+    return _restore_audio_metadata_index(previous)
+
+
+def _audio_metadata(path) -> AudioMetadata:
+    if _audio_metadata_index is not None and isinstance(path, (str, Path)):
+        return _audio_metadata_index[path]
+    return _read_audio_metadata(path)
+
+
 def audio_length(path, unit='samples'):
     """
 
@@ -406,11 +917,10 @@ def audio_length(path, unit='samples'):
     # return int(params.samplerate * params.duration)
 
     if unit == 'samples':
-        with soundfile.SoundFile(str(path)) as f:
-            return len(f)
+        return _audio_metadata(path).frames
     elif unit == 'seconds':
-        with soundfile.SoundFile(str(path)) as f:
-            return len(f) / f.samplerate
+        metadata = _audio_metadata(path)
+        return metadata.frames / metadata.sample_rate
     else:
         return ValueError(unit)
 
@@ -426,8 +936,7 @@ def audio_channels(path):
     >>> audio_channels(path)  # correct for multichannel
     6
     """
-    with soundfile.SoundFile(str(path)) as f:
-        return f.channels
+    return _audio_metadata(path).channels
 
 
 def audio_shape(path):
@@ -443,30 +952,35 @@ def audio_shape(path):
     >>> audioread(path)[0].shape
     (6, 38520)
     """
-    with soundfile.SoundFile(str(path)) as f:
-        channels = f.channels
-        if channels == 1:
-            return len(f)
-        else:
-            return channels, len(f)
+    metadata = _audio_metadata(path)
+    if metadata.channels == 1:
+        return metadata.frames
+    else:
+        return metadata.channels, metadata.frames
 
 
 def is_nist_sphere_file(path):
     """Check if given path is a nist/sphere file"""
-    if not os.path.exists(path):
-        return False
-    cmd = f'file {path}'
-    return 'NIST SPHERE file' in pc.run_process(cmd).stdout
+    from paderbox.io.sphere import is_nist_sphere_file
+    return is_nist_sphere_file(path)
 
 
 def read_nist_wsj(path, audioread_function=audioread, **kwargs):
     """
-    Converts a nist/sphere file of wsj and reads it with audioread.
+    Reads a nist/sphere file of wsj.
+
+    With the default `audioread_function`, the file is read in process with
+    `paderbox.io.sphere.load_sphere` and the output is the same as for
+    `audioread`. Other functions get the path of a temporary WAV file
+    converted with `sph2pipe`.
 
     :param path: file path to audio file.
     :param audioread_function: Function to use to read the resulting audio file
     :return:
     """
+    if audioread_function is audioread:
+        return _audioread_sphere(path, **kwargs)
+
     tmp_file = tempfile.NamedTemporaryFile(delete=False)
     cmd = "{}/sph2pipe -f wav {path} {dest_file}".format(
         UTILS_DIR, path=path, dest_file=tmp_file.name
@@ -477,6 +991,25 @@ def read_nist_wsj(path, audioread_function=audioread, **kwargs):
     return signal
 
 
+def _audioread_sphere(path, offset=0.0, duration=None, expected_sample_rate=None):
+    """Same output as `audioread` for a NIST SPHERE file."""
+    from paderbox.io.sphere import load_sphere
+    if duration is None:
+        frames = -1
+    else:
+        frames = duration
+    signal, sample_rate = load_sphere(
+        path, start=offset, frames=frames, unit='seconds', dtype=np.float32,
+        expected_sample_rate=expected_sample_rate, return_sample_rate=True,
+    )
+    if duration is not None:
+        # audioread fills missing samples with zeros.
+        samples = int(np.round(duration * sample_rate))
+        pad_width = [(0, 0)] * (signal.ndim - 1)
+        signal = np.pad(signal, [*pad_width, (0, samples - signal.shape[-1])])
+    return signal, sample_rate
+
+
 def read_raw(path, dtype=np.dtype('<i2')):
     """
     Reads raw data (tidigits data)
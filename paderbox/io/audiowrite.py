@@ -1,16 +1,28 @@
+import contextlib
 import io
 import numpy as np
-import threading
 from pathlib import Path
 
 import soundfile
 
 from paderbox.utils.mapping import Dispatcher
 from paderbox.io.path_utils import normalize_path
+from paderbox.io.atomic import open_atomic
 
 int16_max = np.iinfo(np.int16).max
 int16_min = np.iinfo(np.int16).min
 
+_dtype_to_subtype = Dispatcher({
+    np.int16: 'PCM_16',
+    np.dtype('int16'): 'PCM_16',
+    np.int32: 'PCM_32',
+    np.dtype('int32'): 'PCM_32',
+    np.float32: 'FLOAT',
+    np.dtype('float32'): 'FLOAT',
+    np.float64: 'DOUBLE',
+    np.dtype('float64'): 'DOUBLE',
+})
+
 
 def dump_audio(
         obj,
@@ -21,6 +33,7 @@ def dump_audio(
         start=None,
         normalize=True,
         format=None,
+        background=False,
 ):
     """
     If normalize is False and the dytpe is float, the values of obj should be in
@@ -40,6 +53,10 @@ def dump_audio(
             -1 to 1.
         format:
             Special option. See soundfile.SoundFile.__init__ for details.
+        background:
+            If True, write the file with the shared
+            `paderbox.io.background.BackgroundWriter` and return a future.
+            Do not modify obj, until the future is done.
 
     >>> from paderbox.utils.process_caller import run_process
     >>> from paderbox.io import load_audio
@@ -146,6 +163,13 @@ def dump_audio(
     <BLANKLINE>
 
     """
+    if background:
+        from paderbox.io.background import get_background_writer
+        return get_background_writer().submit(
+            dump_audio, obj, path, sample_rate=sample_rate, dtype=dtype,
+            start=start, normalize=normalize, format=format,
+        )
+
     path = normalize_path(path, as_str=True)
     obj = np.asarray(obj)
 
@@ -185,16 +209,7 @@ def dump_audio(
         )
     sf_args['format'] = format
 
-    dtype_map = Dispatcher({
-        np.int16: 'PCM_16',
-        np.dtype('int16'): 'PCM_16',
-        np.int32: 'PCM_32',
-        np.dtype('int32'): 'PCM_32',
-        np.float32: 'FLOAT',
-        np.dtype('float32'): 'FLOAT',
-        np.float64: 'DOUBLE',
-        np.dtype('float64'): 'DOUBLE',
-    })
+    dtype_map = _dtype_to_subtype
 
     if dtype in [np.int16]:
         pass
@@ -233,12 +248,180 @@ def dumps_audio(
     return path.getvalue()
 
 
+class AudioWriter:
+    """
+    Writes an audio file block by block (e.g. the output of a streaming
+    enhancement), while the file stays open. In contrast to
+    `dump_audio(..., start=...)` the file is not opened, seeked and closed
+    for each block.
+
+    The file is written to a temporary file next to `path`, that replaces
+    `path` on `close` (see `open_atomic`), hence a reader never sees a
+    partially written file. When the context is left with an exception,
+    `path` is not touched.
+
+    Float blocks are scaled, clipped and converted to integers in NumPy
+    (libsndfile would wrap around instead of clipping). The number of
+    clipped samples and the peak value are tracked.
+
+    >>> import tempfile
+    >>> from paderbox.io import load_audio
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     file = Path(tmpdir) / 'audio.wav'
+    ...     with AudioWriter(file, sample_rate=8000, channels=2) as writer:
+    ...         writer.write(np.array([[0.5, 0.25], [-0.5, -0.25]]))
+    ...         writer.write(np.array([[1.5], [-2]]))
+    ...         print(file.exists())
+    ...     print(writer)
+    ...     print(load_audio(file, dtype=np.int16))
+    False
+    AudioWriter(frames=3, clipped=2, peak=2.0)
+    [[ 16384   8192  32767]
+     [-16384  -8192 -32768]]
+    """
+
+    def __init__(
+            self,
+            path,
+            sample_rate=16000,
+            channels=1,
+            dtype=np.int16,
+            *,
+            format=None,
+            atomic=True,
+            inplace=False,
+    ):
+        """
+        Args:
+            path: The file. The format is derived from the suffix (e.g.
+                `.wav` or `.flac`), when `format` is None.
+            sample_rate:
+            channels:
+            dtype: The dtype of the written file (int16, int32, float32 or
+                float64), see `dump_audio`.
+            format: See `soundfile.SoundFile`.
+            atomic: Write to a temporary file and move it to `path` on
+                `close`.
+            inplace: Allow to scale and clip float blocks in place for the
+                integer conversion, i.e. the blocks are modified. Otherwise,
+                they are scaled in a float buffer. The integer samples are
+                written from a buffer, too. The buffers are reused for the
+                following blocks, hence they are only allocated, when a
+                block is larger than the previous blocks.
+        """
+        self.path = normalize_path(path, as_str=True)
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self.inplace = inplace
+        self.frames = 0
+        self.clipped = 0
+        self.peak = 0.
+        self._buffers = {}
+
+        if format is None:
+            format = Path(self.path).suffix[1:].upper()
+
+        self._exit_stack = contextlib.ExitStack()
+        with self._exit_stack:
+            if atomic:
+                file = self._exit_stack.enter_context(
+                    open_atomic(self.path, 'w+b'))
+            else:
+                file = self.path
+            self._file = self._exit_stack.enter_context(soundfile.SoundFile(
+                file,
+                mode='w',
+                samplerate=sample_rate,
+                channels=channels,
+                subtype=_dtype_to_subtype[self.dtype],
+                format=format,
+            ))
+            # Keep the contexts open until close is called.
+            self._exit_stack = self._exit_stack.pop_all()
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}(frames={self.frames}, '
+            f'clipped={self.clipped}, peak={self.peak})'
+        )
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def _buffer(self, frames, dtype):
+        """Reused (frames, channels) array, i.e. the layout of soundfile."""
+        buffer = self._buffers.get(dtype)
+        if buffer is None or len(buffer) < frames:
+            buffer = np.empty((frames, self.channels), dtype)
+            self._buffers[dtype] = buffer
+        return buffer[:frames]
+
+    def _convert(self, block):
+        """
+        Converts a (channels, samples) block to the (samples, channels)
+        block, that is written.
+        """
+        if block.dtype.kind != 'f':
+            return block.T
+        self.peak = max(self.peak, float(np.amax(np.abs(block), initial=0)))
+        if self.dtype.kind != 'i':
+            return block.T
+
+        # Inverse of the scaling in `load_audio`. libsndfile (and hence
+        # `dump_audio`) may differ by one LSB, depending on the format.
+        info = np.iinfo(self.dtype)
+        if self.inplace:
+            block = block.T
+            block *= -float(info.min)
+        else:
+            block = np.multiply(
+                block.T, -float(info.min),
+                out=self._buffer(block.shape[-1], block.dtype),
+            )
+        np.rint(block, out=block)
+        self.clipped += int(np.count_nonzero(
+            (block < info.min) | (block > info.max)))
+        np.clip(block, info.min, info.max, out=block)
+        out = self._buffer(len(block), self.dtype)
+        np.copyto(out, block, casting='unsafe')
+        return out
+
+    def write(self, block):
+        """
+        Appends a block with the shape (channels, samples) or (samples,)
+        for mono. Integer blocks are written as they are, float blocks
+        should be in the range [-1, 1).
+        """
+        block = np.asarray(block)
+        if block.ndim == 1:
+            block = block[None]
+        assert block.ndim == 2 and block.shape[0] == self.channels, (
+            block.shape, self.channels)
+        self._file.write(self._convert(block))
+        self.frames += block.shape[-1]
+
+    def close(self):
+        """Finalizes the header and moves the file to `path`."""
+        self._exit_stack.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._exit_stack.__exit__(exc_type, exc_val, exc_tb)
+
+
 def audiowrite(data, path, sample_rate=16000, normalize=False, threaded=True):
     """ Write the audio data ``data`` to the wav file ``path``
 
     The file can be written in a threaded mode. In this case, the writing
-    process will be started at a separate thread. Consequently, the file will
-    not be written when this function exits.
+    process will be done by the shared bounded
+    `paderbox.io.background.BackgroundWriter`. Consequently, the file will
+    not be written when this function exits. Use
+    `get_background_writer().flush()` to wait for the files and to raise
+    the errors.
 
     :param data: A numpy array with the audio data
     :param path: The wav file the data should be written to
@@ -276,8 +459,8 @@ def audiowrite(data, path, sample_rate=16000, normalize=False, threaded=True):
     data = data.astype(np.int16)
 
     if threaded:
-        threading.Thread(target=wav_write, args=(path, sample_rate, data)
-                         ).start()
+        from paderbox.io.background import get_background_writer
+        get_background_writer().submit(wav_write, path, sample_rate, data)
     else:
         try:
             wav_write(path, sample_rate, data)
@@ -0,0 +1,151 @@
+"""
+Bounded pool of background threads for writing files (e.g. thousands of
+enhanced signals), used by `audiowrite(..., threaded=True)`,
+`dump_audio(..., background=True)` and `paderbox.io.dump(..., background=True)`.
+"""
+import atexit
+import concurrent.futures
+import os
+import threading
+
+__all__ = [
+    'BackgroundWriter',
+    'get_background_writer',
+]
+
+
+class BackgroundWriter:
+    """
+    Executes write functions in a bounded thread pool.
+
+    In contrast to a thread per file, the number of threads is bounded and
+    `submit` blocks, when `max_queue` tasks are pending (backpressure), so
+    the data of the pending writes cannot use unbounded memory.
+    Each task has a future, that surfaces its exception. `flush` waits for
+    all tasks and raises the first exception of the failed tasks, that
+    have not been reported, yet.
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     with BackgroundWriter(max_workers=2) as writer:
+    ...         for i in range(5):
+    ...             _ = writer.submit(Path(tmpdir, f'{i}.txt').write_text, 'a')
+    ...     print(sorted(p.name for p in Path(tmpdir).iterdir()))
+    ['0.txt', '1.txt', '2.txt', '3.txt', '4.txt']
+
+    >>> writer = BackgroundWriter()
+    >>> future = writer.submit(open, '/nonexistent/dir/file.txt', 'w')
+    >>> writer.flush()
+    Traceback (most recent call last):
+    ...
+    FileNotFoundError: [Errno 2] No such file or directory: '/nonexistent/dir/file.txt'
+    >>> writer.flush()  # Each exception is raised once
+    >>> writer.close()
+    """
+
+    def __init__(self, max_workers=4, max_queue=64):
+        """
+        Args:
+            max_workers: Number of threads.
+            max_queue: Maximum number of submitted but not finished tasks.
+                `submit` blocks, when the limit is reached.
+        """
+        assert max_queue >= 1, max_queue
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix=self.__class__.__name__)
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._lock = threading.Lock()
+        # Futures that are not finished or failed since the last flush
+        # (dict as ordered set).
+        self._unchecked = {}
+
+    def __repr__(self):
+        with self._lock:
+            pending = sum(not f.done() for f in self._unchecked)
+        return (
+            f'{self.__class__.__name__}(max_workers={self.max_workers}, '
+            f'max_queue={self.max_queue}, pending={pending})'
+        )
+
+    def _done(self, future):
+        if future.cancelled() or future.exception() is None:
+            with self._lock:
+                self._unchecked.pop(future, None)
+        self._slots.release()
+
+    def submit(self, fn, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Schedules `fn(*args, **kwargs)`. Blocks while `max_queue` tasks are
+        pending. The caller must not modify the arguments (e.g. the array
+        that is written), until the future is done.
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._unchecked[future] = None
+        future.add_done_callback(self._done)
+        return future
+
+    def flush(self):
+        """
+        Waits for all submitted tasks. Raises the exception of the first
+        failed task since the last flush.
+        """
+        with self._lock:
+            futures, self._unchecked = list(self._unchecked), {}
+        concurrent.futures.wait(futures)
+        for future in futures:
+            if not future.cancelled() and future.exception() is not None:
+                raise future.exception()
+
+    def close(self):
+        """Waits for all tasks, stops the threads and raises like `flush`."""
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Do not hide the original exception.
+            self._executor.shutdown(wait=True)
+
+
+_background_writer = None
+_background_writer_pid = None
+_background_writer_lock = threading.Lock()
+
+
+def get_background_writer() -> BackgroundWriter:
+    """
+    The shared `BackgroundWriter`. At the exit of the interpreter, the
+    pending tasks are finished.
+    """
+    global _background_writer, _background_writer_pid
+    with _background_writer_lock:
+        # The threads do not survive a fork.
+        if _background_writer is None or _background_writer_pid != os.getpid():
+            _background_writer = BackgroundWriter()
+            _background_writer_pid = os.getpid()
+        return _background_writer
+
+
+@atexit.register
+def _close_background_writer():
+    # A forked child inherits the writer of the parent, but not its threads.
+    # Closing it would wait forever for the pending tasks of the parent.
+    if _background_writer is not None \
+            and _background_writer_pid == os.getpid():
+        _background_writer.close()
@@ -0,0 +1,189 @@
+"""
+Background prefetching of audio files for training and serving pipelines.
+"""
+import asyncio
+import collections
+import concurrent.futures
+from pathlib import Path
+from typing import Optional
+
+from paderbox.io.audioread import load_audio
+
+__all__ = [
+    'AudioPrefetcher',
+]
+
+
+def _nbytes(data):
+    if isinstance(data, tuple):  # return_sample_rate=True
+        data = data[0]
+    return getattr(data, 'nbytes', 0)
+
+
+class AudioPrefetcher:
+    """
+    Loads audio files with `load_audio` on background threads ahead of the
+    consumption and yields the signals in the order of the requests, so the
+    IO overlaps with the processing of the previous examples.
+
+    >>> import tempfile
+    >>> import numpy as np
+    >>> from paderbox.io import dump_audio
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     files = [Path(tmpdir) / f'{i}.wav' for i in range(3)]
+    ...     for i, file in enumerate(files):
+    ...         dump_audio(np.ones(100 * (i + 1)), file)
+    ...     requests = [files[2], {'path': files[0], 'stop': 10}, files[1]]
+    ...     with AudioPrefetcher(requests, depth=2, workers=2) as prefetcher:
+    ...         print([signal.shape for signal in prefetcher])
+    [(300,), (10,), (200,)]
+
+    The requests are consumed lazily, hence they may be an infinite
+    generator. `async for` awaits the reads without blocking the event loop.
+    """
+
+    def __init__(
+            self,
+            requests,
+            *,
+            depth=8,
+            workers=4,
+            max_bytes=None,
+            **load_kwargs,
+    ):
+        """
+        Args:
+            requests: Iterable of paths or dicts with keyword arguments for
+                `load_audio` (e.g. `{'path': ..., 'start': ..., 'stop': ...}`).
+            depth: Maximum number of reads that are submitted ahead of the
+                consumer.
+            workers: Number of threads.
+            max_bytes: Optional budget for the loaded but not yet consumed
+                signals. The size of pending reads is estimated with the
+                average size of the previous signals. At least one read is
+                always in flight and until the size of the first signal is
+                known, only one read is in flight.
+            **load_kwargs: Defaults for the arguments of `load_audio`,
+                e.g. `dtype`.
+        """
+        assert depth >= 1, depth
+        self._requests = iter(requests)
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self.load_kwargs = load_kwargs
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            workers, thread_name_prefix=self.__class__.__name__)
+        self._queue = collections.deque()
+        self._exhausted = False
+        self._closed = False
+        self._num_loaded = 0
+        self._loaded_bytes = 0
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}(depth={self.depth}, '
+            f'max_bytes={self.max_bytes}, in_flight={len(self._queue)})'
+        )
+
+    def _load(self, request):
+        if isinstance(request, (str, Path)):
+            request = {'path': request}
+        return load_audio(**{**self.load_kwargs, **request})
+
+    def _over_budget(self):
+        """
+        Estimates the bytes of the queued signals. Pending reads are
+        estimated with the average size of the known signals.
+        """
+        num_known = self._num_loaded
+        known_bytes = self._loaded_bytes
+        queued_bytes = 0
+        num_pending = 0
+        for future in self._queue:
+            if future.done() and future.exception() is None:
+                size = _nbytes(future.result())
+                num_known += 1
+                known_bytes += size
+                queued_bytes += size
+            else:
+                num_pending += 1
+        if num_known == 0:
+            # No estimate available, yet.
+            return True
+        mean = known_bytes / num_known
+        return queued_bytes + (num_pending + 1) * mean > self.max_bytes
+
+    def _fill(self):
+        while not self._exhausted and len(self._queue) < self.depth:
+            if (
+                    self.max_bytes is not None
+                    and self._queue
+                    and self._over_budget()
+            ):
+                break
+            try:
+                request = next(self._requests)
+            except StopIteration:
+                self._exhausted = True
+                break
+            self._queue.append(self._executor.submit(self._load, request))
+
+    def _next_future(self) -> Optional[concurrent.futures.Future]:
+        if self._closed:
+            raise RuntimeError(f'{self.__class__.__name__} is closed.')
+        self._fill()
+        if not self._queue:
+            return None
+        return self._queue.popleft()
+
+    def _consumed(self, data):
+        self._num_loaded += 1
+        self._loaded_bytes += _nbytes(data)
+        # Submit the next reads before the caller processes the data.
+        self._fill()
+        return data
+
+    def __iter__(self):
+        try:
+            while True:
+                future = self._next_future()
+                if future is None:
+                    return
+                yield self._consumed(future.result())
+        finally:
+            self.close()
+
+    async def __aiter__(self):
+        try:
+            while True:
+                future = self._next_future()
+                if future is None:
+                    return
+                yield self._consumed(await asyncio.wrap_future(future))
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Cancels the pending reads and stops the threads. Running reads are
+        finished in the background, their results are dropped.
+        Safe to call multiple times.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        # All pending reads are in the queue. Cancel them here, because
+        # shutdown(cancel_futures=True) requires Python 3.9.
+        for future in self._queue:
+            future.cancel()
+        self._queue.clear()
+        self._executor.shutdown(wait=False)
+        close = getattr(self._requests, 'close', None)
+        if close is not None:
+            close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,280 @@
+"""
+Reading of NIST SPHERE files (e.g. WSJ, TIMIT) without temporary files.
+
+The header is parsed in Python and uncompressed files (pcm, ulaw and alaw)
+are read directly with NumPy, where only the requested samples are read.
+Shorten compressed files are decoded with the bundled `sph2pipe`, whose
+output is piped into memory.
+"""
+import io
+import os
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import soundfile
+
+from paderbox.io.audioread import _seconds_to_samples
+from paderbox.io.path_utils import normalize_path
+
+__all__ = [
+    'is_nist_sphere_file',
+    'read_sphere_header',
+    'load_sphere',
+]
+
+SPH2PIPE = os.path.join(os.path.dirname(__file__), 'utils', 'sph2pipe')
+
+MAGIC = b'NIST_1A\n'
+
+_BYTE_FORMATS = {'01': '<', '0123': '<', '10': '>', '3210': '>'}
+
+
+def is_nist_sphere_file(path) -> bool:
+    """
+    Checks the magic bytes of the file.
+
+    >>> is_nist_sphere_file(__file__)
+    False
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        # e.g. missing, a directory or not readable
+        return False
+
+
+def _parse_header(header: bytes, path) -> dict:
+    """
+    >>> header = (
+    ...     b'NIST_1A\\n   1024\\nsample_count -i 5\\n'
+    ...     b'sample_coding -s3 pcm\\nsample_rate -r 8000.0\\n'
+    ...     b'database_id -s8 WSJ one\\nend_head\\n'
+    ... )
+    >>> _parse_header(header, 'file.sph')
+    {'sample_count': 5, 'sample_coding': 'pcm', 'sample_rate': 8000.0, 'database_id': 'WSJ one'}
+    """
+    lines = header.decode('latin-1').split('\n')
+    if lines[0] != MAGIC.decode().strip():
+        raise ValueError(f'{path} is not a NIST SPHERE file.')
+
+    fields = {}
+    for line in lines[2:]:
+        if line.startswith('end_head'):
+            break
+        if line.strip() == '' or line.startswith(';'):
+            continue
+        name, kind, value = line.split(' ', 2)
+        if kind == '-i':
+            fields[name] = int(value)
+        elif kind == '-r':
+            fields[name] = float(value)
+        elif kind.startswith('-s'):
+            # The value may contain spaces, the length is part of the type.
+            fields[name] = value[:int(kind[2:])]
+        else:
+            raise ValueError(f'Invalid SPHERE header line in {path}: {line!r}')
+    else:
+        raise ValueError(f'{path} has no end_head in the SPHERE header.')
+    return fields
+
+
+def read_sphere_header(path) -> dict:
+    """
+    Reads the header fields of a NIST SPHERE file, e.g. `sample_count`,
+    `sample_rate`, `channel_count`, `sample_n_bytes`, `sample_coding` and
+    `sample_byte_format`. The size of the header is stored as
+    `header_size`.
+    """
+    with open(path, 'rb') as f:
+        start = f.read(16)
+        try:
+            header_size = int(start[len(MAGIC):].split(b'\n')[0])
+        except ValueError:
+            raise ValueError(f'{path} is not a NIST SPHERE file.') from None
+        header = start + f.read(header_size - len(start))
+    fields = _parse_header(header, path)
+    fields['header_size'] = header_size
+    return fields
+
+
+def _ulaw_to_linear(data):
+    """ITU-T G.711 u-law decoding to 16 bit."""
+    u = ~data.astype(np.uint8)
+    exponent = (u >> 4) & 0x07
+    mantissa = (u & 0x0F).astype(np.int16)
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(u & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+def _alaw_to_linear(data):
+    """ITU-T G.711 A-law decoding to 16 bit."""
+    a = data.astype(np.uint8) ^ 0x55
+    exponent = (a >> 4) & 0x07
+    mantissa = (a & 0x0F).astype(np.int16)
+    magnitude = np.where(
+        exponent == 0,
+        (mantissa << 4) + 8,
+        ((mantissa << 4) + 0x108) << np.maximum(exponent - 1, 0),
+    )
+    return np.where(a & 0x80, magnitude, -magnitude).astype(np.int16)
+
+
+def _sph2pipe(path):
+    """
+    Decodes (e.g. shorten compressed) files to 16 bit PCM with `sph2pipe`,
+    without a temporary file.
+    """
+    cp = subprocess.run(
+        [SPH2PIPE, '-p', '-f', 'wav', str(path)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False,
+    )
+    if cp.returncode != 0:
+        raise RuntimeError(
+            f'sph2pipe failed for {path}:\n{cp.stderr.decode()}')
+    data, _ = soundfile.read(
+        io.BytesIO(cp.stdout), dtype=np.int16, always_2d=True)
+    return data
+
+
+def load_sphere(
+        path,
+        *,
+        frames=-1,
+        start=0,
+        stop=None,
+        dtype=np.float64,
+        expected_sample_rate=None,
+        unit='samples',
+        return_sample_rate=False,
+):
+    """
+    Loads a NIST SPHERE file. The arguments and the layout of the output
+    are the same as in `load_audio`, i.e. (channels, samples) or
+    (samples,) for single channel files.
+
+    The samples of uncompressed files are read directly from the file
+    (only the requested range), ulaw and alaw are decoded to 16 bit PCM.
+    Shorten compressed files (`sample_coding` contains `shorten`) are
+    decoded with `sph2pipe`.
+
+    >>> import tempfile
+    >>> from paderbox.io.sphere import _write_sphere
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     file = Path(tmpdir) / 'file.sph'
+    ...     _write_sphere(file, np.array([[1, 2, 3], [-1, -2, -3]]), 8000)
+    ...     print(is_nist_sphere_file(file))
+    ...     print(load_sphere(file, dtype=np.int16, start=1))
+    ...     print(load_sphere(file, return_sample_rate=True)[1])
+    True
+    [[ 2  3]
+     [-2 -3]]
+    8000
+    """
+    path = normalize_path(path, as_str=True, allow_fd=False)
+    header = read_sphere_header(path)
+    sample_rate = int(header['sample_rate'])
+    channels = header.get('channel_count', 1)
+    sample_count = header['sample_count']
+    n_bytes = header.get('sample_n_bytes', 2)
+    coding = header.get('sample_coding', 'pcm')
+    byte_format = header.get('sample_byte_format', '01')
+
+    if expected_sample_rate is not None:
+        if expected_sample_rate != sample_rate:
+            raise ValueError(
+                f'Requested sampling rate is {expected_sample_rate} but the '
+                f'audiofile has {sample_rate}'
+            )
+
+    if unit == 'samples':
+        pass
+    elif unit == 'seconds':
+        start, stop, frames = _seconds_to_samples(
+            start, stop, frames, sample_rate)
+    else:
+        raise ValueError(unit)
+    if frames >= 0:
+        if stop is not None:
+            raise TypeError("Only one of {frames, stop} may be used")
+        start, _, _ = slice(start, None).indices(sample_count)
+        stop = start + frames
+    start, stop, _ = slice(start, stop).indices(sample_count)
+    stop = max(start, stop)
+
+    codings = coding.split(',')
+    if any('shorten' in c for c in codings[1:]):
+        data = _sph2pipe(path)[start:stop]
+        bits = 16
+    elif codings[0] == 'pcm':
+        if n_bytes == 1:
+            raw_dtype = np.dtype('i1')
+        elif n_bytes in [2, 4]:
+            endian = _BYTE_FORMATS[byte_format]
+            raw_dtype = np.dtype(f'{endian}i{n_bytes}')
+        else:
+            raise NotImplementedError(
+                f'{path}: pcm with {n_bytes} bytes per sample')
+        data = np.fromfile(
+            path, dtype=raw_dtype, count=(stop - start) * channels,
+            offset=header['header_size'] + start * channels * n_bytes,
+        ).reshape(-1, channels)
+        bits = 8 * n_bytes
+    elif codings[0] in ['ulaw', 'mu-law', 'alaw'] and n_bytes == 1:
+        data = np.fromfile(
+            path, dtype=np.uint8, count=(stop - start) * channels,
+            offset=header['header_size'] + start * channels,
+        ).reshape(-1, channels)
+        if codings[0] == 'alaw':
+            data = _alaw_to_linear(data)
+        else:
+            data = _ulaw_to_linear(data)
+        bits = 16
+    else:
+        raise NotImplementedError(f'{path}: sample_coding {coding!r}')
+
+    if dtype is None:
+        dtype = data.dtype.newbyteorder('=')
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.floating):
+        signal = np.multiply(data, 1 / 2 ** (bits - 1), dtype=dtype)
+    else:
+        shift = np.iinfo(dtype).bits - bits
+        if shift >= 0:
+            signal = np.left_shift(data.astype(dtype), shift)
+        else:
+            signal = np.right_shift(data, -shift).astype(dtype)
+
+    signal = signal.T
+    if channels == 1:
+        signal = signal[0]
+
+    if return_sample_rate:
+        return signal, sample_rate
+    else:
+        return signal
+
+
+def _write_sphere(path, signal, sample_rate, byte_format='01'):
+    """
+    Writes 16 bit PCM in the NIST SPHERE format (only used for tests).
+    """
+    signal = np.atleast_2d(signal)
+    channels, samples = signal.shape
+    lines = [
+        'NIST_1A',
+        '   1024',
+        f'sample_count -i {samples}',
+        f'channel_count -i {channels}',
+        f'sample_rate -i {sample_rate}',
+        'sample_n_bytes -i 2',
+        f'sample_byte_format -s2 {byte_format}',
+        'sample_coding -s3 pcm',
+        'end_head',
+    ]
+    header = ('\n'.join(lines) + '\n').encode().ljust(1024, b' ')
+    endian = {'01': '<', '10': '>'}[byte_format]
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(signal.T.astype(f'{endian}i2').tobytes())
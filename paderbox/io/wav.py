@@ -0,0 +1,246 @@
+"""
+Memory mapped reading of uncompressed WAV files.
+
+`load_audio(..., mmap=True)` uses this module to avoid the decoding of the
+whole file with libsndfile. The RIFF header is parsed in Python and the data
+chunk is mapped with `np.memmap`, hence indexing a `WavMemmap` reads only
+the pages that contain the requested samples and converts only them.
+"""
+import copy
+import struct
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from paderbox.io.audioread import _subtype_to_dtype
+from paderbox.io.path_utils import normalize_path
+
+__all__ = [
+    'WavInfo',
+    'read_wav_info',
+    'WavMemmap',
+]
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format tag, bits per sample) -> (subtype, storage dtype)
+_SUBTYPES = {
+    (WAVE_FORMAT_PCM, 8): ('PCM_U8', np.dtype('u1')),
+    (WAVE_FORMAT_PCM, 16): ('PCM_16', np.dtype('<i2')),
+    (WAVE_FORMAT_PCM, 24): ('PCM_24', np.dtype('V3')),
+    (WAVE_FORMAT_PCM, 32): ('PCM_32', np.dtype('<i4')),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): ('FLOAT', np.dtype('<f4')),
+    (WAVE_FORMAT_IEEE_FLOAT, 64): ('DOUBLE', np.dtype('<f8')),
+}
+
+
+class WavInfo(NamedTuple):
+    sample_rate: int
+    channels: int
+    frames: int
+    subtype: str
+    data_offset: int
+    storage_dtype: np.dtype
+
+
+def read_wav_info(path) -> WavInfo:
+    """
+    Parses the RIFF header of a PCM or IEEE float WAV file (including
+    WAVE_FORMAT_EXTENSIBLE).
+
+    Raises:
+        ValueError: When the file is not an uncompressed WAV file.
+    """
+    file_size = Path(path).stat().st_size
+    with open(path, 'rb') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError(f'{path} is not a RIFF WAVE file.')
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f'{path} has no data chunk.')
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                if chunk_size % 2:
+                    f.seek(1, 1)
+            elif chunk_id == b'data':
+                data_offset = f.tell()
+                data_size = chunk_size
+                break
+            else:
+                # Chunks are aligned to an even number of bytes.
+                f.seek(chunk_size + chunk_size % 2, 1)
+
+    if fmt is None or len(fmt) < 16:
+        raise ValueError(f'{path} has no valid fmt chunk.')
+    format_tag, channels, sample_rate, _, block_align, bits = struct.unpack(
+        '<HHIIHH', fmt[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE:
+        if len(fmt) < 40:
+            raise ValueError(f'{path} has an invalid extensible fmt chunk.')
+        # The first two bytes of the SubFormat GUID are the format tag.
+        format_tag, = struct.unpack('<H', fmt[24:26])
+
+    if (format_tag, bits) not in _SUBTYPES:
+        raise ValueError(
+            f'{path} has the unsupported format tag {format_tag:#06x} with '
+            f'{bits} bits per sample. Only uncompressed PCM and IEEE float '
+            f'WAV files can be memory mapped.'
+        )
+    subtype, storage_dtype = _SUBTYPES[format_tag, bits]
+    assert block_align == channels * storage_dtype.itemsize, (
+        path, block_align, channels, bits)
+
+    # Streaming writers may leave a wrong (e.g. 0xFFFFFFFF) data size.
+    data_size = min(data_size, file_size - data_offset)
+    return WavInfo(
+        sample_rate=sample_rate,
+        channels=channels,
+        frames=data_size // block_align,
+        subtype=subtype,
+        data_offset=data_offset,
+        storage_dtype=storage_dtype,
+    )
+
+
+def _convert(raw, subtype, dtype):
+    """
+    Converts the stored samples to dtype with the same scaling as
+    libsndfile, i.e. integers are scaled to [-1, 1) for float dtypes and
+    shifted for integer dtypes. Floats are rounded (not scaled) and clipped
+    for integer dtypes.
+    """
+    if subtype == 'PCM_24':
+        raw = np.ascontiguousarray(raw)
+        data = np.zeros(raw.shape + (4,), np.uint8)
+        data[..., 1:] = raw.view(np.uint8).reshape(raw.shape + (3,))
+        raw = data.view('<i4')[..., 0]  # Sample scaled to 32 bit
+        bits = 32
+    elif subtype == 'PCM_U8':
+        raw = raw.astype(np.int16) - 128
+        bits = 8
+    elif subtype in ['PCM_16', 'PCM_32']:
+        bits = raw.dtype.itemsize * 8
+    else:
+        if np.issubdtype(dtype, np.integer):
+            if np.iinfo(dtype).bits == 32:
+                # libsndfile rounds the samples as float32 for int32.
+                raw = raw.astype(np.float32, copy=False)
+            # Clip in float64, float32 cannot represent the int32 limits.
+            info = np.iinfo(dtype)
+            return np.clip(
+                np.rint(raw, dtype=np.float64), info.min, info.max
+            ).astype(dtype)
+        return raw.astype(dtype)
+
+    if np.issubdtype(dtype, np.floating):
+        return np.multiply(raw, 1 / 2 ** (bits - 1), dtype=dtype)
+
+    shift = np.iinfo(dtype).bits - bits
+    if shift >= 0:
+        return np.left_shift(raw.astype(dtype), shift)
+    else:
+        return np.right_shift(raw, -shift).astype(dtype)
+
+
+class WavMemmap:
+    """
+    Lazy, read only array of the samples of a WAV file with the same layout
+    as `load_audio`, i.e. the shape is (channels, samples) or (samples,)
+    for mono files.
+
+    Indexing (e.g. a random crop) reads and converts only the requested
+    samples and returns a `np.ndarray` with `dtype`. Use `np.asarray` to
+    load all samples.
+
+    >>> import tempfile
+    >>> from paderbox.io import dump_audio
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     file = Path(tmpdir) / 'audio.wav'
+    ...     dump_audio(np.array([[1, 2, 3, 4], [-1, -2, -3, -4]], np.int16),
+    ...                file, normalize=False)
+    ...     wav = WavMemmap(file)
+    ...     print(wav)
+    ...     print(wav[:, 1:3] * 2 ** 15)
+    ...     print(WavMemmap(file, dtype=np.int16).crop(2, None)[1])
+    ...     del wav
+    WavMemmap(shape=(2, 4), dtype=float64, subtype=PCM_16, sample_rate=16000)
+    [[ 2.  3.]
+     [-2. -3.]]
+    [-3 -4]
+    """
+
+    def __init__(self, path, *, dtype=np.float64):
+        path = normalize_path(path, as_str=True, allow_fd=False)
+        self.path = path
+        self.info = read_wav_info(path)
+        self.sample_rate = self.info.sample_rate
+
+        if dtype is None:
+            # Same default as in `load_audio`.
+            dtype = _subtype_to_dtype(self.info.subtype)
+        self.dtype = np.dtype(dtype)
+
+        if self.info.frames == 0:
+            # np.memmap cannot map an empty region.
+            raw = np.zeros(
+                (0, self.info.channels), dtype=self.info.storage_dtype)
+        else:
+            raw = np.memmap(
+                path, dtype=self.info.storage_dtype, mode='r',
+                offset=self.info.data_offset,
+                shape=(self.info.frames, self.info.channels),
+            )
+        # Same layout as load_audio: (channels, samples) or (samples,).
+        raw = raw.T
+        if self.info.channels == 1:
+            raw = raw[0]
+        self._raw = raw
+
+    @property
+    def shape(self):
+        return self._raw.shape
+
+    @property
+    def ndim(self):
+        return self._raw.ndim
+
+    @property
+    def size(self):
+        return self._raw.size
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}(shape={self.shape}, '
+            f'dtype={self.dtype}, subtype={self.info.subtype}, '
+            f'sample_rate={self.sample_rate})'
+        )
+
+    def crop(self, start=0, stop=None) -> 'WavMemmap':
+        """
+        Lazy view on the samples `[start, stop)`. Negative values count from
+        the end, like in `load_audio`.
+        """
+        start, stop, _ = slice(start, stop).indices(self.shape[-1])
+        new = copy.copy(self)
+        new._raw = self._raw[..., start:max(start, stop)]
+        return new
+
+    def __getitem__(self, item):
+        return _convert(self._raw[item], self.info.subtype, self.dtype)
+
+    def __array__(self, dtype=None):
+        array = self[...]
+        if dtype is not None:
+            array = array.astype(dtype, copy=False)
+        return array
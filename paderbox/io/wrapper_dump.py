@@ -19,6 +19,7 @@ def dump(
         mkdir_exist_ok=False,  # Should this be an option? Should the default be True?
         unsafe=False,  # Should this be an option? Should the default be True?
         # atomic=False,  ToDo: Add atomic support
+        background=False,
         **kwargs,
 ):
     """
@@ -38,6 +39,7 @@ def dump(
        - mat: MATLAB
        - npy: Numpy
        - npz: Numpy compressed
+       - ai.npz: Nested dict of ArrayIntervals
        - pth: Pickle with Pytorch support
      - Compressed:
        - json.gz
@@ -53,6 +55,10 @@ def dump(
         mkdir_exist_ok:
         unsafe:
             Allow unsafe dump protocol. This option is more relevant for load.
+        background:
+            If True, write the file with the shared
+            `paderbox.io.background.BackgroundWriter` and return a future.
+            Do not modify obj, until the future is done.
         **kwargs:
             Forwarded arguments to the particular dump function.
             Should rarely be used, because when a special property of the dump
@@ -61,6 +67,13 @@ def dump(
     Returns:
 
     """
+    if background:
+        from paderbox.io.background import get_background_writer
+        return get_background_writer().submit(
+            dump, obj, path, mkdir=mkdir, mkdir_parents=mkdir_parents,
+            mkdir_exist_ok=mkdir_exist_ok, unsafe=unsafe, **kwargs,
+        )
+
     path = normalize_path(path, allow_fd=False)
     if mkdir:
         if mkdir_exist_ok:
@@ -121,6 +134,9 @@ def dump(
         sio.savemat(path, obj, **kwargs)
     elif str(path).endswith('.npy'):
         np.save(str(path), obj, allow_pickle=unsafe, **kwargs)
+    elif str(path).endswith('.ai.npz'):
+        from paderbox.array.interval import to_npz
+        to_npz(obj, path, **kwargs)
     elif str(path).endswith('.npz'):
         assert unsafe, (unsafe, path)
         assert len(kwargs) == 0, kwargs
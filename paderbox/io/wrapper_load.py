@@ -69,6 +69,10 @@ class Loader:
         elif ext in ['.wav']:
             from paderbox.io import load_audio
             return load_audio(file, **self.kwargs)
+        elif ext in ['.ai.npz'] or (
+                ext in ['.npz'] and str(file).endswith('.ai.npz')):
+            from paderbox.array.interval import from_npz
+            return from_npz(file, **self.kwargs)
         elif ext in ['.npz']:
             import numpy as np
             data = np.load(file, **self.kwargs, allow_pickle=self.unsafe)
@@ -202,6 +206,7 @@ def load(
                 - Optional safe/unsafe extensions:
                     - .yaml
                     - .npz, .npy: Numpy file
+                    - .ai.npz: Nested dict of ArrayIntervals
                 - Unsafe extensions:
                     - .pkl, .dill
                     - .pth: Torch file
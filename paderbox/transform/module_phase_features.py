@@ -1,27 +1,53 @@
-from copy import deepcopy
+import functools
 
 import numpy as np
-import paderbox.math.directional as directional
 
 
-def transform_to_baseband(X, size, shift):
+@functools.lru_cache(maxsize=32)
+def _get_baseband_rotation(frames, frequencies, size, shift):
+    """Phase rotation table with shape (frames, 1, frequencies).
+
+    The table is cached, hence it is marked as read only.
+    """
+    t = np.arange(frames)[:, None, None]
+    f = np.arange(frequencies)[None, None, :]
+    rotation = np.exp(-2j * np.pi * t * f * shift / size)
+    rotation.flags.writeable = False
+    return rotation
+
+
+def transform_to_baseband(X, size, shift, inplace=False):
     """Assumes linear frequency dependency.
 
     Then phase is more consistent over frequencies.
 
     Args:
-        X:
-        size:
-        shift:
+        X: STFT signal with shape (..., T, D, F). The rotation is applied
+            along the time (T) and frequency (F) axis and broadcasted over
+            all other axes.
+        size: STFT size
+        shift: STFT shift
+        inplace: If True, X has to be a complex array and is modified
+            inplace.
 
     Returns:
+        Signal with the same shape as X.
 
+    >>> X = np.ones((3, 1, 2), dtype=np.complex128)
+    >>> np.round(transform_to_baseband(X, size=4, shift=1)[..., 1], 3)
+    array([[ 1.+0.j],
+           [ 0.-1.j],
+           [-1.-0.j]])
+    >>> transform_to_baseband(np.ones((2, 3, 2, 1, 2)), 4, 1).shape
+    (2, 3, 2, 1, 2)
     """
-    X = deepcopy(X)
-    T, _, F = X.shape
-    for t in range(T):
-        for f in range(F):
-            X[t, :, f] *= np.exp(-2j * np.pi * t * f * shift / size)
+    if inplace:
+        assert isinstance(X, np.ndarray), type(X)
+        assert np.iscomplexobj(X), X.dtype
+    else:
+        X = np.array(X, dtype=np.result_type(X, np.complex64))
+    T, _, F = X.shape[-3:]
+    X *= _get_baseband_rotation(T, F, size, shift)
     return X
 
 
@@ -33,17 +59,31 @@ def get_phase_features(X, size, shift):
     to SPP than the phase itself.
 
     Args:
-        X:
-        size:
-        shift:
+        X: STFT signal with shape (..., T, D, F)
+        size: STFT size
+        shift: STFT shift
 
     Returns:
+        phase, delta and delta_delta, each with the same shape as X.
 
     """
     X_base = transform_to_baseband(X, size, shift)
     phase = np.angle(X_base)
-    delta = np.zeros_like(phase)
-    delta[1:, ...] = directional.minus(phase[1:, ...], phase[:-1, ...])
-    delta_delta = np.zeros_like(phase)
-    delta_delta[1:, ...] = delta[1:, ...] - delta[:-1, ...]
+    del X_base
+
+    # Take the difference along the time axis and wrap it to [-pi, pi].
+    # Both phases are in [-pi, pi], hence a single shift of 2 pi is enough.
+    delta = np.empty_like(phase)
+    delta[..., :1, :, :] = 0
+    d = delta[..., 1:, :, :]
+    np.subtract(phase[..., 1:, :, :], phase[..., :-1, :, :], out=d)
+    np.subtract(d, 2 * np.pi, out=d, where=d > np.pi)
+    np.add(d, 2 * np.pi, out=d, where=d < -np.pi)
+
+    delta_delta = np.empty_like(phase)
+    delta_delta[..., :1, :, :] = 0
+    np.subtract(
+        delta[..., 1:, :, :], delta[..., :-1, :, :],
+        out=delta_delta[..., 1:, :, :],
+    )
     return phase, delta, delta_delta
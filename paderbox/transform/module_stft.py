@@ -12,6 +12,7 @@ from scipy import signal
 
 from paderbox.array import roll_zeropad
 from paderbox.array import segment_axis
+from paderbox.array import segment_axis_parts
 from paderbox.utils.mapping import Dispatcher
 
 
@@ -66,15 +67,25 @@ def stft(
         window_length = size
 
     # Pad with zeros to have enough samples for the window function to fade.
+    # The padding is not applied to the signal. Instead, only the few frames
+    # that overlap with the padding are copied (see segment_axis_parts).
     assert fading in [None, True, False, 'full', 'half'], fading
     if fading not in [False, None]:
-        pad_width = np.zeros((time_signal.ndim, 2), dtype=np.int)
+        assert window_length >= shift, (
+            f'The padding for fading={fading!r} is window_length - shift, '
+            f'hence the window_length ({window_length}) has to be at least '
+            f'as large as the shift ({shift}). Use fading=None or False for '
+            f'a shift that is larger than the window.'
+        )
         if fading == 'half':
-            pad_width[axis, 0] = (window_length - shift) // 2
-            pad_width[axis, 1] = ceil((window_length - shift) / 2)
+            pad_width = (
+                (window_length - shift) // 2,
+                ceil((window_length - shift) / 2),
+            )
         else:
-            pad_width[axis, :] = window_length - shift
-        time_signal = np.pad(time_signal, pad_width, mode='constant')
+            pad_width = (window_length - shift, window_length - shift)
+    else:
+        pad_width = (0, 0)
 
     window = _get_window(
         window=window,
@@ -82,33 +93,32 @@ def stft(
         window_length=window_length,
     )
 
-    time_signal_seg = segment_axis(
+    parts = segment_axis_parts(
         time_signal,
         window_length,
         shift=shift,
         axis=axis,
-        end='pad' if pad else 'cut'
+        pad_width=pad_width,
+        end='pad' if pad else 'cut',
     )
 
-    letters = string.ascii_lowercase[:time_signal_seg.ndim]
-    mapping = letters + ',' + letters[axis + 1] + '->' + letters
-
-    try:
-        # ToDo: Implement this more memory efficient
-        return rfft(
-            np.einsum(mapping, time_signal_seg, window),
-            n=size,
-            axis=axis + 1,
+    # Apply the window to all parts and write the result in one buffer.
+    shape = list(parts[1].shape)
+    shape[axis] = sum([part.shape[axis] for part in parts])
+    time_signal_seg = np.empty(
+        shape, dtype=np.result_type(time_signal.dtype, window.dtype))
+    window = window.reshape(
+        [window_length] + [1] * (time_signal_seg.ndim - axis - 2))
+    start = 0
+    for part in parts:
+        stop = start + part.shape[axis]
+        np.multiply(
+            part, window,
+            out=time_signal_seg[(slice(None),) * axis + (slice(start, stop),)],
         )
-    except ValueError as e:
-        raise ValueError(
-            f'Could not calculate the stft, something does not match.\n'
-            f'mapping: {mapping}, '
-            f'time_signal_seg.shape: {time_signal_seg.shape}, '
-            f'window.shape: {window.shape}, '
-            f'size: {size}'
-            f'axis+1: {axis+1}'
-        ) from e
+        start = stop
+
+    return rfft(time_signal_seg, n=size, axis=axis + 1)
 
 
 def stft_with_kaldi_dimensions(
@@ -0,0 +1,95 @@
+"""
+Compares the Cython kernels in `paderbox/array/interval/util.pyx` with the
+NumPy fallback in `paderbox/array/interval/numpy_util.py`.
+
+N = 100000 intervals, seconds per call:
+
+str_to_intervals
+cython 0.150
+numpy 0.034
+
+intersection
+cython 0.0163
+numpy 0.0018
+
+non_intersection
+cython 0.0118
+numpy 0.0027
+
+parse_item (pure Python fallback, only used without the extension)
+cython 0.065
+numpy 0.155
+
+"""
+import timeit
+
+import numpy as np
+
+from paderbox.array.interval.numpy_util import (
+    np_intersection,
+    np_non_intersection,
+    np_parse_item,
+    np_str_to_intervals,
+)
+
+try:
+    from paderbox.array.interval.util import (
+        cy_intersection,
+        cy_non_intersection,
+        cy_parse_item,
+        cy_str_to_intervals,
+    )
+except ImportError:
+    cy_intersection = cy_non_intersection = None
+    cy_parse_item = cy_str_to_intervals = None
+
+
+N = 100_000
+rng = np.random.RandomState(0)
+EDGES = np.sort(rng.choice(100 * N, size=2 * N, replace=False))
+INTERVALS = EDGES.reshape(-1, 2)
+TUPLES = tuple(map(tuple, INTERVALS.tolist()))
+STRING = ', '.join([f'{start}:{stop}' for start, stop in TUPLES])
+SLICES = [slice(start, stop) for start, stop in TUPLES]
+WINDOW = (25 * N, 75 * N)
+
+
+def setup_str_to_intervals(kernel):
+    return lambda: kernel(STRING)
+
+
+def setup_intersection(kernel):
+    # The Cython kernel iterates over tuples, the NumPy kernel prefers arrays.
+    intervals = TUPLES if kernel is cy_intersection else INTERVALS
+    return lambda: kernel(WINDOW, intervals)
+
+
+def setup_non_intersection(kernel):
+    intervals = TUPLES if kernel is cy_non_intersection else INTERVALS
+    return lambda: kernel(WINDOW, intervals)
+
+
+def setup_parse_item(kernel):
+    shape = (100 * N,)
+    return lambda: [kernel(item, shape) for item in SLICES]
+
+
+if __name__ == '__main__':
+    print('N =', N)
+    print()
+    repeats = 10
+
+    for name in [
+        'str_to_intervals', 'intersection', 'non_intersection', 'parse_item',
+    ]:
+        print(name)
+        for library, kernel in [
+            ('cython', globals()[f'cy_{name}']),
+            ('numpy', globals()[f'np_{name}']),
+        ]:
+            if kernel is None:
+                print(library, 'not available')
+                continue
+            fn = globals()[f'setup_{name}'](kernel)
+            print(library, min(timeit.repeat(fn, number=1, repeat=repeats)))
+        print()
@@ -0,0 +1,115 @@
+import io
+import tarfile
+import zipfile
+
+import numpy as np
+import pytest
+
+from paderbox.io import AudioArchive, dump_audio, load_audio
+from paderbox.io.archive import get_audio_archive, open_archive_member
+
+
+@pytest.fixture
+def signals():
+    rng = np.random.RandomState(0)
+    return {
+        'a.wav': rng.uniform(-0.5, 0.5, size=1000),
+        'dir/b.wav': rng.uniform(-0.5, 0.5, size=(2, 500)),
+        'dir/c.flac': rng.uniform(-0.5, 0.5, size=300),
+    }
+
+
+def _write_files(tmp_path, signals):
+    files = {}
+    for name, signal in signals.items():
+        file = tmp_path / 'files' / name
+        file.parent.mkdir(parents=True, exist_ok=True)
+        dump_audio(signal, file, normalize=False)
+        files[name] = file
+    return files
+
+
+@pytest.fixture(params=['tar', 'zip'])
+def archive_path(request, tmp_path, signals):
+    files = _write_files(tmp_path, signals)
+    path = tmp_path / f'shard.{request.param}'
+    if request.param == 'tar':
+        with tarfile.open(path, 'w') as tar:
+            tar.add(tmp_path / 'files', 'files')  # Adds also directories
+            for name, file in files.items():
+                tar.add(file, name)
+    else:
+        with zipfile.ZipFile(path, 'w') as z:
+            z.writestr('files/', '')
+            for name, file in files.items():
+                z.write(file, name)
+    return path
+
+
+def test_audio_archive(archive_path, signals):
+    archive = AudioArchive(archive_path)
+    assert set(signals) <= set(archive)
+    assert 'files/' not in archive
+
+    for name, signal in signals.items():
+        expected = load_audio(archive_path.parent / 'files' / name)
+        np.testing.assert_equal(archive.load(name), expected)
+        np.testing.assert_equal(
+            load_audio(f'archive://{archive_path}#{name}', start=10, stop=-5),
+            expected[..., 10:-5],
+        )
+
+    data, sample_rate = archive.load(
+        'a.wav', start=0.01, frames=0.02, unit='seconds',
+        return_sample_rate=True,
+    )
+    assert sample_rate == 16000
+    assert data.shape == (320,)
+
+    with pytest.raises(FileNotFoundError):
+        archive.open('missing.wav')
+
+
+def test_member_file(archive_path):
+    archive = AudioArchive(archive_path)
+    member = archive.index['a.wav']
+    with archive.open('a.wav') as f, \
+            open(archive_path.parent / 'files' / 'a.wav', 'rb') as ref:
+        content = ref.read()
+        assert member.size == len(content)
+        assert f.read() == content
+        assert f.read() == b''
+        assert f.seek(-4, io.SEEK_END) == len(content) - 4
+        assert f.read(100) == content[-4:]
+        f.seek(10)
+        assert f.read(6) == content[10:16]
+        assert f.tell() == 16
+
+
+def test_get_audio_archive(archive_path):
+    archive = get_audio_archive(archive_path)
+    assert get_audio_archive(str(archive_path)) is archive
+
+    with open_archive_member(f'archive://{archive_path}#a.wav') as f:
+        assert f.name == f'archive://{archive_path}#a.wav'
+
+    with pytest.raises(ValueError):
+        open_archive_member(f'archive://{archive_path}')
+
+
+def test_compressed_archive(tmp_path, signals):
+    files = _write_files(tmp_path, signals)
+
+    with tarfile.open(tmp_path / 'shard.tar.gz', 'w:gz') as tar:
+        tar.add(files['a.wav'], 'a.wav')
+    with pytest.raises(ValueError, match='not an uncompressed tar'):
+        AudioArchive(tmp_path / 'shard.tar.gz')
+
+    with zipfile.ZipFile(
+            tmp_path / 'shard.zip', 'w', zipfile.ZIP_DEFLATED) as z:
+        z.write(files['a.wav'], 'a.wav')
+    with pytest.raises(ValueError, match='compressed or encrypted'):
+        AudioArchive(tmp_path / 'shard.zip')
+
+    with pytest.raises(ValueError, match='neither a tar nor a zip'):
+        AudioArchive(files['a.wav'])
@@ -2,9 +2,13 @@ import numpy
 import numpy.testing as nptest
 import unittest
 import os
+import subprocess
+import sys
+import tempfile
 import time
-from paderbox.io.audioread import audioread
-from paderbox.io.audiowrite import audiowrite
+from pathlib import Path
+from paderbox.io.audioread import audioread, load_audio
+from paderbox.io.audiowrite import audiowrite, dump_audio, AudioWriter
 
 signal = numpy.random.uniform(-1, 1, size=(10000,))
 path = 'audiowrite_test.wav'
@@ -40,4 +44,146 @@ class AudioWriteTest(unittest.TestCase):
         try:
             os.remove(path)
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+
+class AudioWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_same_as_dump_audio(self):
+        data = numpy.random.RandomState(0).uniform(-1, 1, size=(2, 1000))
+        for dtype in [numpy.int16, numpy.int32, numpy.float32]:
+            for suffix in ['.wav', '.flac']:
+                if suffix == '.flac' and dtype != numpy.int16:
+                    continue
+                file = self.dir / f'writer{suffix}'
+                with AudioWriter(file, 8000, channels=2, dtype=dtype) as w:
+                    for start in range(0, 1000, 300):
+                        w.write(data[:, start:start + 300])
+                self.assertEqual(w.frames, 1000)
+                self.assertEqual(w.clipped, 0)
+                dump_audio(data, self.dir / f'dump{suffix}', sample_rate=8000,
+                           dtype=dtype, normalize=False)
+                # Up to one LSB difference to the rounding of libsndfile.
+                nptest.assert_allclose(
+                    load_audio(file, dtype=numpy.float64),
+                    load_audio(self.dir / f'dump{suffix}', dtype=numpy.float64),
+                    rtol=0, atol=2 ** -15,
+                )
+                if dtype != numpy.float32:
+                    bits = numpy.iinfo(dtype).bits
+                    nptest.assert_equal(
+                        load_audio(file, dtype=dtype),
+                        numpy.rint(data * 2 ** (bits - 1)),
+                    )
+
+    def test_clipping_and_inplace(self):
+        block = numpy.array([0.5, 1.5, -3, -0.25])
+        file = self.dir / 'audio.wav'
+        with AudioWriter(file, inplace=False) as w:
+            w.write(block)
+        nptest.assert_equal(block, [0.5, 1.5, -3, -0.25])
+        self.assertEqual((w.clipped, w.peak), (2, 3))
+        nptest.assert_equal(
+            load_audio(file, dtype=numpy.int16), [16384, 32767, -32768, -8192])
+
+        with AudioWriter(file, inplace=True) as w:
+            w.write(block)
+        self.assertEqual(block[1], int16_max)
+
+    def test_reused_buffers(self):
+        rng = numpy.random.RandomState(0)
+        blocks = [rng.uniform(-1, 1, size=(2, n)) for n in [100, 50, 200]]
+        file = self.dir / 'audio.wav'
+        with AudioWriter(file, channels=2) as w:
+            for block in blocks:
+                w.write(block)
+        nptest.assert_allclose(
+            load_audio(file), numpy.concatenate(blocks, axis=-1),
+            atol=2 ** -15,
+        )
+
+    def test_atomic(self):
+        file = self.dir / 'audio.wav'
+        dump_audio(numpy.ones(10, numpy.int16), file, normalize=False)
+        with self.assertRaises(RuntimeError):
+            with AudioWriter(file) as w:
+                w.write(numpy.zeros(100, numpy.int16))
+                raise RuntimeError()
+        self.assertTrue(w.closed)
+        nptest.assert_equal(
+            load_audio(file, dtype=numpy.int16), numpy.ones(10))
+        self.assertEqual(
+            [p.name for p in self.dir.iterdir()], ['audio.wav'])
+
+        writer = AudioWriter(file, atomic=False)
+        writer.write(numpy.zeros(100, numpy.int16))
+        writer.close()
+        nptest.assert_equal(load_audio(file), numpy.zeros(100))
+
+
+class BackgroundWriterTest(unittest.TestCase):
+    def test_backpressure(self):
+        from paderbox.io.background import BackgroundWriter
+        import threading
+        release = threading.Event()
+        with BackgroundWriter(max_workers=2, max_queue=3) as writer:
+            futures = [writer.submit(release.wait) for _ in range(3)]
+            blocked = threading.Thread(
+                target=lambda: futures.append(writer.submit(lambda: 42)))
+            blocked.start()
+            blocked.join(0.2)
+            # The queue is full, hence submit blocks.
+            self.assertTrue(blocked.is_alive())
+            release.set()
+            blocked.join()
+        self.assertEqual(futures[-1].result(), 42)
+
+    def test_dump_background(self):
+        from paderbox.io import dump
+        from paderbox.io.background import get_background_writer
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data = numpy.random.RandomState(0).uniform(-0.5, 0.5, size=100)
+            files = [Path(tmpdir) / f'{i}.wav' for i in range(10)]
+            futures = [dump(data, f, background=True, normalize=False)
+                       for f in files[:5]]
+            futures += [dump_audio(data, f, background=True, normalize=False)
+                        for f in files[5:]]
+            get_background_writer().flush()
+            for future, file in zip(futures, files):
+                self.assertTrue(future.done())
+                nptest.assert_allclose(load_audio(file), data, atol=2**-15)
+
+            future = dump(data, Path(tmpdir) / 'missing' / 'a.wav',
+                          background=True)
+            with self.assertRaises(FileNotFoundError):
+                get_background_writer().flush()
+            self.assertIsInstance(future.exception(), FileNotFoundError)
+            get_background_writer().flush()
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'Requires os.fork')
+    def test_fork_with_pending_writes(self):
+        # The child must not wait at exit for the writes of the parent.
+        script = (
+            'import os, sys, threading\n'
+            'from paderbox.io.background import get_background_writer\n'
+            'release = threading.Event()\n'
+            'get_background_writer().submit(release.wait)\n'
+            'pid = os.fork()\n'
+            'if pid == 0:\n'
+            '    get_background_writer().submit(print, "child")\n'
+            '    sys.exit(0)\n'
+            '_, status = os.waitpid(pid, 0)\n'
+            'release.set()\n'
+            'sys.exit(os.WEXITSTATUS(status))\n'
+        )
+        cp = subprocess.run(
+            [sys.executable, '-c', script], stdout=subprocess.PIPE,
+            timeout=60, check=True,
+        )
+        self.assertEqual(cp.stdout, b'child\n')
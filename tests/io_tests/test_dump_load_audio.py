@@ -3,7 +3,7 @@ import io
 import numpy as np
 import soundfile
 
-from paderbox.io import load_audio
+from paderbox.io import load_audio, load_audio_segments
 from paderbox.io.audiowrite import dump_audio, dumps_audio
 from paderbox.testing.testfile_fetcher import get_file_path
     
@@ -106,3 +106,216 @@ class TestIOAudio:
                 load_audio(path)
         else:
             load_audio(path)
+
+
+@pytest.mark.parametrize("max_gap", [0, 100, 10_000])
+@pytest.mark.parametrize("shape", [(4000,), (3, 4000)])
+def test_load_audio_segments(tmp_path, max_gap, shape):
+    file = tmp_path / 'audio.wav'
+    a = np.random.RandomState(0).randint(-2**15, 2**15, size=shape)
+    dump_audio(a.astype(np.int16), file, sample_rate=8000, normalize=False)
+    segments = [
+        (1000, 2000), (0, 10), (1500, 1600), (5, 3000), (3990, None),
+        (-100, -50), (2000, 2000), (3000, 5000), (50, 60),
+    ]
+    signals = load_audio_segments(file, segments, max_gap=max_gap)
+    assert len(signals) == len(segments)
+    for (start, stop), signal in zip(segments, signals):
+        np.testing.assert_equal(
+            signal, load_audio(file, start=start, stop=stop))
+    for i, signal in enumerate(signals):
+        for other in signals[i + 1:]:
+            assert not np.shares_memory(signal, other)
+
+    signals, sample_rate = load_audio_segments(
+        file, [(0.25, 0.5)], unit='seconds', return_sample_rate=True)
+    assert sample_rate == 8000
+    np.testing.assert_equal(
+        signals[0], load_audio(file, start=0.25, stop=0.5, unit='seconds'))
+    np.testing.assert_equal(
+        signals[0], load_audio(file, start=2000, stop=4000))
+
+
+@pytest.mark.parametrize("format", ["WAV", "WAVEX"])
+@pytest.mark.parametrize(
+    "subtype", ["PCM_U8", "PCM_16", "PCM_24", "PCM_32", "FLOAT", "DOUBLE"])
+@pytest.mark.parametrize("shape", [(1000,), (1000, 3)])
+def test_load_audio_mmap(tmp_path, format, subtype, shape):
+    file = tmp_path / 'audio.wav'
+    a = np.random.RandomState(0).uniform(-1, 1, size=shape)
+    if not subtype.startswith('PCM'):
+        # Float samples are rounded and clipped for int dtypes.
+        a = a * 100000
+    soundfile.write(str(file), a, 8000, format=format, subtype=subtype)
+
+    for dtype in [np.float64, np.float32, np.int16, np.int32]:
+        expected = load_audio(file, dtype=dtype)
+        signal = load_audio(file, dtype=dtype, mmap=True)
+        assert signal.shape == expected.shape
+        np.testing.assert_equal(np.asarray(signal), expected)
+        np.testing.assert_equal(signal[..., 100:200], expected[..., 100:200])
+        assert signal[..., :10].dtype == dtype
+
+    signal, sample_rate = load_audio(
+        file, start=0.01, frames=0.02, unit='seconds', mmap=True,
+        return_sample_rate=True)
+    assert sample_rate == 8000
+    np.testing.assert_equal(
+        np.asarray(signal), load_audio(file, start=80, stop=240))
+    np.testing.assert_equal(
+        np.asarray(load_audio(file, start=-10, mmap=True)),
+        load_audio(file, start=-10))
+
+
+def test_load_audio_mmap_unsupported(tmp_path):
+    file = tmp_path / 'audio.flac'
+    soundfile.write(str(file), np.zeros(100), 8000)
+    with pytest.raises(ValueError):
+        load_audio(file, mmap=True)
+
+
+def test_audio_metadata_index(tmp_path):
+    from paderbox.io.audioread import (
+        AudioMetadataIndex, use_audio_metadata_index, audio_length,
+    )
+    files = []
+    for i in range(20):
+        files.append(tmp_path / f'{i}.wav')
+        dump_audio(np.ones(100 + i), files[-1], normalize=False)
+
+    index = AudioMetadataIndex(tmp_path / 'index.sqlite')
+    index.build(files, max_workers=4)
+    assert len(index) == 20
+    index.close()
+
+    # The index is persistent and trusted with validate=False
+    index = AudioMetadataIndex(tmp_path / 'index.sqlite', validate=False)
+    dump_audio(np.ones(10), files[0], normalize=False)
+    with use_audio_metadata_index(index):
+        assert audio_length(files[0]) == 100
+        assert audio_length(files[1], unit='seconds') == 101 / 16000
+    assert audio_length(files[0]) == 10
+
+    index.validate = True
+    with use_audio_metadata_index(index):
+        assert audio_length(files[0]) == 10
+    index.close()
+
+
+def test_recursive_load_audio_max_workers(tmp_path):
+    from paderbox.io import recursive_load_audio
+    files = []
+    for i in range(8):
+        files.append(tmp_path / f'{i}.wav')
+        dump_audio(np.full(100 + 10 * (i // 4), i / 10), files[-1], normalize=False)
+
+    example = {
+        'observation': files[:4],
+        'sources': (f for f in files[4:6]),
+        'mixed': [files[0], files[4]],
+        'single': files[7],
+    }
+    expected = recursive_load_audio(
+        {**example, 'sources': files[4:6]}, stop=80)
+    for _ in range(2):
+        loaded = recursive_load_audio(
+            {**example, 'sources': (f for f in files[4:6])},
+            stop=80, max_workers=3,
+        )
+        assert loaded.keys() == expected.keys()
+        assert loaded['observation'].shape == (4, 80)
+        for k in expected:
+            np.testing.assert_equal(loaded[k], expected[k])
+
+    with pytest.raises(RuntimeError):
+        recursive_load_audio([files[0], tmp_path / 'missing.wav'], max_workers=2)
+
+
+def _dump_files(tmp_path, num_files):
+    files = []
+    for i in range(num_files):
+        files.append(tmp_path / f'{i}.wav')
+        dump_audio(np.full(1000, i / 100), files[-1], normalize=False)
+    return files
+
+
+def test_audio_prefetcher(tmp_path):
+    from paderbox.io import AudioPrefetcher
+    files = _dump_files(tmp_path, 20)
+    expected = [load_audio(f, dtype=np.float32) for f in files]
+
+    consumed = []
+
+    def requests():
+        for i, file in enumerate(files):
+            consumed.append(i)
+            yield file
+
+    prefetcher = AudioPrefetcher(
+        requests(), depth=4, workers=2, dtype=np.float32)
+    for i, signal in enumerate(prefetcher):
+        np.testing.assert_equal(signal, expected[i])
+        # The requests are consumed at most depth ahead.
+        assert len(consumed) <= i + 1 + 4
+
+    # The byte budget limits the number of prefetched signals.
+    consumed.clear()
+    prefetcher = AudioPrefetcher(
+        requests(), depth=10, max_bytes=3 * 4000, dtype=np.float32)
+    iterator = iter(prefetcher)
+    next(iterator)
+    assert len(consumed) == 1 + 3
+    iterator.close()
+    with pytest.raises(RuntimeError, match='closed'):
+        next(iter(prefetcher))
+
+    with AudioPrefetcher([files[0], tmp_path / 'missing.wav']) as prefetcher:
+        with pytest.raises(RuntimeError):
+            list(prefetcher)
+
+
+def test_audio_prefetcher_async(tmp_path):
+    import asyncio
+    from paderbox.io import AudioPrefetcher
+    files = _dump_files(tmp_path, 5)
+
+    async def consume():
+        return [
+            signal async for signal in AudioPrefetcher(
+                ({'path': f, 'stop': 10} for f in files), depth=2)
+        ]
+
+    # asyncio.run requires Python 3.7.
+    loop = asyncio.new_event_loop()
+    try:
+        signals = loop.run_until_complete(consume())
+    finally:
+        loop.close()
+    np.testing.assert_equal(
+        signals, [load_audio(f, stop=10) for f in files])
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+@pytest.mark.parametrize("start, stop", [
+    (0, None), (0, 1000), (123, 456), (999, None), (500, 2000), (1000, 1000),
+])
+def test_decode_int16_buffers(channels, start, stop):
+    from paderbox.io.audioread import _decode_int16_buffers
+    rng = np.random.RandomState(0)
+    data = rng.randint(-2**15, 2**15, size=(1000, channels)).astype('<i2')
+    raw = data.tobytes()
+    # Buffers of random size, not aligned to the frames
+    edges = np.sort(rng.randint(0, len(raw), size=20))
+    buffers = [raw[a:b] for a, b in zip([0, *edges], [*edges, len(raw)])]
+
+    expected = data[start:stop]
+    if channels == 1:
+        expected = expected[:, 0]
+    for size_hint in [0, 10, 1000, 5000]:
+        for dtype, scale in [(np.int16, 1), (np.int32, 2**16),
+                             (np.float32, 2**-15), (np.float64, 2**-15)]:
+            signal = _decode_int16_buffers(
+                iter(buffers), channels=channels, start=start, stop=stop,
+                dtype=dtype, size_hint=size_hint)
+            assert signal.dtype == dtype
+            np.testing.assert_equal(signal, expected.astype(dtype) * scale)
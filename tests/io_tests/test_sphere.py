@@ -0,0 +1,98 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from paderbox.io.audioread import is_nist_sphere_file, read_nist_wsj, load_audio
+from paderbox.io.sphere import (
+    load_sphere, read_sphere_header, _write_sphere, _sph2pipe,
+    _ulaw_to_linear, _alaw_to_linear,
+)
+
+
+@pytest.fixture
+def signal():
+    return np.random.RandomState(0).randint(-2**15, 2**15, size=(2, 1000))
+
+
+@pytest.mark.parametrize("byte_format", ['01', '10'])
+def test_load_sphere(tmp_path, signal, byte_format):
+    file = tmp_path / 'file.sph'
+    _write_sphere(file, signal, 8000, byte_format=byte_format)
+    assert is_nist_sphere_file(file)
+
+    header = read_sphere_header(file)
+    assert header['sample_count'] == 1000
+    assert header['header_size'] == 1024
+
+    np.testing.assert_equal(load_sphere(file, dtype=np.int16), signal)
+    np.testing.assert_equal(load_sphere(file), signal / 2**15)
+    np.testing.assert_equal(
+        load_sphere(file, dtype=np.int16, start=100, stop=-100),
+        signal[:, 100:-100],
+    )
+    np.testing.assert_equal(
+        load_sphere(file, dtype=np.int16, start=0.05, frames=0.01,
+                    unit='seconds'),
+        signal[:, 400:480],
+    )
+    assert load_sphere(file, start=0.05, frames=0., unit='seconds').shape \
+        == (2, 0)
+    assert read_nist_wsj(file, duration=0.)[0].shape == (2, 0)
+    # sph2pipe is used for shorten compressed files.
+    np.testing.assert_equal(_sph2pipe(file).T, signal)
+
+
+def test_read_nist_wsj(tmp_path, signal):
+    file = tmp_path / 'file.sph'
+    _write_sphere(file, signal[0], 16000)
+    data, sample_rate = read_nist_wsj(file, offset=0.01, duration=0.1)
+    assert sample_rate == 16000
+    assert data.dtype == np.float32
+    np.testing.assert_equal(data[:840], signal[0, 160:] / 2**15)
+    np.testing.assert_equal(data[840:], 0)
+
+    # Other functions get a converted WAV file
+    np.testing.assert_equal(
+        read_nist_wsj(file, audioread_function=load_audio, dtype=np.int16),
+        signal[0],
+    )
+
+
+def test_load_audio_sphere_error(tmp_path, signal):
+    # libsndfile cannot read shorten compressed files.
+    file = tmp_path / 'file.wav'
+    _write_sphere(file, signal, 8000)
+    data = file.read_bytes()
+    header = data[:1024].replace(
+        b'sample_coding -s3 pcm',
+        b'sample_coding -s26 pcm,embedded-shorten-v2.00',
+    )[:1024]
+    file.write_bytes(header + data[1024:])
+    with pytest.raises(RuntimeError, match='NIST SPHERE file'):
+        load_audio(file)
+
+
+def test_is_nist_sphere_file(tmp_path):
+    assert not is_nist_sphere_file(tmp_path / 'missing.sph')
+    assert not is_nist_sphere_file(tmp_path)
+    (tmp_path / 'file.txt').write_text('NIST')
+    assert not is_nist_sphere_file(tmp_path / 'file.txt')
+    # Not readable, e.g. missing permissions.
+    _write_sphere(tmp_path / 'file.sph', np.zeros(10), 8000)
+    assert is_nist_sphere_file(tmp_path / 'file.sph')
+    with mock.patch('builtins.open', side_effect=PermissionError):
+        assert not is_nist_sphere_file(tmp_path / 'file.sph')
+
+
+def test_g711():
+    audioop = pytest.importorskip('audioop')
+    data = np.arange(256, dtype=np.uint8)
+    np.testing.assert_equal(
+        _ulaw_to_linear(data),
+        np.frombuffer(audioop.ulaw2lin(data.tobytes(), 2), '<i2'),
+    )
+    np.testing.assert_equal(
+        _alaw_to_linear(data),
+        np.frombuffer(audioop.alaw2lin(data.tobytes(), 2), '<i2'),
+    )
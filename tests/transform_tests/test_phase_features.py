@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+import paderbox.math.directional as directional
+from paderbox.transform.module_phase_features import (
+    transform_to_baseband,
+    get_phase_features,
+)
+
+
+def reference_transform_to_baseband(X, size, shift):
+    X = X.copy()
+    T, _, F = X.shape
+    for t in range(T):
+        for f in range(F):
+            X[t, :, f] *= np.exp(-2j * np.pi * t * f * shift / size)
+    return X
+
+
+class TestPhaseFeatures(unittest.TestCase):
+    size, shift = 16, 4
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        shape = (20, 3, self.size // 2 + 1)
+        self.X = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+
+    def test_transform_to_baseband(self):
+        np.testing.assert_allclose(
+            transform_to_baseband(self.X, self.size, self.shift),
+            reference_transform_to_baseband(self.X, self.size, self.shift),
+        )
+
+    def test_transform_to_baseband_batch(self):
+        X = np.stack([self.X, 2 * self.X])
+        np.testing.assert_allclose(
+            transform_to_baseband(X, self.size, self.shift),
+            np.stack([
+                reference_transform_to_baseband(x, self.size, self.shift)
+                for x in X
+            ]),
+        )
+
+    def test_transform_to_baseband_inplace(self):
+        X = self.X.copy()
+        out = transform_to_baseband(X, self.size, self.shift, inplace=True)
+        assert out is X
+        np.testing.assert_allclose(
+            X, reference_transform_to_baseband(self.X, self.size, self.shift),
+        )
+
+    def test_get_phase_features(self):
+        phase, delta, delta_delta = get_phase_features(
+            self.X, self.size, self.shift)
+
+        ref_phase = np.angle(
+            reference_transform_to_baseband(self.X, self.size, self.shift))
+        ref_delta = np.zeros_like(ref_phase)
+        ref_delta[1:] = directional.minus(ref_phase[1:], ref_phase[:-1])
+        ref_delta_delta = np.zeros_like(ref_phase)
+        ref_delta_delta[1:] = ref_delta[1:] - ref_delta[:-1]
+
+        np.testing.assert_allclose(phase, ref_phase)
+        np.testing.assert_allclose(delta, ref_delta, atol=1e-12)
+        np.testing.assert_allclose(delta_delta, ref_delta_delta, atol=1e-12)
@@ -362,6 +362,15 @@ class TestSTFTModule(unittest.TestCase):
     def test_samples_to_stft_frames(self):
         pass
 
+    def test_shift_larger_than_window_length(self):
+        x = np.random.normal(size=[1000])
+        X = stft(x, size=256, shift=300, fading=False)
+        tc.assert_equal(X.shape, (4, 129))
+
+        for fading in [True, 'full', 'half']:
+            with self.assertRaises(AssertionError):
+                stft(x, size=256, shift=300, fading=fading)
+
     def test_stft_frames_to_samples(self):
         pass
 
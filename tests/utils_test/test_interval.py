@@ -0,0 +1,422 @@
+import pickle
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import paderbox as pb
+from paderbox.array import interval
+
+
+def random_mask(rng, size, p=0.3):
+    # Runs of ones and zeros with random length
+    mask = np.zeros(size, dtype=bool)
+    pos = 0
+    value = rng.uniform() < 0.5
+    while pos < size:
+        length = rng.randint(1, 10)
+        mask[pos:pos + length] = value
+        value = not value if rng.uniform() > p else value
+        pos += length
+    return mask
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_setitem_matches_numpy(seed):
+    rng = np.random.RandomState(seed)
+    size = 200
+    ai = interval.zeros(size)
+    reference = np.zeros(size, dtype=bool)
+    for _ in range(100):
+        start, stop = sorted(rng.randint(0, size + 1, size=2))
+        value = rng.randint(0, 2)
+        ai[start:stop] = value
+        reference[start:stop] = value
+    np.testing.assert_equal(ai[:], reference)
+    np.testing.assert_equal(np.asarray(ai), reference)
+    assert ai.sum() == reference.sum()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_roundtrip(seed):
+    rng = np.random.RandomState(seed)
+    mask = random_mask(rng, 300)
+    ai = interval.ArrayInterval(mask)
+    np.testing.assert_equal(ai[:], mask)
+    np.testing.assert_equal(pickle.loads(pickle.dumps(ai))[:], mask)
+    np.testing.assert_equal((~ai)[:], ~mask)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_from_mask_to_mask(seed):
+    rng = np.random.RandomState(seed)
+    mask = random_mask(rng, 10_000)
+    ai = interval.ArrayInterval.from_mask(mask)
+    np.testing.assert_equal(ai.to_mask(), mask)
+    np.testing.assert_equal(ai[100:1000], mask[100:1000])
+
+    ai = interval.ArrayInterval.from_mask(mask, inverse_mode=True)
+    assert ai.inverse_mode
+    np.testing.assert_equal(ai.to_mask(), mask)
+
+
+def test_many_intervals():
+    ai = interval.zeros()
+    for i in range(100_000):
+        ai[2 * i:2 * i + 1] = 1
+    assert len(ai.normalized_intervals) == 100_000
+    assert ai.sum() == 100_000
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_point_and_range_queries(seed):
+    rng = np.random.RandomState(seed)
+    mask = random_mask(rng, 1000)
+    for ai in [
+        interval.ArrayInterval(mask),
+        ~interval.ArrayInterval(~mask),
+    ]:
+        indices = rng.randint(0, 1000, size=(20, 30))
+        np.testing.assert_equal(ai.values_at(indices), mask[indices])
+        for i in indices[0]:
+            assert ai[i] == mask[i]
+            assert ai.values_at(i) == mask[i]
+        for _ in range(20):
+            start, stop = sorted(rng.randint(0, 1001, size=2))
+            np.testing.assert_equal(ai[start:stop], mask[start:stop])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_combine(seed):
+    rng = np.random.RandomState(seed)
+    size = 500
+    masks = [random_mask(rng, size) for _ in range(4)]
+    ais = [
+        interval.ArrayInterval(m, inverse_mode=bool(i % 2))
+        for i, m in enumerate(masks)
+    ]
+    a, b, c, d = ais
+    ma, mb, mc, md = masks
+
+    np.testing.assert_equal((a | b)[:], ma | mb)
+    np.testing.assert_equal((a & b)[:], ma & mb)
+    np.testing.assert_equal((a ^ c)[:], ma ^ mc)
+    np.testing.assert_equal((b ^ d)[:], mb ^ md)
+    np.testing.assert_equal((~a & c)[:], ~ma & mc)
+
+    np.testing.assert_equal(
+        interval.ArrayInterval.union(*ais)[:], np.any(masks, axis=0))
+    np.testing.assert_equal(
+        interval.ArrayInterval.intersection(*ais)[:], np.all(masks, axis=0))
+
+    edges, counts = interval.ArrayInterval.count_active(*ais)
+    reference = np.sum(masks, axis=0)
+    np.testing.assert_equal(
+        counts[np.searchsorted(edges, np.arange(size), side='right') - 1],
+        reference,
+    )
+
+
+def test_combine_unknown_shape():
+    a = interval.zeros()
+    a[3:5] = 1
+    b = interval.ones()
+    b[4:10] = 0
+    np.testing.assert_equal((a | b)[:12], (a[:12] | b[:12]))
+    np.testing.assert_equal((a & b)[:12], (a[:12] & b[:12]))
+    np.testing.assert_equal((a ^ b)[:12], (a[:12] ^ b[:12]))
+    assert (a | b).inverse_mode
+    assert not (a & b).inverse_mode
+    np.testing.assert_equal(
+        interval.ArrayInterval.union(a, b)[:12], (a[:12] | b[:12]))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_array_interval_stack(seed):
+    rng = np.random.RandomState(seed)
+    size = 500
+    masks = np.array([random_mask(rng, size) for _ in range(3)])
+    stack = interval.ArrayIntervalStack({
+        f'S{i}': interval.ArrayInterval(m, inverse_mode=bool(i % 2))
+        for i, m in enumerate(masks)
+    })
+    counts = masks.sum(axis=0)
+
+    for i, m in enumerate(masks):
+        np.testing.assert_equal(stack[f'S{i}'][:], m)
+    for k in range(4):
+        np.testing.assert_equal(stack.exactly(k)[:], counts == k)
+    np.testing.assert_equal(stack.overlap()[:], counts >= 2)
+    for i, ai in enumerate(stack.exclusive().values()):
+        np.testing.assert_equal(ai[:], masks[i] & (counts == 1))
+
+    edges, active = stack.active_count()
+    np.testing.assert_equal(
+        active[np.searchsorted(edges, np.arange(size), side='right') - 1],
+        counts,
+    )
+
+    np.testing.assert_equal(stack.to_mask(), masks)
+    for fading in [None, 'half', 'full']:
+        stft = pb.transform.STFT(shift=7, size=16, fading=fading)
+        frame_mask = stack.to_mask(stft)
+        # The mask lines up with the STFT frames.
+        assert frame_mask.shape == (3, stft(np.zeros(size)).shape[0])
+        np.testing.assert_equal(frame_mask, [
+            interval.ArrayInterval(mask).to_frames(stft)[:]
+            for mask in masks
+        ])
+
+
+def _reduce(values, rule):
+    if rule == 'any':
+        return values.any(axis=-1)
+    elif rule == 'all':
+        return values.all(axis=-1)
+    else:
+        return 2 * values.sum(axis=-1) > values.shape[-1]
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('rule', ['any', 'majority', 'all'])
+@pytest.mark.parametrize('factor', ['1/2', '1/3', '2', '2/3', '3/2'])
+def test_resample(seed, rule, factor):
+    from fractions import Fraction
+    factor = Fraction(factor)
+    p, q = factor.numerator, factor.denominator
+    rng = np.random.RandomState(seed)
+    size = 301
+    mask = random_mask(rng, size)
+    num_cells = -(-size * p // q)
+
+    # Reference: Upsample by p, pad and take q positions per cell
+    values = np.zeros(num_cells * q, dtype=bool)
+    values[:size * p] = np.repeat(mask, p)
+    reference = _reduce(values.reshape(num_cells, q), rule)
+
+    for inverse_mode in [False, True]:
+        ai = interval.ArrayInterval.from_mask(mask, inverse_mode=inverse_mode)
+        resampled = ai.resample(factor, rule=rule)
+        assert resampled.shape == (num_cells,)
+        assert resampled.inverse_mode == inverse_mode
+        np.testing.assert_equal(resampled[:], reference)
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('rule', ['any', 'majority', 'all'])
+@pytest.mark.parametrize('fading', [None, 'full', 'half'])
+@pytest.mark.parametrize('pad', [True, False])
+@pytest.mark.parametrize('shift,size', [(4, 16), (3, 8), (160, 400)])
+def test_to_frames(seed, rule, fading, pad, shift, size):
+    stft = pb.transform.STFT(shift=shift, size=size, fading=fading, pad=pad)
+    rng = np.random.RandomState(seed)
+    mask = random_mask(rng, 1003)
+    if shift > 10:
+        mask = np.repeat(mask, 50)
+
+    # Reference: Frame the dense mask the same way as stft
+    if fading is None:
+        pad_width = (0, 0)
+    elif fading == 'half':
+        pad_width = ((size - shift) // 2, -(-(size - shift) // 2))
+    else:
+        pad_width = (size - shift, size - shift)
+    frames = pb.array.segment_axis(
+        np.pad(mask, pad_width), size, shift, end='pad' if pad else 'cut')
+    reference = _reduce(frames, rule)
+    assert len(reference) == stft.samples_to_frames(len(mask))
+
+    for inverse_mode in [False, True]:
+        ai = interval.ArrayInterval.from_mask(mask, inverse_mode=inverse_mode)
+        np.testing.assert_equal(ai.to_frames(stft, rule=rule)[:], reference)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_array_interval_index(seed):
+    rng = np.random.RandomState(seed)
+    size = 1000
+    masks = {
+        f'file{i}': {
+            f'spk{j}': random_mask(rng, size, p=rng.choice([0.1, 0.9]))
+            for j in range(3)
+        }
+        for i in range(4)
+    }
+    data = {
+        file: {
+            spk: interval.ArrayInterval.from_mask(m, inverse_mode=j % 2 == 1)
+            for j, (spk, m) in enumerate(d.items())
+        }
+        for file, d in masks.items()
+    }
+    index = interval.ArrayIntervalIndex(data)
+    assert len(index) == 12
+    keys = [(file, spk) for file, d in masks.items() for spk in d]
+    assert index.keys == keys
+    dense = np.array([masks[file][spk] for file, spk in keys])
+
+    starts = rng.randint(0, size, size=200)
+    stops = starts + rng.randint(0, 50, size=200)
+    query_index, track_index = index.overlapping_batch(starts, stops)
+    reference = [
+        np.flatnonzero(dense[:, start:stop].any(axis=-1))
+        for start, stop in zip(starts, stops)
+    ]
+    np.testing.assert_equal(
+        query_index, np.repeat(np.arange(200), [len(r) for r in reference]))
+    np.testing.assert_equal(track_index, np.concatenate(reference))
+
+    for position in [0, 17, 500, 999]:
+        assert index.active_at(position) == [
+            keys[i] for i in np.flatnonzero(dense[:, position])]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_numpy_kernels_match_cython(seed):
+    util = pytest.importorskip('paderbox.array.interval.util')
+    from paderbox.array.interval import numpy_util
+
+    rng = np.random.RandomState(seed)
+    for _ in range(100):
+        intervals = rng.randint(0, 50, size=(rng.randint(0, 10), 2))
+        window = tuple(sorted(rng.randint(0, 50, size=2).tolist()))
+        for name in ['intersection', 'non_intersection']:
+            expected = getattr(util, f'cy_{name}')(window, intervals.tolist())
+            np.testing.assert_equal(
+                getattr(numpy_util, f'np_{name}')(window, intervals),
+                np.array(expected, dtype=np.int64).reshape(-1, 2),
+            )
+
+    string = ', '.join([f'{a}:{b}' for a, b in rng.randint(0, 99, (20, 2))])
+    np.testing.assert_equal(
+        numpy_util.np_str_to_intervals(string),
+        util.cy_str_to_intervals(string),
+    )
+    for item in [slice(None, 5), slice(3, None), slice(2, 7)]:
+        assert numpy_util.np_parse_item(item, (10,)) == util.cy_parse_item(
+            item, (10,))
+
+
+def test_import_without_extension():
+    # Simulate a missing extension in a fresh interpreter.
+    code = (
+        "import sys\n"
+        "sys.modules['paderbox.array.interval.util'] = None\n"
+        "from paderbox.array import interval\n"
+        "ai = interval.ArrayInterval.from_str('1:4, 6:8', shape=10)\n"
+        "ai[2:7] = 1\n"
+        "print(ai)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        check=True, stdout=subprocess.PIPE, universal_newlines=True,
+        cwd=Path(__file__).parents[2],
+    ).stdout
+    assert output.strip() == 'ArrayInterval("1:8", shape=(10,))', output
+
+
+def test_rttm_roundtrip():
+    rng = np.random.RandomState(0)
+    data = {
+        f'file{f}': {
+            f'spk{s}': interval.ArrayInterval(random_mask(rng, 2000))
+            for s in range(3)
+        }
+        for f in range(2)
+    }
+    for sample_rate in [16000, 8000, 1000]:
+        rttm = interval.to_rttm_str(data, sample_rate=sample_rate)
+        new = interval.from_rttm_str(rttm, sample_rate=sample_rate)
+        assert list(new.keys()) == list(data.keys())
+        for file_id in data:
+            assert list(new[file_id].keys()) == list(data[file_id].keys())
+            for name, ai in data[file_id].items():
+                np.testing.assert_equal(new[file_id][name][:2000], ai[:])
+
+    # Lines with a different number of fields use the per line parser
+    rttm = interval.to_rttm_str(data) + '\nSPEAKER file0 1 0.5 1 <NA> <NA> spk3 <NA> <NA>'
+    new = interval.from_rttm_str(rttm)
+    assert new['file0']['spk3'].normalized_intervals == ((8000, 24000),)
+
+
+def test_kaldi_segments():
+    s = (
+        'utt1 file1 41.21 41.87\n'
+        'utt2 file2 0.5 1\n'
+        'utt3 file1 101.23 103.37\n'
+    )
+    data = interval.from_kaldi_segments_str(s, sample_rate=1000)
+    assert list(data.keys()) == ['file1', 'file2']
+    assert data['file1'].normalized_intervals == (
+        (41210, 41870), (101230, 103370))
+    assert data['file2'].normalized_intervals == ((500, 1000),)
+
+    data = interval.from_kaldi_segments_str(
+        s, sample_rate=1000, round_fn=lambda t: round(t, 1))
+    assert data['file1'].normalized_intervals == (
+        (41200, 41900), (101200, 103400))
+
+    with pytest.raises(ValueError):
+        interval.from_kaldi_segments_str(
+            "utt1 file1 0.00001 1", sample_rate=16000)
+
+
+def test_npz_dump_load():
+    rng = np.random.RandomState(0)
+    data = {
+        f'file{f}': {
+            f'spk{s}': interval.ArrayInterval(
+                random_mask(rng, 20_000), inverse_mode=bool(s % 2))
+            for s in range(3)
+        }
+        for f in range(2)
+    }
+    pickled = pickle.dumps(data)
+    data['file0']['spk0'].shape = None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / 'activity.ai.npz'
+        pb.io.dump(data, path)
+        assert path.stat().st_size < len(pickled) / 4
+
+        new = pb.io.load(path)
+        assert repr(new) == repr(data)
+
+        with interval.from_npz(path, lazy=True) as archive:
+            assert list(archive.keys()) == ['file0', 'file1']
+            assert repr(archive['file1']['spk2']) == repr(
+                data['file1']['spk2'])
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_npz_mixed_dtypes(compress):
+    data = {
+        'uint8': interval.ArrayInterval.from_str('1:5, 7:9', shape=20),
+        'empty': interval.zeros(10),
+        'uint32': interval.ArrayInterval.from_str('0:100000', shape=None),
+        'nested': {
+            'uint8': ~interval.ArrayInterval.from_str('3:4', shape=10),
+        },
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / 'activity.ai.npz'
+        interval.to_npz(data, path, compress=compress)
+        assert repr(interval.from_npz(path)) == repr(data)
+        with interval.from_npz(path, lazy=True) as archive:
+            for key in ['uint32', 'empty', 'uint8']:
+                assert repr(archive[key]) == repr(data[key])
+            assert repr(archive['nested']['uint8']) == repr(
+                data['nested']['uint8'])
+
+
+def test_npz_single_array_interval():
+    ai = ~interval.ArrayInterval.from_str('1:5, 7:9', shape=20)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / 'activity.ai.npz'
+        pb.io.dump(ai, path)
+        assert repr(pb.io.load(path)) == repr(ai)
+        assert repr(interval.from_npz(path, lazy=True)) == repr(ai)
+        with pytest.raises(TypeError, match='single ArrayInterval'):
+            interval.npz.ArrayIntervalArchive(path)
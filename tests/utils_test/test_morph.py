@@ -192,3 +192,20 @@ class TestMorph(unittest.TestCase):
                 A,
                 reduce=np.sum
             ), np.sum(A, axis=-1))
+
+    def test_compile(self):
+        plan = morph.compile('T,B,F->F,B*T')
+        tc.assert_equal(plan(A), morph('T,B,F->F,B*T', A))
+        tc.assert_equal(
+            plan(A2[:, 0]), A2[:, 0].transpose(2, 1, 0).reshape(F, B*T))
+        assert morph.compile('T,B,F->F,B*T') is plan
+
+        plan = morph.compile('t*b*f->tbf', t=T, b=B)
+        tc.assert_equal(plan(A3), A3.reshape((T, B, F)))
+
+    def test_views(self):
+        for operation in [
+            'T,B,F->F,T,B', 'T,B,F->T,B*F', 'T,B,F->1,T,B,F', '...F->F...',
+        ]:
+            result = morph(operation, A)
+            assert np.shares_memory(result, A), operation
@@ -0,0 +1,95 @@
+import itertools
+import unittest
+
+import numpy as np
+from numpy.testing import assert_equal
+
+from paderbox.array.padding import pad_axis, pad_batch, bucket_boundaries
+
+
+class TestPadBatch(unittest.TestCase):
+    def test_pad_axis_reference(self):
+        rng = np.random.RandomState(0)
+        for axis, to_multiple_of in itertools.product([0, 1, -1], [None, 4]):
+            arrays = []
+            for length in [3, 7, 1, 0]:
+                shape = [2, 5]
+                shape[axis] = length
+                arrays.append(rng.randn(*shape))
+
+            batch, sequence_lengths, mask = pad_batch(
+                arrays, axis=axis, to_multiple_of=to_multiple_of,
+                pad_value=-1, mask='bool')
+
+            length = 8 if to_multiple_of else 7
+            assert_equal(sequence_lengths, [3, 7, 1, 0])
+            assert_equal(
+                batch,
+                np.stack([
+                    pad_axis(a, (0, length - a.shape[axis]), axis=axis,
+                             constant_values=-1)
+                    for a in arrays
+                ]),
+            )
+            assert_equal(mask, np.arange(length) < sequence_lengths[:, None])
+
+    def test_out(self):
+        out = np.full((2, 4), np.nan)
+        batch, _ = pad_batch([np.ones(2), np.ones(4)], out=out)
+        assert batch is out
+        assert_equal(out, [[1, 1, 0, 0], [1, 1, 1, 1]])
+
+    def test_shape_mismatch(self):
+        with self.assertRaises(AssertionError):
+            pad_batch([np.ones((2, 3)), np.ones((3, 3))], axis=-1)
+
+
+class TestBucketBoundaries(unittest.TestCase):
+    @staticmethod
+    def waste(lengths, boundaries):
+        return np.sum(
+            boundaries[np.searchsorted(boundaries, lengths)] - lengths)
+
+    def test_brute_force(self):
+        rng = np.random.RandomState(1)
+        lengths = rng.randint(1, 50, size=30)
+        values = np.unique(lengths)
+        for num_buckets in [1, 2, 3, 4]:
+            boundaries = bucket_boundaries(lengths, num_buckets)
+            assert len(boundaries) == num_buckets
+            assert boundaries[-1] == lengths.max()
+            best = min(
+                self.waste(lengths, np.array([*b, values[-1]]))
+                for b in itertools.combinations(values[:-1], num_buckets - 1)
+            )
+            assert self.waste(lengths, boundaries) == best, num_buckets
+
+    @staticmethod
+    def quadratic_waste(lengths, num_buckets):
+        """Minimal waste with the O(num_buckets * V^2) dynamic program."""
+        values, counts = np.unique(lengths, return_counts=True)
+        n = np.concatenate([[0], np.cumsum(counts)])
+        s = np.concatenate([[0], np.cumsum(counts * values)])
+        cost = n[1:] * values - s[1:]
+        for k in range(1, num_buckets):
+            cost = [
+                min(
+                    (cost[i - 1] if i > 0 else 0)
+                    + (n[j] - n[i]) * values[j - 1] - (s[j] - s[i])
+                    for i in range(k, j)
+                ) if j > k else np.inf
+                for j in range(1, len(values) + 1)
+            ]
+        return cost[-1]
+
+    def test_quadratic_dynamic_program(self):
+        rng = np.random.RandomState(2)
+        lengths = rng.randint(1, 2000, size=400)
+        for num_buckets in [2, 5, 8]:
+            boundaries = bucket_boundaries(lengths, num_buckets)
+            assert len(boundaries) == num_buckets
+            assert self.waste(lengths, boundaries) == self.quadratic_waste(
+                lengths, num_buckets), num_buckets
+
+    def test_more_buckets_than_lengths(self):
+        assert_equal(bucket_boundaries([5, 5, 2], 10), [2, 5])
@@ -1,9 +1,10 @@
+import itertools
 import unittest
 
 import numpy as np
 from numpy.testing import assert_equal
 
-from paderbox.array.segment import segment_axis
+from paderbox.array.segment import segment_axis, segment_axis_parts
 
 
 class TestSegment(unittest.TestCase):
@@ -60,3 +61,30 @@ class TestSegment(unittest.TestCase):
             segment_axis(np.ones((2, 3, 4, 5, 6)), axis=2, length=3, shift=2,
                          end='pad').shape,
             (2, 3, 2, 3, 5, 6))
+
+    def test_parts(self):
+        for size, length, shift, pad_width, end, axis in itertools.product(
+                [0, 3, 8, 9, 33], [1, 4, 8], [1, 3, 8], [(0, 0), (3, 2), (6, 7)],
+                ['pad', 'cut'], [0, 1],
+        ):
+            x = np.arange(2 * size).reshape(2, size) + 1
+            if axis == 0:
+                x = x.T
+            npad = [(0, 0), (0, 0)]
+            npad[axis] = pad_width
+            padded = np.pad(x, npad)
+            if end == 'cut' and padded.shape[axis] < length:
+                continue
+            head, body, tail = segment_axis_parts(
+                x, length, shift, axis=axis, pad_width=pad_width, end=end)
+            assert_equal(
+                np.concatenate([head, body, tail], axis=axis),
+                segment_axis(padded, length, shift, axis=axis, end=end),
+            )
+            if body.size > 0:
+                assert np.shares_memory(body, x)
+            assert head.shape[axis] <= -(-pad_width[0] // shift)
+
+        with self.assertRaises(ValueError):
+            segment_axis_parts(np.arange(10), 4, 6, pad_width=(-1, -1))
+
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from paderbox.array import stack_context, unstack_context
+from paderbox.array import stack_context, unstack_context, add_context
 
 T, B, F = 400, 6, 513
 A = np.random.uniform(size=(T, B, F)) + 1j * np.random.uniform(size=(T, B, F))
@@ -28,3 +28,47 @@ class TestUnstackContext(unittest.TestCase):
         )
 
         np.testing.assert_allclose(unstacked, A)
+
+    def test_view_and_copy(self):
+        for left_context, right_context, step_width in [
+            (0, 0, 1), (2, 3, 1), (4, 1, 3), (7, 7, 2),
+        ]:
+            stacked = stack_context(
+                A,
+                left_context=left_context,
+                right_context=right_context,
+                step_width=step_width,
+                copy=False,
+            )
+            copied = stack_context(
+                A,
+                left_context=left_context,
+                right_context=right_context,
+                step_width=step_width,
+            )
+            assert not stacked.flags.writeable
+            assert copied.flags.writeable
+            assert copied.flags.c_contiguous
+            np.testing.assert_equal(stacked, copied)
+
+            # Reference: Pad and concatenate the shifted signals.
+            padded = np.pad(
+                A, ((left_context, right_context), (0, 0), (0, 0)),
+                mode='symmetric',
+            )
+            window_size = left_context + right_context + 1
+            expected = np.concatenate([
+                padded[w:w + len(A)] for w in range(window_size)
+            ], axis=-1)[::step_width]
+            np.testing.assert_equal(stacked, expected)
+
+
+class TestAddContext(unittest.TestCase):
+    def test_writeable(self):
+        for cnn_features in [False, True]:
+            data = add_context(A, 2, 3, cnn_features=cnn_features)
+            assert data.flags.writeable
+            data[0] = 0
+            view = add_context(A, 2, 3, cnn_features=cnn_features, copy=False)
+            assert not view.flags.writeable
+            np.testing.assert_equal(data[1:], view[1:])
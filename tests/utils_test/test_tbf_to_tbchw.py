@@ -19,3 +19,10 @@ class TestTBFtoTBCHW(unittest.TestCase):
     def test_shape_right_context(self):
         x = tbf_to_tbchw(self.data, 0, 3, 1)
         self.assertEqual(x.shape, (30, 2, 1, 5, 4))
+
+    def test_view_and_copy(self):
+        x = tbf_to_tbchw(self.data, 3, 3, 1)
+        view = tbf_to_tbchw(self.data, 3, 3, 1, copy=False)
+        self.assertTrue(x.flags.writeable)
+        self.assertFalse(view.flags.writeable)
+        np.testing.assert_equal(x, view)